@@ -587,6 +587,12 @@ class MCTAL:
         # also apply to successive calls to parseTally().
         self.kcode = KCODE()  # array with kcode data
 
+    def __getstate__(self):
+        """The file handle cannot be pickled (e.g. when sent to another process)"""
+        state = self.__dict__.copy()
+        state["mctalFile"] = None
+        return state
+
     def Read(self):
         """This function calls the functions getHeaders and parseTally in order to read the entier MCTAL file."""
 
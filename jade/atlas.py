@@ -24,20 +24,25 @@ along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 # from docx.shared import Pt
 import os
 import logging
+from concurrent.futures import Future
+from io import BytesIO
+from urllib.parse import quote
 
 # import win32com.client
 import aspose.words
 import docx
-import pandas as pd
 from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.opc.constants import RELATIONSHIP_TYPE
 from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import nsdecls, qn
 from docx.shared import Inches
 
 
 class Atlas:
-    def __init__(self, template, name):
+    def __init__(
+        self, template, name, renderer=None, draft=False, cache=None, max_bins=None
+    ):
         """
         Atlas of plots for post-processing
 
@@ -45,6 +50,20 @@ class Atlas:
         ----------
         template : Path/str
             Word template for atlas
+        name : str
+            name of the atlas
+        renderer : plotter.PlotRenderer, optional
+            renderer used for the plots inserted with insert_plot. If None,
+            plots are rendered immediately. The default is None.
+        draft : bool, optional
+            if True the plots inserted with insert_plot are rendered in
+            draft mode (see plotter.Plotter). The default is False.
+        cache : plotter.PlotCache, optional
+            cache used for the plots inserted with insert_plot. The default
+            is None.
+        max_bins : int, optional
+            maximum number of bins of the binned graphs inserted with
+            insert_plot (see plotter.Plotter). The default is None.
         # lib : list/str
         #     libraries to post-process
 
@@ -73,12 +92,110 @@ class Atlas:
         doc.add_heading("JADE ATLAS: " + name, level=0)
         self.outname = "atlas_" + name  # Name for the outfile
         self.doc = doc  # Word Document
+        self.renderer = renderer
+        self.draft = draft
+        self.cache = cache
+        self.max_bins = max_bins
+        # Images still being rendered (paragraph, future, width)
+        self._pending = []
 
     def insert_img(self, img, width=Inches(7.5)):
+        """
+        Insert an image in the atlas
+
+        Parameters
+        ----------
+        img : str/path, io.BytesIO or concurrent.futures.Future
+            image to insert, either a file or an in-memory buffer. If it is
+            a future (an image still being rendered) its place in the
+            document is reserved and the image is added as soon as it is
+            needed.
+        width : docx.shared.Length, optional
+            width of the image. The default is Inches(7.5).
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(img, Future):
+            if not img.done():
+                paragraph = self.doc.add_paragraph()
+                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                self._pending.append((paragraph, img, width))
+                return
+            img = img.result()
+
         self.doc.add_picture(img, width=width)
         last_paragraph = self.doc.paragraphs[-1]
         last_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
+    def insert_plot(self, plot, plot_type, width=Inches(7.5)):
+        """
+        Render a plot in memory and insert it in the atlas
+
+        Parameters
+        ----------
+        plot : plotter.Plotter
+            plot to render.
+        plot_type : str
+            plot type, see plotter.Plotter.plot.
+        width : docx.shared.Length, optional
+            width of the image. The default is Inches(7.5).
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.draft:
+            plot.draft = True
+        if self.cache is not None:
+            plot.cache = self.cache
+        if self.max_bins is not None:
+            plot.max_bins = self.max_bins
+        if self.renderer is None:
+            img = plot.plot(plot_type, in_memory=True)
+        else:
+            img = self.renderer.submit(plot, plot_type, in_memory=True)
+        self.insert_img(img, width=width)
+
+    def insert_images(self, images, width=Inches(7.5)):
+        """
+        Insert a structured list of images, each one with its own heading
+        and grouped in sections.
+
+        Parameters
+        ----------
+        images : list of tuple
+            (section, title, image) to be inserted, where image is anything
+            accepted by insert_img. A section heading is added each time
+            the section changes.
+        width : docx.shared.Length, optional
+            width of the images. The default is Inches(7.5).
+
+        Returns
+        -------
+        None.
+
+        """
+        current_section = None
+        for section, title, img in images:
+            if section != current_section:
+                self.doc.add_heading(section, level=1)
+                current_section = section
+            self.doc.add_heading(title, level=2)
+            self.insert_img(img, width=width)
+
+    def _insert_pending(self):
+        """
+        Wait for the images still being rendered and insert them in their
+        reserved place
+        """
+        for paragraph, future, width in self._pending:
+            paragraph.add_run().add_picture(future.result(), width=width)
+        self._pending = []
+
     def insert_df(
         self, df, caption=None, highlight=False, tablestyle=None  # , template_idx=None,
     ):
@@ -160,7 +277,7 @@ class Atlas:
 
         return table
 
-    def build(self, images_path, libmanager, mat_settings):
+    def build(self, images, libmanager, mat_settings):
         """
         TO BE USED FOR SPHERE LEAKAGE BENCHMARK
 
@@ -168,8 +285,10 @@ class Atlas:
 
         Parameters
         ----------
-        images_path : str/path
-            Path to temporary folder containig the images
+        images : str/path or list
+            Path to temporary folder containig the images or list of
+            (tally, zaid, image) where image is anything accepted by
+            insert_img (e.g. in-memory buffers).
 
         lib_manager : libmanager.LibManager
             Library manager for conversions and name recovery.
@@ -182,41 +301,7 @@ class Atlas:
         None.
 
         """
-        # Build Atlas
-        images = []
-        tallies = []
-        for img in os.listdir(images_path):
-            img_path = os.path.join(images_path, img)
-            pieces = img.split("-")
-            zaid = pieces[0]
-            tally = pieces[-1].split(".")[0]
-            zaidnum = zaid.split(".")[0]
-            if tally not in tallies:
-                tallies.append(tally)
-
-            images.append(
-                {"tally": tally, "zaid": zaid, "img": img_path, "num": zaidnum}
-            )
-
-        images = pd.DataFrame(images)
-        # Reorder atlas
-        images["num"] = pd.to_numeric(images["num"].values, errors="coerce")
-        images.set_index("tally", inplace=True)
-        for tally in tallies:
-            self.doc.add_heading("Tally N." + str(tally), level=1)
-            # Be sure of the reordering
-            df = images.loc[tally].sort_values("num")
-            for idx, row in df.iterrows():
-                title = "Zaid: " + row["zaid"]
-                try:
-                    name, formula = libmanager.get_zaidname(row["zaid"])
-                    title = title + " (" + name + " " + formula + ")"
-                except ValueError:  # A material is passed instead of zaid
-                    matname = mat_settings.loc[row["zaid"], "Name"]
-                    title = title + " (" + matname + ")"
-
-                self.doc.add_heading(title, level=2)
-                self.insert_img(row["img"])
+        self.insert_images(_sphere_sections(images, libmanager, mat_settings))
 
     def save(self, outpath, pdfprint=True):
         """
@@ -231,9 +316,11 @@ class Atlas:
 
         Returns
         -------
-        None.
+        outpath_word : str
+            path to the saved word document.
 
         """
+        self._insert_pending()
         outpath_word = os.path.join(outpath, self.outname + ".docx")
         # outpath_pdf = os.path.join(outpath, self.outname + ".pdf")
         if len(outpath_word) > 259:
@@ -257,6 +344,8 @@ class Atlas:
         if pdfprint:
             pass
 
+        return outpath_word
+
     @staticmethod
     def _wrapper(paragraph, ptype):
         """
@@ -299,3 +388,337 @@ class Atlas:
             r'<w:shd {} w:fill="'.format(nsdecls("w")) + color + r'"/>'
         )
         cell._tc.get_or_add_tcPr().append(shading_elm_1)
+
+    @staticmethod
+    def _add_hyperlink(paragraph, target, text):
+        """
+        Add a hyperlink to an external file or url at the end of a paragraph
+
+        Parameters
+        ----------
+        paragraph : docx.Paragraph
+            paragraph where to add the link.
+        target : str
+            linked file (relative path) or url.
+        text : str
+            text of the link.
+
+        Returns
+        -------
+        None.
+
+        """
+        r_id = paragraph.part.relate_to(
+            target, RELATIONSHIP_TYPE.HYPERLINK, is_external=True
+        )
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink.set(qn("r:id"), r_id)
+        run = OxmlElement("w:r")
+        rPr = OxmlElement("w:rPr")
+        color = OxmlElement("w:color")
+        color.set(qn("w:val"), "0563C1")
+        rPr.append(color)
+        underline = OxmlElement("w:u")
+        underline.set(qn("w:val"), "single")
+        rPr.append(underline)
+        run.append(rPr)
+        text_element = OxmlElement("w:t")
+        text_element.text = text
+        run.append(text_element)
+        hyperlink.append(run)
+        paragraph._p.append(hyperlink)
+
+
+class AtlasVolumes:
+    def __init__(
+        self,
+        template,
+        name,
+        outpath,
+        max_images=None,
+        per_section=False,
+        renderer=None,
+        max_size=None,
+    ):
+        """
+        Atlas split in volumes. Images are streamed into the current volume
+        which is saved, and its memory released, as soon as it is full. An
+        index document linking all the volumes is produced at the end.
+
+        Parameters
+        ----------
+        template : Path/str
+            Word template for the volumes and the index
+        name : str
+            name of the atlas
+        outpath : str/path
+            path where volumes and index are saved
+        max_images : int, optional
+            maximum number of images in a volume. If None, volumes are not
+            limited in size. The default is None.
+        per_section : bool, optional
+            if True each section is saved in its own volume. The default is
+            False.
+        renderer : plotter.PlotRenderer, optional
+            renderer passed to each volume. The default is None.
+        max_size : int, optional
+            maximum size [bytes] of the images in a volume. If None, volumes
+            are not limited in size. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.template = template
+        self.name = name
+        self.outpath = outpath
+        self.max_images = max_images
+        self.per_section = per_section
+        self.renderer = renderer
+        self.max_size = max_size
+        # Saved volumes (file name, sections)
+        self.volumes = []
+
+        self.volume = None  # Volume being filled
+        self._n_images = 0
+        self._size = 0  # size of the images in the current volume
+        self._sections = []
+        self._section = None
+
+    def _new_volume(self):
+        """
+        Save the current volume (if any) and open the next one
+        """
+        self._close_volume()
+        number = len(self.volumes) + 1
+        self.volume = Atlas(
+            self.template,
+            self.name + " - Volume " + str(number),
+            renderer=self.renderer,
+        )
+        self._n_images = 0
+        self._size = 0
+        self._sections = []
+        self._section = None
+
+    def _close_volume(self):
+        """
+        Save the current volume and release it
+        """
+        if self.volume is None:
+            return
+        outpath_word = self.volume.save(self.outpath, pdfprint=False)
+        self.volumes.append((os.path.basename(outpath_word), self._sections))
+        self.volume = None
+
+    def insert_images(self, images, width=Inches(7.5)):
+        """
+        Stream a structured list of images in the volumes, see
+        Atlas.insert_images. When a volume is full the section continues
+        in the following one.
+
+        Parameters
+        ----------
+        images : iterable of tuple
+            (section, title, image) to be inserted. It is consumed lazily,
+            each image can be released as soon as it is inserted.
+        width : docx.shared.Length, optional
+            width of the images. The default is Inches(7.5).
+
+        Returns
+        -------
+        None.
+
+        """
+        for section, title, img in images:
+            if isinstance(img, Future):
+                img = img.result()
+            new_section = section != self._section
+            full = self.max_images is not None and self._n_images >= self.max_images
+            if self.max_size is not None and self._n_images > 0:
+                full = full or self._size + _get_image_size(img) > self.max_size
+            if (
+                self.volume is None
+                or full
+                or (self.per_section and new_section and self._n_images > 0)
+            ):
+                self._new_volume()
+
+            if section != self._section:
+                heading = section
+                if not new_section:
+                    heading = heading + " (continued)"
+                self.volume.doc.add_heading(heading, level=1)
+                self._sections.append(heading)
+                self._section = section
+
+            self.volume.doc.add_heading(title, level=2)
+            self.volume.insert_img(img, width=width)
+            self._n_images += 1
+            self._size += _get_image_size(img)
+
+    def build(self, images, libmanager, mat_settings):
+        """
+        TO BE USED FOR SPHERE LEAKAGE BENCHMARK, see Atlas.build
+
+        Parameters
+        ----------
+        images : str/path or list
+            Path to temporary folder containig the images or list of
+            (tally, zaid, image).
+        lib_manager : libmanager.LibManager
+            Library manager for conversions and name recovery.
+        mat_settings : pd.DataFrame
+            contains settings for Materials
+
+        Returns
+        -------
+        None.
+
+        """
+        self.insert_images(_sphere_sections(images, libmanager, mat_settings))
+
+    def save(self, pdfprint=True):
+        """
+        Save the last volume and the index document linking all of them
+
+        Parameters
+        ----------
+        pdfprint : Boolean, optional
+            If True export also in PDF format
+
+        Returns
+        -------
+        outpath_word : str
+            path to the saved index document.
+
+        """
+        self._close_volume()
+
+        index = Atlas(self.template, self.name)
+        index.doc.add_heading("Volumes", level=1)
+        for i, (filename, sections) in enumerate(self.volumes):
+            index.doc.add_heading("Volume " + str(i + 1), level=2)
+            paragraph = index.doc.add_paragraph()
+            # Volumes are saved next to the index
+            Atlas._add_hyperlink(paragraph, quote(filename), filename)
+            index.doc.add_paragraph("Contents: " + ", ".join(sections))
+
+        return index.save(self.outpath, pdfprint=pdfprint)
+
+
+def _sphere_sections(images, libmanager, mat_settings):
+    """
+    Organize the Sphere leakage plots in sections (one for each tally)
+    sorted by zaid number.
+
+    Parameters
+    ----------
+    images : str/path or list
+        Path to temporary folder containig the images or list of
+        (tally, zaid, image).
+    lib_manager : libmanager.LibManager
+        Library manager for conversions and name recovery.
+    mat_settings : pd.DataFrame
+        contains settings for Materials
+
+    Returns
+    -------
+    sections : list
+        (section, title, image) as accepted by Atlas.insert_images.
+
+    """
+    # Build Atlas
+    if isinstance(images, list):
+        images = [(str(tally), str(zaid), img) for tally, zaid, img in images]
+    else:
+        images_path = images
+        images = []
+        for img in os.listdir(images_path):
+            img_path = os.path.join(images_path, img)
+            pieces = img.split("-")
+            zaid = pieces[0]
+            tally = pieces[-1].split(".")[0]
+            images.append((tally, zaid, img_path))
+
+    tallies = []
+    by_tally = {}
+    for tally, zaid, img in images:
+        if tally not in tallies:
+            tallies.append(tally)
+            by_tally[tally] = {}
+        by_tally[tally][zaid] = img
+
+    sections = []
+    for tally in tallies:
+        # Be sure of the reordering
+        for zaid in sort_zaids(by_tally[tally]):
+            title = sphere_title(zaid, libmanager, mat_settings)
+            sections.append(("Tally N." + str(tally), title, by_tally[tally][zaid]))
+
+    return sections
+
+
+def sort_zaids(zaids):
+    """
+    Sort zaids (or materials) as in the Sphere leakage atlas, i.e. by zaid
+    number. Materials follow the zaids.
+
+    Parameters
+    ----------
+    zaids : iterable
+        zaids (e.g. '1001.31c' or 1001) or material names (e.g. 'M10').
+
+    Returns
+    -------
+    list
+        sorted zaids.
+
+    """
+    return sorted(zaids, key=_zaid_sort_key)
+
+
+def sphere_title(zaid, libmanager, mat_settings):
+    """
+    Title of a Sphere leakage plot in the atlas.
+
+    Parameters
+    ----------
+    zaid : str
+        zaid (e.g. '1001.31c') or material name (e.g. 'M10').
+    lib_manager : libmanager.LibManager
+        Library manager for conversions and name recovery.
+    mat_settings : pd.DataFrame
+        contains settings for Materials
+
+    Returns
+    -------
+    str
+        title of the plot.
+
+    """
+    zaid = str(zaid)
+    title = "Zaid: " + zaid
+    try:
+        name, formula = libmanager.get_zaidname(zaid)
+        title = title + " (" + name + " " + formula + ")"
+    except ValueError:  # A material is passed instead of zaid
+        matname = mat_settings.loc[zaid, "Name"]
+        title = title + " (" + matname + ")"
+    return title
+
+
+def _zaid_sort_key(zaid):
+    try:
+        return (0, float(str(zaid).split(".")[0]))
+    except ValueError:
+        # materials follow the zaids
+        return (1, 0)
+
+
+def _get_image_size(img):
+    """Size [bytes] of an image file or buffer"""
+    if isinstance(img, BytesIO):
+        return img.getbuffer().nbytes
+    return os.path.getsize(img)
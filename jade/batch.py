@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+@author: JADE Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+
+Non-interactive (batch) interface to JADE. The routines of the menus are
+called directly and all the choices (libraries, benchmarks, codes, override
+of previous results) are given as arguments, so that JADE can be driven by
+scripts and job schedulers, e.g.
+
+    jade run --lib 31c --benchmarks Sphere Oktavian --override
+    jade pp --lib 31c
+    jade compare --lib 31c 32c
+    jade compare --lib 31c --exp
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+import jade.computational as cmp
+from jade.main import CODES, Session
+from jade.status import EXP_TAG
+
+# colors
+CRED = "\033[91m"
+CEND = "\033[0m"
+
+
+class BatchError(Exception):
+    """Raised when a batch action cannot be performed"""
+
+
+def select_benchmarks(
+    session: Session,
+    benchmarks: list[str] = None,
+    codes: list[str] = None,
+    exp: bool = False,
+    action: str = "Run",
+) -> None:
+    """
+    Override the benchmarks and codes selection of the configuration file.
+    Only the configuration loaded in the session is modified.
+
+    Parameters
+    ----------
+    session : Session
+        JADE session.
+    benchmarks : list[str], optional
+        benchmarks to consider, either their name (e.g. 'Sphere') or their
+        description. All the others are deactivated. The default is None,
+        meaning the ones active in the configuration file.
+    codes : list[str], optional
+        codes to be used for the considered benchmarks (e.g. 'mcnp'). The
+        default is None, meaning the ones active in the configuration file.
+    exp : bool, optional
+        if True the experimental benchmarks are selected. The default is
+        False.
+    action : str, optional
+        either 'Run' or 'Post-Processing'. If 'Post-Processing', the selected
+        benchmarks are also activated for post-processing. The default is
+        'Run'.
+
+    Raises
+    ------
+    BatchError
+        if a benchmark or a code is not recognized.
+
+    Returns
+    -------
+    None.
+
+    """
+    if exp:
+        config = session.conf.exp_default
+    else:
+        config = session.conf.comp_default
+
+    names = config["Folder Name"].astype(str).str.split(".").str[0]
+    if benchmarks is None:
+        selected = pd.Series(True, index=config.index)
+    else:
+        known = set(names).union(config["Description"])
+        unknown = [bench for bench in benchmarks if bench not in known]
+        if len(unknown) > 0:
+            raise BatchError("Unknown benchmark(s): " + ", ".join(unknown))
+        selected = names.isin(benchmarks) | config["Description"].isin(benchmarks)
+
+    if codes is not None:
+        unknown = [code for code in codes if code not in CODES.values()]
+        if len(unknown) > 0:
+            raise BatchError("Unknown code(s): " + ", ".join(unknown))
+
+    for label, codename in CODES.items():
+        if label not in config.columns:
+            continue
+        flags = config[label].astype(object)
+        if codes is not None:
+            flags[selected] = codename in codes
+        flags[~selected] = False
+        config[label] = flags
+
+    if action == "Post-Processing" and benchmarks is not None:
+        flags = config["Post-Processing"].astype(object)
+        flags[selected] = True
+        config["Post-Processing"] = flags
+
+
+def run(
+    session: Session,
+    lib: str,
+    exp: bool = False,
+    submit: bool = False,
+    override: bool = False,
+) -> None:
+    """
+    Generate and run the active benchmarks for a library.
+
+    Parameters
+    ----------
+    session : Session
+        JADE session.
+    lib : str
+        library to assess (e.g. 31c), couple activation-transport
+        (e.g. 99c-31c) or dictionary string as in the interactive menus.
+    exp : bool, optional
+        if True the experimental benchmarks are run. The default is False.
+    submit : bool, optional
+        if True the simulations are submitted as jobs to the batch system,
+        otherwise they are run in the command line. The default is False.
+    override : bool, optional
+        if True benchmarks already run are overridden, otherwise their
+        presence stops the run. The default is False.
+
+    Raises
+    ------
+    BatchError
+        if the run cannot be performed.
+
+    Returns
+    -------
+    None.
+
+    """
+    codes = list(session.check_active_tests("Run", exp=exp).keys())
+    codes.extend(session.check_active_tests("OnlyInput", exp=exp).keys())
+    if len(codes) == 0:
+        raise BatchError("No benchmark is active for the run")
+    _check_libraries(session, lib, set(codes))
+
+    if submit:
+        runoption = "s"
+        conf = session.conf
+        if pd.isnull(conf.batch_system):
+            raise BatchError("No batch system is defined in the config file")
+        if pd.isnull(conf.mpi_exec_prefix) and not pd.isnull(conf.mpi_tasks):
+            if int(conf.mpi_tasks) > 1:
+                raise BatchError(
+                    "No MPI executable prefix is defined in the config file"
+                )
+    else:
+        runoption = "c"
+
+    # it may happen that lib are two but only the first is the assessed
+    if exp and len(lib.split("-")) > 1:
+        libtocheck = lib.split("-")[0]
+    else:
+        libtocheck = lib
+    if not session.state.check_override_run(
+        libtocheck, session, exp=exp, override=override
+    ):
+        raise BatchError("Benchmarks already run, use the override option")
+
+    if exp:
+        tag = "Experimental"
+    else:
+        tag = "Computational"
+    session.log.bar_adjourn(tag + " benchmark execution started")
+    session.log.adjourn("Selected Library: " + lib, spacing=False, time=True)
+    cmp.executeBenchmarksRoutines(session, lib, runoption, exp=exp)
+    session.log.bar_adjourn(tag + " benchmark execution ended")
+
+
+def postprocess(session: Session, lib: str, override: bool = False) -> None:
+    """
+    Post-process the active benchmarks of a single library.
+
+    Parameters
+    ----------
+    session : Session
+        JADE session.
+    lib : str
+        library to post-process.
+    override : bool, optional
+        if True all the outputs of a previous post-processing are rebuilt,
+        otherwise only the outdated ones. The default is False.
+
+    Raises
+    ------
+    BatchError
+        if the post-processing cannot be performed.
+
+    Returns
+    -------
+    None.
+
+    """
+    import jade.postprocess as pp
+
+    _check_run(session, [lib])
+    to_perform = session.check_active_tests("Post-Processing")
+    session.log.bar_adjourn("Post-Processing started")
+    session.log.adjourn("Selected Library: " + lib, spacing=False)
+    for code, testnames in to_perform.items():
+        pp.postprocessBenchmark(session, lib, code, testnames, force=override)
+    session.log.bar_adjourn("Post-Processing completed", spacing=False)
+
+
+def compare(
+    session: Session, libs: list[str], exp: bool = False, override: bool = False
+) -> None:
+    """
+    Compare libraries on the active benchmarks. The missing single library
+    post-processing is performed first.
+
+    Parameters
+    ----------
+    session : Session
+        JADE session.
+    libs : list[str]
+        libraries to compare, the first one is the reference. For the
+        experimental benchmarks the reference are the experimental data.
+    exp : bool, optional
+        if True the libraries are compared against the experimental
+        benchmarks. The default is False.
+    override : bool, optional
+        if True all the outputs of a previous comparison are rebuilt,
+        otherwise only the outdated ones. The default is False.
+
+    Raises
+    ------
+    BatchError
+        if the comparison cannot be performed.
+
+    Returns
+    -------
+    None.
+
+    """
+    import jade.postprocess as pp
+
+    if not exp and len(libs) < 2:
+        raise BatchError("At least two libraries are needed for a comparison")
+    _check_run(session, libs, exp=exp)
+
+    if exp:
+        lib_input = EXP_TAG + "-" + "-".join(libs)
+    else:
+        lib_input = "-".join(libs)
+
+    to_perform = session.check_active_tests("Post-Processing", exp=exp)
+    session.log.bar_adjourn("Comparison Post-Processing started")
+    session.log.adjourn("Selected Library: " + "-".join(libs), spacing=True)
+    # Execute the single pp still missing
+    if not exp:
+        for lib in libs:
+            if session.state.check_pp_single(lib, session):
+                continue
+            print(" Single PP of library " + lib + " required")
+            for code, testnames in to_perform.items():
+                pp.postprocessBenchmark(session, lib, code, testnames)
+            session.log.adjourn(
+                "Additional Post-Processing of library:" + lib + " completed\n",
+                spacing=False,
+            )
+    # Execute Comparison
+    for code, testnames in to_perform.items():
+        pp.compareBenchmark(
+            session, lib_input, code, testnames, exp=exp, force=override
+        )
+    session.log.bar_adjourn("Post-Processing completed", spacing=False)
+
+
+def _check_libraries(session: Session, lib: str, codes: set[str]) -> None:
+    """Check that all the libraries of a library input are available"""
+    if lib[0] == "{":
+        libs = json.loads(lib)
+        tocheck = list(libs.values()) + list(libs.keys())
+    else:
+        tocheck = lib.split("-")
+
+    missing = []
+    for val in tocheck:
+        for code in codes:
+            if val not in session.lib_manager.libraries[code]:
+                missing.append(val + " (" + code + ")")
+    if len(missing) > 0:
+        raise BatchError("Libraries not available: " + ", ".join(missing))
+
+
+def _check_run(session: Session, libs: list[str], exp: bool = False) -> None:
+    """Check that the libraries were run for all the post-processing codes"""
+    for lib in libs:
+        test_run = session.state.check_lib_run(lib, session, "Post-Processing", exp=exp)
+        not_run = [code for code, tests in test_run.items() if len(tests) == 0]
+        if len(not_run) > 0:
+            raise BatchError(
+                lib + " was not run for the following codes: " + ", ".join(not_run)
+            )
+
+
+def main(argv: list[str] = None) -> None:
+    """
+    Command line interface of the batch mode, e.g.
+
+        jade run --lib 31c --benchmarks Sphere --codes mcnp --override
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        command line arguments. The default is None, meaning sys.argv.
+
+    Returns
+    -------
+    None.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="jade", description="Run JADE without the interactive menus"
+    )
+    parser.add_argument(
+        "--root", help="JADE root folder (default: the current directory)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="generate and run benchmarks")
+    run_parser.add_argument(
+        "--lib", required=True, help="library to assess (e.g. 31c or 99c-31c)"
+    )
+    run_parser.add_argument(
+        "--submit", action="store_true", help="submit the runs to the batch system"
+    )
+    pp_parser = subparsers.add_parser("pp", help="post-process a single library")
+    pp_parser.add_argument("--lib", required=True, help="library to post-process")
+    compare_parser = subparsers.add_parser("compare", help="compare libraries")
+    compare_parser.add_argument(
+        "--lib",
+        required=True,
+        nargs="+",
+        help="libraries to compare, the first one is the reference",
+    )
+    for sub in [run_parser, compare_parser]:
+        sub.add_argument(
+            "--exp", action="store_true", help="use the experimental benchmarks"
+        )
+    for sub in [run_parser, pp_parser, compare_parser]:
+        sub.add_argument(
+            "--benchmarks",
+            nargs="+",
+            help="benchmarks to consider (default: the active ones in Config.xlsx)",
+        )
+        sub.add_argument(
+            "--codes",
+            nargs="+",
+            choices=list(CODES.values()),
+            help="codes to use (default: the active ones in Config.xlsx)",
+        )
+        sub.add_argument(
+            "--override",
+            action="store_true",
+            help="override results already present (rebuild all the outputs)",
+        )
+
+    args = parser.parse_args(argv)
+    if args.root is not None:
+        os.chdir(args.root)
+    session = Session()
+    exp = getattr(args, "exp", False)
+
+    try:
+        if args.command == "run":
+            select_benchmarks(session, args.benchmarks, args.codes, exp=exp)
+            run(session, args.lib, exp=exp, submit=args.submit, override=args.override)
+        else:
+            select_benchmarks(
+                session,
+                args.benchmarks,
+                args.codes,
+                exp=exp,
+                action="Post-Processing",
+            )
+            if args.command == "pp":
+                postprocess(session, args.lib, override=args.override)
+            else:
+                compare(session, args.lib, exp=exp, override=args.override)
+    except BatchError as e:
+        print(CRED + " " + str(e) + CEND)
+        session.log.adjourn("Batch " + args.command + " aborted: " + str(e))
+        sys.exit(1)
+
+    session.log.adjourn("\nSession concluded normally \n")
+
+
+if __name__ == "__main__":
+    main()
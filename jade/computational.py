@@ -173,6 +173,7 @@ def executeBenchmarksRoutines(session, lib: str, runoption, exp=False) -> None:
                 test.generate_test(outpath, libmanager, limit=limit)
             else:
                 test.generate_test(outpath, libmanager)
+            session.state.register(test.run_dir)
             # Adjourn log
             log.adjourn(
                 testname.upper()
@@ -188,6 +189,7 @@ def executeBenchmarksRoutines(session, lib: str, runoption, exp=False) -> None:
                 print(" Simulation running:         " + str(datetime.datetime.now()))
                 # test.run(cpu=session.conf.cpu)
                 test.run(session.conf, session.lib_manager, runoption)
+                session.state.register(test.run_dir)
                 print("\n        -- " + testname.upper() + " COMPLETED --\n")
                 # Adjourn log
                 log.adjourn(
@@ -28,11 +28,15 @@ import sys
 
 import pandas as pd
 
+import jade.excelcache as excelcache
 from jade.exceptions import fatal_exception
 
+# Default size of the plots cache [MB]
+DEFAULT_PLOT_CACHE_SIZE = 500
+
 
 class Configuration:
-    def __init__(self, conf_file):
+    def __init__(self, conf_file, cache_dir=None):
         """
         Parser of the main configuration file
 
@@ -40,6 +44,9 @@ class Configuration:
         ----------
         conf_file : path like object
             path to configuration file.
+        cache_dir : path like object, optional
+            folder where the parsed sheets are cached between sessions. The
+            default is None, meaning that they are cached only in memory.
 
         Returns
         -------
@@ -48,6 +55,7 @@ class Configuration:
         """
         # ############ load conf file sheets ############
         self.conf_file = conf_file
+        self.cache_dir = cache_dir
         self.read_settings()
 
     def _process_path(self, file_path: str) -> str:
@@ -85,9 +93,10 @@ class Configuration:
         """
 
         conf_file = self.conf_file
+        cache_dir = self.cache_dir
         # Main
-        main = pd.read_excel(
-            conf_file, sheet_name="MAIN Config.", skiprows=1, header=None
+        main = excelcache.read_excel(
+            conf_file, cache_dir, sheet_name="MAIN Config.", skiprows=1, header=None
         )
         main.columns = ["Variable", "Value"]
         main.set_index("Variable", inplace=True)
@@ -104,6 +113,79 @@ class Configuration:
         self.mpi_exec_prefix = main["Value"].loc["MPI executable prefix"]
         self.batch_system = main["Value"].loc["Batch system"]
         self.batch_file = self._process_path(main["Value"].loc["Batch file"])
+        # Optional, older configuration files may not have it
+        try:
+            pp_workers = main["Value"].loc["Post-processing workers"]
+        except KeyError:
+            pp_workers = 1
+        if pd.isnull(pp_workers):
+            pp_workers = 1
+        elif int(pp_workers) == 0:
+            # use all the available cores
+            pp_workers = os.cpu_count()
+        self.pp_workers = int(pp_workers)
+        # Optional, if missing or 0 atlases are not split in volumes
+        try:
+            atlas_volume_size = main["Value"].loc["Atlas volume size"]
+        except KeyError:
+            atlas_volume_size = None
+        if pd.isnull(atlas_volume_size) or int(atlas_volume_size) == 0:
+            self.atlas_volume_size = None
+        else:
+            self.atlas_volume_size = int(atlas_volume_size)
+        # Optional, maximum size in MB of the plots of an atlas volume
+        try:
+            atlas_volume_mb = main["Value"].loc["Atlas volume MB"]
+        except KeyError:
+            atlas_volume_mb = None
+        if pd.isnull(atlas_volume_mb) or float(atlas_volume_mb) == 0:
+            self.atlas_volume_max_size = None
+        else:
+            self.atlas_volume_max_size = int(float(atlas_volume_mb) * 1024**2)
+        # Optional, if True each section of an atlas is a separate volume
+        try:
+            per_section = main["Value"].loc["Atlas volume per section"]
+        except KeyError:
+            per_section = False
+        if pd.isnull(per_section):
+            per_section = False
+        self.atlas_volume_per_section = str(per_section).lower() in ["true", "yes", "1"]
+        # Optional, if missing full quality atlases are produced
+        try:
+            atlas_draft = main["Value"].loc["Atlas draft mode"]
+        except KeyError:
+            atlas_draft = False
+        if pd.isnull(atlas_draft):
+            atlas_draft = False
+        self.atlas_draft = str(atlas_draft).lower() in ["true", "yes", "1"]
+        # Optional, maximum number of bins of the plotted spectra
+        try:
+            plot_max_bins = main["Value"].loc["Plot max bins"]
+        except KeyError:
+            plot_max_bins = None
+        if pd.isnull(plot_max_bins) or int(plot_max_bins) == 0:
+            self.plot_max_bins = None
+        else:
+            self.plot_max_bins = int(plot_max_bins)
+        # Optional, size of the plots cache in MB. 0 disables the cache
+        try:
+            plot_cache_size = main["Value"].loc["Plot cache size"]
+        except KeyError:
+            plot_cache_size = DEFAULT_PLOT_CACHE_SIZE
+        if pd.isnull(plot_cache_size):
+            plot_cache_size = DEFAULT_PLOT_CACHE_SIZE
+        if int(plot_cache_size) == 0:
+            self.plot_cache_size = None
+        else:
+            self.plot_cache_size = int(plot_cache_size) * 1024**2
+        # Optional, if True raw data is also exported as .csv files
+        try:
+            raw_csv = main["Value"].loc["Raw data CSV"]
+        except KeyError:
+            raw_csv = False
+        if pd.isnull(raw_csv):
+            raw_csv = False
+        self.raw_csv = str(raw_csv).lower() in ["true", "yes", "1"]
 
         """ Legacy config variables """
         # self.xsdir_path = main['Value'].loc['xsdir Path']
@@ -112,19 +194,21 @@ class Configuration:
         # self.cpu = main['Value'].loc['CPU']
 
         # Computational
-        comp_default = pd.read_excel(
-            conf_file, sheet_name="Computational benchmarks", skiprows=2
+        comp_default = excelcache.read_excel(
+            conf_file, cache_dir, sheet_name="Computational benchmarks", skiprows=2
         )
         self.comp_default = comp_default.dropna(subset=["Folder Name"])
 
         # Experimental
-        comp_default = pd.read_excel(
-            conf_file, sheet_name="Experimental benchmarks", skiprows=2
+        comp_default = excelcache.read_excel(
+            conf_file, cache_dir, sheet_name="Experimental benchmarks", skiprows=2
         )
         self.exp_default = comp_default.dropna(subset=["Folder Name"])
 
         # Libraries
-        lib = pd.read_excel(conf_file, sheet_name="Libraries", keep_default_na=False)
+        lib = excelcache.read_excel(
+            conf_file, cache_dir, sheet_name="Libraries", keep_default_na=False
+        )
         self.lib = lib
 
         # self.default_lib = lib[lib['Default'] == 'yes']['Suffix'].values[0]
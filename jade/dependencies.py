@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+@author: JADE Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+
+Dependency tracking of the post-processing artifacts (Excel, raw data and
+atlas folders of a benchmark). As in make, each artifact records the
+fingerprints of what it was built from (simulation outputs, configuration
+files and options) and of the files it produced. An artifact is rebuilt only
+if one of them changed since the last post-processing.
+"""
+import json
+import logging
+import os
+
+# Artifacts produced by the post-processing of a benchmark
+ARTIFACTS = ["Excel", "Raw_Data", "Atlas"]
+MANIFEST_FILE = "Dependencies.json"
+
+
+def fingerprint(path, subfolder=None):
+    """
+    Get a fingerprint of a file or of a folder (all the files it contains,
+    recursively) that changes if any of them is modified, added or removed.
+
+    Parameters
+    ----------
+    path : path like object
+        file or folder.
+    subfolder : str, optional
+        if provided, only the files contained in folders with this name are
+        considered (e.g. 'mcnp' to consider only the MCNP outputs of a
+        benchmark run). The default is None.
+
+    Returns
+    -------
+    list or None
+        [modification time [ns], size] for a file, [relative path,
+        modification time [ns], size] of each file for a folder. None if the
+        path does not exist.
+
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_size]
+    if not os.path.isdir(path):
+        return None
+
+    files = []
+    for root, _, filenames in os.walk(path):
+        relpath = os.path.relpath(root, path)
+        if subfolder is not None and subfolder not in relpath.split(os.sep):
+            continue
+        for filename in filenames:
+            stat = os.stat(os.path.join(root, filename))
+            name = os.path.normpath(os.path.join(relpath, filename))
+            files.append([name, stat.st_mtime_ns, stat.st_size])
+
+    return sorted(files)
+
+
+class Manifest:
+    def __init__(self, out_path):
+        """
+        Record of the dependencies of the artifacts produced in a
+        post-processing output folder (e.g. <lib>/<benchmark>/<code>).
+
+        Parameters
+        ----------
+        out_path : path like object
+            output folder, each artifact is one of its sub-folders.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.out_path = out_path
+        self.path = os.path.join(out_path, MANIFEST_FILE)
+        self.artifacts = self._load()
+
+    def get_stale(self, dependencies):
+        """
+        Get the artifacts that need to be rebuilt, i.e. the ones never built,
+        whose dependencies changed or whose files were modified.
+
+        Parameters
+        ----------
+        dependencies : dict
+            current dependencies of each artifact, {artifact: {name: value}}.
+            Values must be JSON serializable.
+
+        Returns
+        -------
+        list[str]
+            stale artifacts.
+
+        """
+        # Compared as they would be stored
+        dependencies = json.loads(json.dumps(dependencies))
+        stale = []
+        for artifact, depends in dependencies.items():
+            record = self.artifacts.get(artifact)
+            product = fingerprint(os.path.join(self.out_path, artifact))
+            if (
+                record is None
+                or product is None
+                or record.get("dependencies") != depends
+                or record.get("product") != product
+            ):
+                stale.append(artifact)
+
+        return stale
+
+    def record(self, dependencies):
+        """
+        Record the dependencies and the files of the artifacts after they
+        have been built and save the manifest.
+
+        Parameters
+        ----------
+        dependencies : dict
+            dependencies of each artifact, {artifact: {name: value}}.
+
+        Returns
+        -------
+        None.
+
+        """
+        for artifact, depends in json.loads(json.dumps(dependencies)).items():
+            product = fingerprint(os.path.join(self.out_path, artifact))
+            self.artifacts[artifact] = {"dependencies": depends, "product": product}
+        self.save()
+
+    def save(self):
+        """
+        Save the manifest in the output folder.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Written aside and then moved, a crash never leaves half a file
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        try:
+            with open(tmp_path, "w") as outfile:
+                json.dump(self.artifacts, outfile)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logging.warning("The dependencies %s could not be written", self.path)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as infile:
+                artifacts = json.load(infile)
+        except (OSError, ValueError):
+            artifacts = None
+        if not isinstance(artifacts, dict):
+            logging.warning("Invalid dependencies %s, ignored", self.path)
+            return {}
+        return artifacts
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+@author: JADE Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+
+Cache of the Excel workbooks read by JADE (configuration files, experimental
+results). Parsing a workbook through openpyxl is slow, the parsed DataFrames
+are then kept in memory for the whole session and stored as binary (pickle)
+snapshots to be reused by the following sessions. A snapshot is valid as long
+as the workbook is not modified: its modification time and size are checked
+first and, if they changed, the content hash decides.
+"""
+import copy
+import hashlib
+import logging
+import os
+import pickle
+
+import pandas as pd
+
+# Folder of the snapshots inside the JADE cache
+CACHE_FOLDER = "Excel"
+SNAPSHOT_KEYS = {"signature", "hash", "frames"}
+# Snapshots already loaded in this session, keyed by workbook path
+_MEMORY = {}
+
+
+def read_excel(path, cache_dir=None, **kwargs):
+    """
+    Read a workbook as pd.read_excel, using the cached DataFrames if the
+    workbook did not change since they were parsed.
+
+    Parameters
+    ----------
+    path : path like object
+        path to the workbook.
+    cache_dir : path like object, optional
+        folder where the binary snapshots are stored. The default is None,
+        meaning that the parsed data is only kept in memory.
+    **kwargs
+        arguments of pd.read_excel (e.g. sheet_name, skiprows).
+
+    Returns
+    -------
+    pd.DataFrame or dict
+        as returned by pd.read_excel. A copy is returned, it can be modified
+        without affecting the cache.
+
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    snapshot_path = None
+    if cache_dir is not None:
+        snapshot_path = _get_snapshot_path(path, cache_dir)
+
+    snapshot = _MEMORY.get(path)
+    if snapshot is None and snapshot_path is not None:
+        snapshot = _load_snapshot(snapshot_path)
+
+    modified = False
+    if snapshot is not None and snapshot["signature"] != signature:
+        # The file may have been touched or copied without being modified
+        digest = _get_hash(path)
+        if snapshot["hash"] == digest:
+            snapshot["signature"] = signature
+            modified = True
+        else:
+            snapshot = None
+    if snapshot is None:
+        snapshot = {"signature": signature, "hash": _get_hash(path), "frames": {}}
+        modified = True
+
+    key = repr(sorted(kwargs.items()))
+    if key not in snapshot["frames"]:
+        snapshot["frames"][key] = pd.read_excel(path, **kwargs)
+        modified = True
+    _MEMORY[path] = snapshot
+
+    if modified and snapshot_path is not None:
+        _save_snapshot(snapshot_path, snapshot)
+
+    return copy.deepcopy(snapshot["frames"][key])
+
+
+def clear_memory():
+    """
+    Forget the snapshots loaded in this session, the ones stored on disk are
+    kept.
+
+    Returns
+    -------
+    None.
+
+    """
+    _MEMORY.clear()
+
+
+def _get_snapshot_path(path, cache_dir):
+    """Snapshot file of a workbook, the full path avoids name clashes"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(path.encode()).hexdigest()[:10]
+    return os.path.join(cache_dir, "{}_{}.pickle".format(name, digest))
+
+
+def _get_hash(path):
+    """Hash of the content of a file"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as infile:
+        for block in iter(lambda: infile.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_snapshot(snapshot_path):
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, "rb") as infile:
+            snapshot = pickle.load(infile)
+    except Exception:  # e.g. corrupted or written by another pandas version
+        snapshot = None
+    if not isinstance(snapshot, dict) or set(snapshot) != SNAPSHOT_KEYS:
+        logging.warning("Invalid Excel cache %s, it will be rebuilt", snapshot_path)
+        return None
+    return snapshot
+
+
+def _save_snapshot(snapshot_path, snapshot):
+    # Written aside and then moved, other sessions never read half a file
+    tmp_path = "{}.{}.tmp".format(snapshot_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with open(tmp_path, "wb") as outfile:
+            pickle.dump(snapshot, outfile)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        logging.warning("The Excel cache %s could not be written", snapshot_path)
@@ -21,12 +21,23 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 """
-from copy import copy
+import warnings
 
-import openpyxl
+import numpy as np
 import pandas as pd
-from openpyxl.worksheet.worksheet import Worksheet
-from xlsxwriter.utility import xl_rowcol_to_cell
+import xlsxwriter
+from xlsxwriter.utility import xl_cell_to_rowcol, xl_range, xl_rowcol_to_cell
+
+try:
+    from xlsxwriter.exceptions import OverlappingRange
+except ImportError:  # older xlsxwriter versions
+    OverlappingRange = ValueError
+
+# Same format used by pandas for the header and index cells
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+# Major versions of xlsxwriter whose worksheets store the merged ranges in
+# their merge list, see _register_merge()
+MERGE_LIST_VERSIONS = [1, 2, 3]
 
 
 def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
@@ -50,10 +61,15 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
     -------
     None
     """
-    writer = pd.ExcelWriter(outpath, engine="xlsxwriter")
+    writer = streaming_writer(outpath)
+    wb = writer.book
 
-    # for df in (tallies, errors):
-    # df.set_index("Zaid", inplace=True)
+    # The rows are streamed in order: the layout of the sheets is buffered
+    # and written together with the tables at the end
+    tal_sheet = wb.add_worksheet("Values")
+    err_sheet = wb.add_worksheet("Errors")
+    tal_rows = _RowBuffer(tal_sheet)
+    err_rows = _RowBuffer(err_sheet)
 
     startrow = 8
     startcol = 1
@@ -64,26 +80,14 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
     for _, results in tallies.items():
         tally_len, tally_width = results["Value"].shape
         df_positions.append([startrow, startcol])
-        results["Value"].to_excel(
-            writer, startrow=startrow + 1, startcol=startcol, sheet_name="Values"
-        )
-        results["Error"].to_excel(
-            writer, startrow=startrow + 1, startcol=startcol, sheet_name="Errors"
-        )
         startrow = startrow + tally_len + 3
         max_len = max_len + tally_len + 3
         if tally_width > max_width:
             max_width = tally_width
 
-    wb = writer.book
-    tal_sheet = writer.sheets["Values"]
-    err_sheet = writer.sheets["Errors"]
-
     if stats is not None:
-        stats.to_excel(
-            writer, startrow=8, startcol=0, sheet_name="Statistical Checks", index=False
-        )
-        stat_sheet = writer.sheets["Statistical Checks"]
+        stat_sheet = wb.add_worksheet("Statistical Checks")
+        stat_rows = _RowBuffer(stat_sheet)
         stats_len, stats_width = stats.shape
 
     # Formatting styles
@@ -130,17 +134,18 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
 
     scientific_format = wb.add_format({"num_format": "0.00E+00"})
     percent_format = wb.add_format({"num_format": "0.00%"})
+    header_format = wb.add_format(HEADER_FORMAT)
 
     # tallies
 
     # Title Format
-    tal_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    tal_sheet.merge_range("D1:D2", lib, subtitle_merge_format)
-    tal_sheet.merge_range(
+    tal_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    tal_rows.merge_range("D1:D2", lib, subtitle_merge_format)
+    tal_rows.merge_range(
         "B3:L8", "{} RESULTS RECAP: TALLIES".format(testname), title_merge_format
     )
     for tal in range(len(df_positions)):
-        tal_sheet.merge_range(
+        tal_rows.merge_range(
             df_positions[tal][0],
             df_positions[tal][1] + 1,
             df_positions[tal][0],
@@ -156,9 +161,9 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
     tal_sheet.set_column(0, 0, 4, oob_format)
     tal_sheet.set_column(max_width + 1, max_width + 1000, 18, oob_format)
     for i in range(9):
-        tal_sheet.set_row(i, None, oob_format)
+        tal_rows.set_row(i, None, oob_format)
     for i in range(8 + max_len, max_len + 50):
-        tal_sheet.set_row(i, None, oob_format)
+        tal_rows.set_row(i, None, oob_format)
 
     # Column widths
     tal_sheet.set_column(1, max_width + 1, 20)
@@ -198,13 +203,13 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
     # ERRORS
 
     # Title
-    err_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    err_sheet.merge_range("D1:D2", lib, subtitle_merge_format)
-    err_sheet.merge_range(
+    err_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    err_rows.merge_range("D1:D2", lib, subtitle_merge_format)
+    err_rows.merge_range(
         "B3:L8", "{} RESULTS RECAP: ERRORS".format(testname), title_merge_format
     )
     for tal in range(len(df_positions)):
-        err_sheet.merge_range(
+        err_rows.merge_range(
             df_positions[tal][0],
             df_positions[tal][1] + 1,
             df_positions[tal][0],
@@ -222,24 +227,24 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
     err_sheet.set_column(0, 0, 4, oob_format)
     err_sheet.set_column(max_width + 1, max_width + 1000, 18, oob_format)
     for i in range(9):
-        err_sheet.set_row(i, None, oob_format)
+        err_rows.set_row(i, None, oob_format)
     for i in range(8 + max_len, max_len + 50):
-        err_sheet.set_row(i, None, oob_format)
+        err_rows.set_row(i, None, oob_format)
 
     # Column widths
     err_sheet.set_column(1, max_width + 1, 20)
 
     # Legend
-    err_sheet.merge_range("N3:O3", "LEGEND", merge_format)
-    err_sheet.merge_range("N2:O2", "According to MCNP manual", oob_format)
-    err_sheet.write("N4", "", red_cell_format)
-    err_sheet.write("O4", "> 50%", legend_text_format)
-    err_sheet.write("N5", "", orange_cell_format)
-    err_sheet.write("O5", "20% ≤ 50%", legend_text_format)
-    err_sheet.write("N6", "", yellow_cell_format)
-    err_sheet.write("O6", "10% ≤ 20%", legend_text_format)
-    err_sheet.write("N7", "", green_cell_format)
-    err_sheet.write("O7", "< 10%", legend_text_format)
+    err_rows.merge_range("N3:O3", "LEGEND", merge_format)
+    err_rows.merge_range("N2:O2", "According to MCNP manual", oob_format)
+    err_rows.write("N4", "", red_cell_format)
+    err_rows.write("O4", "> 50%", legend_text_format)
+    err_rows.write("N5", "", orange_cell_format)
+    err_rows.write("O5", "20% ≤ 50%", legend_text_format)
+    err_rows.write("N6", "", yellow_cell_format)
+    err_rows.write("O6", "10% ≤ 20%", legend_text_format)
+    err_rows.write("N7", "", green_cell_format)
+    err_rows.write("O7", "< 10%", legend_text_format)
 
     # Conditional Formatting
     err_sheet.conditional_format(
@@ -366,9 +371,9 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
     # STAT CHECKS
     if stats is not None:
         # Title
-        stat_sheet.merge_range("A1:B2", "LIBRARY", subtitle_merge_format)
-        stat_sheet.merge_range("C1:C2", lib, subtitle_merge_format)
-        stat_sheet.merge_range(
+        stat_rows.merge_range("A1:B2", "LIBRARY", subtitle_merge_format)
+        stat_rows.merge_range("C1:C2", lib, subtitle_merge_format)
+        stat_rows.merge_range(
             "A3:C8",
             "10 MCNP Statistical Checks",
             title_merge_format,
@@ -380,9 +385,9 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
         # out of bounds
         stat_sheet.set_column(3, stats_width + 1000, 18, oob_format)
         for i in range(9):
-            stat_sheet.set_row(i, None, oob_format)
+            stat_rows.set_row(i, None, oob_format)
         for i in range(9 + stats_len, stats_len + 50):
-            stat_sheet.set_row(i, None, oob_format)
+            stat_rows.set_row(i, None, oob_format)
 
         # Column widths
         stat_sheet.set_column(1, 1, 50)
@@ -426,6 +431,21 @@ def single_excel_writer(self, outpath, lib, testname, tallies, stats=None):
             },
         )
 
+    # Write the tables together with the buffered layout
+    for (row, col), results in zip(df_positions, tallies.values()):
+        for rows, label in [(tal_rows, "Value"), (err_rows, "Error")]:
+            rows.flush(row + 1)
+            write_df(
+                rows.sheet, results[label], row + 1, col, header_format=header_format
+            )
+    tal_rows.flush()
+    err_rows.flush()
+
+    if stats is not None:
+        stat_rows.flush(8)
+        write_df(stat_sheet, stats, 8, 0, index=False, header_format=header_format)
+        stat_rows.flush()
+
     wb.close()
 
 
@@ -455,7 +475,17 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     -------
     None
     """
-    writer = pd.ExcelWriter(outpath, engine="xlsxwriter")
+    writer = streaming_writer(outpath)
+    wb = writer.book
+
+    # The rows are streamed in order: the layout of the sheets is buffered
+    # and written together with the tables at the end
+    comp_sheet = wb.add_worksheet("Comparisons (%)")
+    std_dev_sheet = wb.add_worksheet("Comparisons (std. dev.)")
+    absdiff_sheet = wb.add_worksheet("Comparisons (abs. diff.)")
+    comp_rows = _RowBuffer(comp_sheet)
+    std_dev_rows = _RowBuffer(std_dev_sheet)
+    absdiff_rows = _RowBuffer(absdiff_sheet)
 
     title = testname + " RESULTS RECAP: Comparison"
     startrow = 8
@@ -467,35 +497,11 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     for i in range(len(comps.keys())):
         comp_len, comp_width = list(comps.values())[i]["Value"].shape
         df_positions.append([startrow, startcol])
-        list(comps.values())[i]["Value"].to_excel(
-            writer,
-            startrow=startrow + 1,
-            startcol=startcol,
-            sheet_name="Comparisons (%)",
-        )
-        list(std_devs.values())[i]["Value"].to_excel(
-            writer,
-            startrow=startrow + 1,
-            startcol=startcol,
-            sheet_name="Comparisons (std. dev.)",
-        )
-        list(abs_diffs.values())[i]["Value"].to_excel(
-            writer,
-            startrow=startrow + 1,
-            startcol=startcol,
-            sheet_name="Comparisons (abs. diff.)",
-        )
-
         startrow = startrow + comp_len + 3
         max_len = max_len + comp_len + 3
         if comp_width > max_width:
             max_width = comp_width
 
-    wb = writer.book
-    comp_sheet = writer.sheets["Comparisons (%)"]
-    std_dev_sheet = writer.sheets["Comparisons (std. dev.)"]
-    absdiff_sheet = writer.sheets["Comparisons (abs. diff.)"]
-
     # Formatting styles
     plain_format = wb.add_format({"bg_color": "#FFFFFF"})
     oob_format = wb.add_format(
@@ -539,17 +545,18 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
 
     scientific_format = wb.add_format({"num_format": "0.00E+00"})
     percent_format = wb.add_format({"num_format": "0.00%"})
+    header_format = wb.add_format(HEADER_FORMAT)
 
     # COMPARISON
 
     # Title Format
-    comp_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    comp_sheet.merge_range("D1:D2", lib_to_comp, subtitle_merge_format)
-    comp_sheet.merge_range(
+    comp_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    comp_rows.merge_range("D1:D2", lib_to_comp, subtitle_merge_format)
+    comp_rows.merge_range(
         "B3:L8", "{} RESULTS RECAP: COMPARISON (%)".format(testname), title_merge_format
     )
     for tal in range(len(df_positions)):
-        comp_sheet.merge_range(
+        comp_rows.merge_range(
             df_positions[tal][0],
             df_positions[tal][1] + 1,
             df_positions[tal][0],
@@ -565,24 +572,24 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     comp_sheet.set_column(0, 0, 4, oob_format)
     comp_sheet.set_column(max_width + 1, max_width + 1000, 18, oob_format)
     for i in range(9):
-        comp_sheet.set_row(i, None, oob_format)
+        comp_rows.set_row(i, None, oob_format)
     for i in range(8 + max_len, max_len + 50):
-        comp_sheet.set_row(i, None, oob_format)
+        comp_rows.set_row(i, None, oob_format)
 
     # Column widths
     comp_sheet.set_column(1, max_width + 1, 20)
 
     # Legend
-    comp_sheet.merge_range("N3:O3", "LEGEND", merge_format)
-    comp_sheet.merge_range("N2:O2", "According to MCNP manual", oob_format)
-    comp_sheet.write("N4", "", red_cell_format)
-    comp_sheet.write("O4", "> 50%", legend_text_format)
-    comp_sheet.write("N5", "", orange_cell_format)
-    comp_sheet.write("O5", "20% ≤ 50%", legend_text_format)
-    comp_sheet.write("N6", "", yellow_cell_format)
-    comp_sheet.write("O6", "10% ≤ 20%", legend_text_format)
-    comp_sheet.write("N7", "", green_cell_format)
-    comp_sheet.write("O7", "< 10%", legend_text_format)
+    comp_rows.merge_range("N3:O3", "LEGEND", merge_format)
+    comp_rows.merge_range("N2:O2", "According to MCNP manual", oob_format)
+    comp_rows.write("N4", "", red_cell_format)
+    comp_rows.write("O4", "> 50%", legend_text_format)
+    comp_rows.write("N5", "", orange_cell_format)
+    comp_rows.write("O5", "20% ≤ 50%", legend_text_format)
+    comp_rows.write("N6", "", yellow_cell_format)
+    comp_rows.write("O6", "10% ≤ 20%", legend_text_format)
+    comp_rows.write("N7", "", green_cell_format)
+    comp_rows.write("O7", "< 10%", legend_text_format)
 
     comp_sheet.conditional_format(
         10,
@@ -763,20 +770,20 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     # ABSOLUTE DIFFERENCE
 
     # Title
-    absdiff_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    absdiff_sheet.merge_range("D1:D2", lib_to_comp, subtitle_merge_format)
-    absdiff_sheet.merge_range(
+    absdiff_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    absdiff_rows.merge_range("D1:D2", lib_to_comp, subtitle_merge_format)
+    absdiff_rows.merge_range(
         "B3:L8",
         "{} RESULTS RECAP: ABSOLUTE DIFFERENCE".format(testname),
         title_merge_format,
     )
-    absdiff_sheet.merge_range(
+    absdiff_rows.merge_range(
         "E1:L2",
         "Target library Vs Reference library\n(Reference-Target)",
         subtitle_merge_format,
     )
     for tal in range(len(df_positions)):
-        absdiff_sheet.merge_range(
+        absdiff_rows.merge_range(
             df_positions[tal][0],
             df_positions[tal][1] + 1,
             df_positions[tal][0],
@@ -792,9 +799,9 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     absdiff_sheet.set_column(0, 0, 4, oob_format)
     absdiff_sheet.set_column(max_width + 1, max_width + 1000, 18, oob_format)
     for i in range(9):
-        absdiff_sheet.set_row(i, None, oob_format)
+        absdiff_rows.set_row(i, None, oob_format)
     for i in range(8 + max_len, max_len + 50):
-        absdiff_sheet.set_row(i, None, oob_format)
+        absdiff_rows.set_row(i, None, oob_format)
 
     # Column widths
     absdiff_sheet.set_column(1, max_width + 1, 20)
@@ -847,9 +854,9 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     # STANDARD DEVIATIONS
 
     # Title Format
-    std_dev_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    std_dev_sheet.merge_range("D1:D2", lib_to_comp, subtitle_merge_format)
-    std_dev_sheet.merge_range(
+    std_dev_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    std_dev_rows.merge_range("D1:D2", lib_to_comp, subtitle_merge_format)
+    std_dev_rows.merge_range(
         "B3:L8",
         "{} RESULTS RECAP: COMPARISON (Standard deviations from reference library)".format(
             testname
@@ -857,7 +864,7 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
         title_merge_format,
     )
     for tal in range(len(df_positions)):
-        std_dev_sheet.merge_range(
+        std_dev_rows.merge_range(
             df_positions[tal][0],
             df_positions[tal][1] + 1,
             df_positions[tal][0],
@@ -875,23 +882,23 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
     std_dev_sheet.set_column(0, 0, 4, oob_format)
     std_dev_sheet.set_column(max_width + 1, max_width + 1000, 18, oob_format)
     for i in range(9):
-        std_dev_sheet.set_row(i, None, oob_format)
+        std_dev_rows.set_row(i, None, oob_format)
     for i in range(8 + max_len, max_len + 50):
-        std_dev_sheet.set_row(i, None, oob_format)
+        std_dev_rows.set_row(i, None, oob_format)
 
     # Column widths for tallies, set up to 15th col to ensure title format correct
     std_dev_sheet.set_column(1, max_width + 1, 20)
 
     # Legend
-    std_dev_sheet.merge_range("N3:O3", "LEGEND", merge_format)
-    std_dev_sheet.write("N4", "", red_cell_format)
-    std_dev_sheet.write("O4", "3 < #σ", legend_text_format)
-    std_dev_sheet.write("N5", "", orange_cell_format)
-    std_dev_sheet.write("O5", "2 ≤ #σ ≤ 3", legend_text_format)
-    std_dev_sheet.write("N6", "", yellow_cell_format)
-    std_dev_sheet.write("O6", "1 ≤ #σ < 2", legend_text_format)
-    std_dev_sheet.write("N7", "", green_cell_format)
-    std_dev_sheet.write("O7", "#σ < 1", legend_text_format)
+    std_dev_rows.merge_range("N3:O3", "LEGEND", merge_format)
+    std_dev_rows.write("N4", "", red_cell_format)
+    std_dev_rows.write("O4", "3 < #σ", legend_text_format)
+    std_dev_rows.write("N5", "", orange_cell_format)
+    std_dev_rows.write("O5", "2 ≤ #σ ≤ 3", legend_text_format)
+    std_dev_rows.write("N6", "", yellow_cell_format)
+    std_dev_rows.write("O6", "1 ≤ #σ < 2", legend_text_format)
+    std_dev_rows.write("N7", "", green_cell_format)
+    std_dev_rows.write("O7", "#σ < 1", legend_text_format)
 
     std_dev_sheet.conditional_format(
         10,
@@ -1069,6 +1076,22 @@ def comp_excel_writer(self, outpath, lib_to_comp, testname, comps, abs_diffs, st
         },
     )
 
+    # Write the tables together with the buffered layout
+    for (row, col), comp, std_dev, abs_diff in zip(
+        df_positions, comps.values(), std_devs.values(), abs_diffs.values()
+    ):
+        for rows, results in [
+            (comp_rows, comp),
+            (std_dev_rows, std_dev),
+            (absdiff_rows, abs_diff),
+        ]:
+            rows.flush(row + 1)
+            write_df(
+                rows.sheet, results["Value"], row + 1, col, header_format=header_format
+            )
+    for rows in [comp_rows, std_dev_rows, absdiff_rows]:
+        rows.flush()
+
     wb.close()
 
 
@@ -1093,8 +1116,35 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
     -------
     None
     """
-    writer = pd.ExcelWriter(outpath, engine="xlsxwriter")
+    writer = streaming_writer(outpath)
+    _write_sphere_single_sheets(writer, lib, values, errors, stats)
+    writer.book.close()
+
+
+def _write_sphere_single_sheets(writer, lib, values, errors, stats=None, suffix=""):
+    """
+    Write the Sphere leakage single library sheets (values, errors and
+    statistical checks) in an already open XLSXwriter workbook
+
+    Parameters
+    ----------
+    writer : pd.ExcelWriter
+        writer (xlsxwriter engine) of the workbook to be populated.
+    lib : str
+        Shorthand representation of data library (i.e 00c, 31c).
+    values : Dataframe
+        Summary of tally values
+    errors: Dataframe
+        Errors on tally values
+    stats: Dataframe
+        Results of statistical checks
+    suffix: str
+        appended to the sheet names, by default "".
 
+    Returns
+    -------
+    None
+    """
     wb = writer.book
 
     # Formatting styles
@@ -1165,20 +1215,17 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
     percent_format = wb.add_format({"num_format": "0.00%"})
 
     # Populate Sheets
-    # To wrap text can not overwrite dataframe formatting. https://stackoverflow.com/questions/42562977/xlsxwriter-text-wrap-not-working
-    values.to_excel(
-        writer, startrow=9, startcol=1, sheet_name="Values", index=False, header=False
-    )
-    val_sheet = writer.sheets["Values"]
+    # The rows are streamed in order: the layout of the sheets is buffered
+    # and written together with the tables at the end
+    val_sheet = wb.add_worksheet("Values" + suffix)
+    val_rows = _RowBuffer(val_sheet)
     for col_num, value in enumerate(values.columns.values):
-        val_sheet.write(8, col_num + 1, value, subsubtitle_merge_format)
+        val_rows.write(8, col_num + 1, value, subsubtitle_merge_format)
 
-    errors.to_excel(
-        writer, startrow=9, startcol=1, sheet_name="Errors", index=False, header=False
-    )
-    err_sheet = writer.sheets["Errors"]
+    err_sheet = wb.add_worksheet("Errors" + suffix)
+    err_rows = _RowBuffer(err_sheet)
     for col_num, value in enumerate(errors.columns.values):
-        err_sheet.write(8, col_num + 1, value, subsubtitle_merge_format)
+        err_rows.write(8, col_num + 1, value, subsubtitle_merge_format)
 
     # Get shapes to define formatting bounds
     values_len, values_width = values.shape
@@ -1186,27 +1233,20 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
 
     # Only MCNP currently has statistical tests
     if stats is not None:
-        stats.to_excel(
-            writer,
-            startrow=9,
-            startcol=1,
-            sheet_name="Statistical Checks",
-            index=False,
-            header=False,
-        )
-        stat_sheet = writer.sheets["Statistical Checks"]
+        stat_sheet = wb.add_worksheet("Statistical Checks" + suffix)
+        stat_rows = _RowBuffer(stat_sheet)
         stats_len, stats_width = stats.shape
         for col_num, value in enumerate(stats.columns.values):
-            stat_sheet.write(8, col_num + 1, value, subsubtitle_merge_format)
+            stat_rows.write(8, col_num + 1, value, subsubtitle_merge_format)
 
     # Title Format
-    val_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    val_sheet.merge_range("D1:D2", lib, subtitle_merge_format)
-    val_sheet.merge_range(
+    val_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    val_rows.merge_range("D1:D2", lib, subtitle_merge_format)
+    val_rows.merge_range(
         "B3:Q7", "SPHERE LEAKAGE TEST RESULTS RECAP: VALUES", title_merge_format
     )
-    val_sheet.merge_range("B8:C8", "ZAID", subtitle_merge_format)
-    val_sheet.merge_range("D8:Q8", "TALLY", subtitle_merge_format)
+    val_rows.merge_range("B8:C8", "ZAID", subtitle_merge_format)
+    val_rows.merge_range("D8:Q8", "TALLY", subtitle_merge_format)
 
     # Freeze title
     val_sheet.freeze_panes(9, 0)
@@ -1215,27 +1255,27 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
     val_sheet.set_column(0, 0, 4, oob_format)
     val_sheet.set_column(values_width, 1000, 18, oob_format)
     for i in range(9):
-        val_sheet.set_row(i, None, oob_format)
+        val_rows.set_row(i, None, oob_format)
     for i in range(9 + values_len, 1000):
-        val_sheet.set_row(i, None, oob_format)
+        val_rows.set_row(i, None, oob_format)
 
     # Column widths
     val_sheet.set_column(1, values_width, 20)
 
     # Row Heights
-    val_sheet.set_row(7, 31)
-    val_sheet.set_row(8, 80)
+    val_rows.set_row(7, 31)
+    val_rows.set_row(8, 80)
 
     # Legend
-    val_sheet.merge_range("S3:T3", "LEGEND", merge_format)
-    val_sheet.write("S4", "", red_cell_format)
-    val_sheet.write("T4", ">|5|%", legend_text_format)
-    val_sheet.write("S5", "", orange_cell_format)
-    val_sheet.write("T5", "|1|%≤|5|%", legend_text_format)
-    val_sheet.write("S6", "", yellow_cell_format)
-    val_sheet.write("T6", "|0.5|%≤|1|%", legend_text_format)
-    val_sheet.write("S7", "", green_cell_format)
-    val_sheet.write("T7", "<|0.5|%", legend_text_format)
+    val_rows.merge_range("S3:T3", "LEGEND", merge_format)
+    val_rows.write("S4", "", red_cell_format)
+    val_rows.write("T4", ">|5|%", legend_text_format)
+    val_rows.write("S5", "", orange_cell_format)
+    val_rows.write("T5", "|1|%≤|5|%", legend_text_format)
+    val_rows.write("S6", "", yellow_cell_format)
+    val_rows.write("T6", "|0.5|%≤|1|%", legend_text_format)
+    val_rows.write("S7", "", green_cell_format)
+    val_rows.write("T7", "<|0.5|%", legend_text_format)
 
     # Conditional Formatting
     val_sheet.conditional_format(
@@ -1398,13 +1438,13 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
     # ERRORS
 
     # Title
-    err_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-    err_sheet.merge_range("D1:D2", lib, subtitle_merge_format)
-    err_sheet.merge_range(
+    err_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+    err_rows.merge_range("D1:D2", lib, subtitle_merge_format)
+    err_rows.merge_range(
         "B3:N7", "SPHERE LEAKAGE TEST RESULTS RECAP: ERRORS", title_merge_format
     )
-    err_sheet.merge_range("B8:C8", "ZAID", subtitle_merge_format)
-    err_sheet.merge_range("D8:N8", "TALLY", subtitle_merge_format)
+    err_rows.merge_range("B8:C8", "ZAID", subtitle_merge_format)
+    err_rows.merge_range("D8:N8", "TALLY", subtitle_merge_format)
 
     # Freeze title
     err_sheet.freeze_panes(9, 0)
@@ -1414,28 +1454,28 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
     err_sheet.set_column(errors_width, 1000, 18, oob_format)
 
     for i in range(9):
-        err_sheet.set_row(i, None, oob_format)
+        err_rows.set_row(i, None, oob_format)
     for i in range(9 + errors_len, 1000):
-        err_sheet.set_row(i, None, oob_format)
+        err_rows.set_row(i, None, oob_format)
 
     # Column widths
     err_sheet.set_column(1, errors_width, 20)
 
     # Row Heights
-    err_sheet.set_row(7, 31)
-    err_sheet.set_row(8, 80)
+    err_rows.set_row(7, 31)
+    err_rows.set_row(8, 80)
 
     # Legend
-    err_sheet.merge_range("P3:Q3", "LEGEND", merge_format)
-    err_sheet.merge_range("P8:Q8", "According to MCNP manual", oob_format)
-    err_sheet.write("P4", "", red_cell_format)
-    err_sheet.write("Q4", "> 50%", legend_text_format)
-    err_sheet.write("P5", "", orange_cell_format)
-    err_sheet.write("Q5", "20% ≤ 50%", legend_text_format)
-    err_sheet.write("P6", "", yellow_cell_format)
-    err_sheet.write("Q6", "10% ≤ 20%", legend_text_format)
-    err_sheet.write("P7", "", green_cell_format)
-    err_sheet.write("Q7", "< 10%", legend_text_format)
+    err_rows.merge_range("P3:Q3", "LEGEND", merge_format)
+    err_rows.merge_range("P8:Q8", "According to MCNP manual", oob_format)
+    err_rows.write("P4", "", red_cell_format)
+    err_rows.write("Q4", "> 50%", legend_text_format)
+    err_rows.write("P5", "", orange_cell_format)
+    err_rows.write("Q5", "20% ≤ 50%", legend_text_format)
+    err_rows.write("P6", "", yellow_cell_format)
+    err_rows.write("Q6", "10% ≤ 20%", legend_text_format)
+    err_rows.write("P7", "", green_cell_format)
+    err_rows.write("Q7", "< 10%", legend_text_format)
 
     # Conditional Formatting
     err_sheet.conditional_format(
@@ -1553,15 +1593,15 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
 
     if stats is not None:
         # Title
-        stat_sheet.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
-        stat_sheet.merge_range("D1:D2", lib, subtitle_merge_format)
-        stat_sheet.merge_range(
+        stat_rows.merge_range("B1:C2", "LIBRARY", subtitle_merge_format)
+        stat_rows.merge_range("D1:D2", lib, subtitle_merge_format)
+        stat_rows.merge_range(
             "B3:N7",
             "SPHERE LEAKAGE TEST RESULTS RECAP: STATISTICAL CHECKS",
             title_merge_format,
         )
-        stat_sheet.merge_range("B8:C8", "ZAID", subtitle_merge_format)
-        stat_sheet.merge_range("D8:N8", "TALLY", subtitle_merge_format)
+        stat_rows.merge_range("B8:C8", "ZAID", subtitle_merge_format)
+        stat_rows.merge_range("D8:N8", "TALLY", subtitle_merge_format)
 
         # Freeze title
         stat_sheet.freeze_panes(9, 0)
@@ -1571,16 +1611,16 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
         stat_sheet.set_column(stats_width, 1000, 18, oob_format)
 
         for i in range(9):
-            stat_sheet.set_row(i, None, oob_format)
+            stat_rows.set_row(i, None, oob_format)
         for i in range(9 + stats_len, 1000):
-            stat_sheet.set_row(i, None, oob_format)
+            stat_rows.set_row(i, None, oob_format)
 
         # Column widths
         stat_sheet.set_column(1, stats_width, 20)
 
         # Row Heights
-        stat_sheet.set_row(7, 31)
-        stat_sheet.set_row(8, 80)
+        stat_rows.set_row(7, 31)
+        stat_rows.set_row(8, 80)
 
         # Formatting
         stat_sheet.conditional_format(
@@ -1643,11 +1683,19 @@ def sphere_single_excel_writer(self, outpath, lib, values, errors, stats=None):
             },
         )
 
-    wb.close()
+    # Write the tables together with the buffered layout
+    # To wrap text can not overwrite dataframe formatting. https://stackoverflow.com/questions/42562977/xlsxwriter-text-wrap-not-working
+    tables = [(val_rows, values), (err_rows, errors)]
+    if stats is not None:
+        tables.append((stat_rows, stats))
+    for rows, df in tables:
+        rows.flush(8)
+        write_df(rows.sheet, df, 9, 1, index=False, header=False)
+        rows.flush()
 
 
 def sphere_comp_excel_writer(
-    self, outpath, name, final, absdiff, std_dev, summary, single_pp_files
+    self, outpath, name, final, absdiff, std_dev, summary, singles
 ):
     """
     Produces library comparison excel file for Sphere leakage using XLSXwriter
@@ -1668,9 +1716,9 @@ def sphere_comp_excel_writer(
     summary: Dataframe
        Contains total number of percentage difference in the column
        within certain bounds
-    single_pp_files: list
-       Path to the single library Excel files that should be copied
-       as additional tabs
+    singles: list
+       (lib, lib_name, values, errors, stats) of the reference and target
+       libraries, written as additional tabs
 
     Returns
     -------
@@ -2338,19 +2386,13 @@ def sphere_comp_excel_writer(
         },
     )
 
-    wb.close()
-
-    # Copy the single post processed results into the comparison workbook
-    target_file = outpath  # Target workbook filename
-    target_sheet_names = [
-        "Values",
-        "Errors",
-        "Statistical Checks",
-    ]  # Target sheet names
+    # Add the single library results as additional tabs
+    for lib, lib_name, values, errors, stats in singles:
+        _write_sphere_single_sheets(
+            writer, lib_name, values, errors, stats, suffix=" ({})".format(lib)
+        )
 
-    # Loop over the library source files
-    for source_file in single_pp_files:
-        copy_sheets_to_target(source_file, target_file, target_sheet_names)
+    wb.close()
 
 
 def sphere_sddr_single_excel_writer(outpath, lib, results, errors, stat_checks):
@@ -2375,7 +2417,36 @@ def sphere_sddr_single_excel_writer(outpath, lib, results, errors, stat_checks):
     None
     """
     writer = pd.ExcelWriter(outpath, engine="xlsxwriter")
+    _write_sphere_sddr_single_sheets(writer, lib, results, errors, stat_checks)
+    writer.book.close()
+
+
+def _write_sphere_sddr_single_sheets(
+    writer, lib, results, errors, stat_checks, suffix=""
+):
+    """
+    Write the Sphere SDDR single library sheets (values, errors and
+    statistical checks) in an already open XLSXwriter workbook
 
+    Parameters
+    ----------
+    writer : pd.ExcelWriter
+        writer (xlsxwriter engine) of the workbook to be populated.
+    lib : str
+        Shorthand representation of data library (i.e 00c, 31c).
+    results : Dataframe
+        Summary of tally results
+    errors: Dataframe
+        Errors on tally errors
+    stats_checks: Dataframe
+        Results of statistical checks
+    suffix: str
+        appended to the sheet names, by default "".
+
+    Returns
+    -------
+    None
+    """
     startrow = 9
     startcol = 1
 
@@ -2467,14 +2538,22 @@ def sphere_sddr_single_excel_writer(outpath, lib, results, errors, stat_checks):
     # Write the data to the sheets
     max_len, max_width = results.shape
     results.to_excel(
-        writer, startrow=startrow, startcol=startcol, sheet_name="Values", index=False
+        writer,
+        startrow=startrow,
+        startcol=startcol,
+        sheet_name="Values" + suffix,
+        index=False,
     )
     errors.to_excel(
-        writer, startrow=startrow, startcol=startcol, sheet_name="Errors", index=False
+        writer,
+        startrow=startrow,
+        startcol=startcol,
+        sheet_name="Errors" + suffix,
+        index=False,
     )
 
-    tal_sheet = writer.sheets["Values"]
-    err_sheet = writer.sheets["Errors"]
+    tal_sheet = writer.sheets["Values" + suffix]
+    err_sheet = writer.sheets["Errors" + suffix]
 
     if stat_checks is not None:
         # stats.set_index("Zaid", inplace=True)
@@ -2482,11 +2561,11 @@ def sphere_sddr_single_excel_writer(outpath, lib, results, errors, stat_checks):
             writer,
             startrow=startrow,
             startcol=startcol,
-            sheet_name="Statistical Checks",
+            sheet_name="Statistical Checks" + suffix,
             index=False,
             header=False,
         )
-        stat_sheet = writer.sheets["Statistical Checks"]
+        stat_sheet = writer.sheets["Statistical Checks" + suffix]
         for col_num, value in enumerate(stat_checks.columns.values):
             stat_sheet.write(8, col_num + 1, value, subsubtitle_merge_format)
 
@@ -2842,12 +2921,8 @@ def sphere_sddr_single_excel_writer(outpath, lib, results, errors, stat_checks):
             },
         )
 
-    wb.close()
-
 
-def sphere_sddr_comp_excel_writer(
-    outpath, name, final, absdiff, std_dev, single_pp_files
-):
+def sphere_sddr_comp_excel_writer(outpath, name, final, absdiff, std_dev, singles):
     """
     Produces library comparison excel file for Sphere SDDR using XLSXwriter
 
@@ -2864,9 +2939,9 @@ def sphere_sddr_comp_excel_writer(
     std_dev: Dataframe
        Difference between reference and target library in terms of
        standard deviations from the mean of the reference library
-    single_pp_files: list
-       Path to the single library Excel files that should be copied
-       as additional tabs
+    singles: list
+       (lib, lib_name, values, errors, stats) of the reference and target
+       libraries, written as additional tabs
 
 
     Returns
@@ -3540,132 +3615,302 @@ def sphere_sddr_comp_excel_writer(
             "format": scientific_format,
         },
     )
-    wb.close()
-
-    # Copy the single post processed results into the comparison workbook
-    target_file = outpath  # Target workbook filename
-    target_sheet_names = [
-        "Values",
-        "Errors",
-        "Statistical Checks",
-    ]  # Target sheet names
-
-    # Loop over the library source files
-    for source_file in single_pp_files:
-        copy_sheets_to_target(source_file, target_file, target_sheet_names)
+    # Add the single library results as additional tabs
+    for lib, lib_name, values, errors, stats in singles:
+        _write_sphere_sddr_single_sheets(
+            writer, lib_name, values, errors, stats, suffix=" ({})".format(lib)
+        )
 
+    wb.close()
 
-def copy_sheets_to_target(source_filename, target_filename, target_sheet_names):
-    """Performs copying of sheets between different workbooks
 
-    Parameters
-    ----------
-    source_filename : str
-        file for sheets to be copied from
-    target_filename : str
-        file for sheets to be copied to
-    target_sheet_names : str
-        name of sheets in target file
+def streaming_writer(outpath):
     """
-    wb_target = openpyxl.load_workbook(target_filename)
-    source_wb = openpyxl.load_workbook(source_filename)
-
-    for source_sheet_name, target_sheet_name in zip(
-        source_wb.sheetnames, target_sheet_names
-    ):
-        source_sheet = source_wb[source_sheet_name]
-        target_sheet = wb_target.create_sheet(target_sheet_name)
-        copy_sheet(source_sheet, target_sheet)
-
-    wb_target.save(target_filename)
-
-
-def copy_sheet(source_sheet: Worksheet, target_sheet: Worksheet) -> None:
-    """Copy a sheet with style, format, layout, etc. from one Excel file
-    to another Excel file.
+    Open an XLSXwriter workbook in constant_memory mode. Only one row at a
+    time is kept in memory, hence the rows of each sheet must be written in
+    order (see write_df() and _RowBuffer).
 
     Parameters
     ----------
-    source_sheet : Worksheet
-        sheet to be copied
-    target_sheet : Worksheet
-        destination sheet
+    outpath : path or str
+        path to the excel file.
+
+    Returns
+    -------
+    pd.ExcelWriter
+        writer of the workbook.
     """
-    _copy_cells(source_sheet, target_sheet)  # copy all the cell values and styles
-    _copy_sheet_attributes(source_sheet, target_sheet)
+    return pd.ExcelWriter(
+        outpath,
+        engine="xlsxwriter",
+        engine_kwargs={"options": {"constant_memory": True}},
+    )
 
 
-def _copy_sheet_attributes(source_sheet, target_sheet):
-    """Copy contents of workbook sheets
+def write_df(
+    sheet, df, startrow=0, startcol=0, index=True, header=True, header_format=None
+):
+    """
+    Write a DataFrame in a XLSXwriter worksheet one row at a time.
+    DataFrame.to_excel() writes column by column and cannot be used in
+    constant_memory mode. The layout of the header and index is the one of
+    pandas, but repeated index values are not merged.
 
     Parameters
     ----------
-    source_sheet : str
-        sheet name in source workbook
-    target_sheet : str
-        sheet name in target workbook
+    sheet : xlsxwriter.worksheet.Worksheet
+        worksheet where to write the DataFrame.
+    df : pd.DataFrame
+        DataFrame to be written.
+    startrow : int, optional
+        first row of the table, by default 0.
+    startcol : int, optional
+        first column of the table, by default 0.
+    index : bool, optional
+        write the index, by default True.
+    header : bool, optional
+        write the column names, by default True.
+    header_format : xlsxwriter.format.Format, optional
+        format of the header and index cells, by default None.
+
+    Returns
+    -------
+    int
+        first row after the table.
     """
-    target_sheet.sheet_format = copy(source_sheet.sheet_format)
-    target_sheet.sheet_properties = copy(source_sheet.sheet_properties)
-    target_sheet.merged_cells = copy(source_sheet.merged_cells)
-    target_sheet.page_margins = copy(source_sheet.page_margins)
-    target_sheet.freeze_panes = copy(source_sheet.freeze_panes)
-
-    # set row dimensions
-    # So you cannot copy the row_dimensions attribute. Does not work (because of meta data in the attribute I think). So we copy every row's row_dimensions. That seems to work.
-    for rn in range(len(source_sheet.row_dimensions)):
-        target_sheet.row_dimensions[rn] = copy(source_sheet.row_dimensions[rn])
-
-    if source_sheet.sheet_format.defaultColWidth is None:
-        print("Unable to copy default column wide")
+    row = startrow
+    if index:
+        n_index = df.index.nlevels
     else:
-        target_sheet.sheet_format.defaultColWidth = copy(
-            source_sheet.sheet_format.defaultColWidth
-        )
-
-    # set specific column width and hidden property
-    # we cannot copy the entire column_dimensions attribute so we copy selected attributes
-    for key, value in source_sheet.column_dimensions.items():
-        target_sheet.column_dimensions[key].min = copy(
-            source_sheet.column_dimensions[key].min
-        )  # Excel actually groups multiple columns under 1 key. Use the min max attribute to also group the columns in the targetSheet
-        target_sheet.column_dimensions[key].max = copy(
-            source_sheet.column_dimensions[key].max
-        )  # https://stackoverflow.com/questions/36417278/openpyxl-can-not-read-consecutive-hidden-columns discussed the issue. Note that this is also the case for the width, not onl;y the hidden property
-        target_sheet.column_dimensions[key].width = copy(
-            source_sheet.column_dimensions[key].width
-        )  # set width for every column
-        target_sheet.column_dimensions[key].hidden = copy(
-            source_sheet.column_dimensions[key].hidden
-        )
-
-
-def _copy_cells(source_sheet, target_sheet):
-    """Copy contents of cells including format in a workbook
+        n_index = 0
+
+    if header:
+        columns = df.columns
+        n_levels = columns.nlevels
+        for level in range(n_levels):
+            # Equal labels of the upper levels are merged (same row)
+            if n_levels > 1 and columns.names[level] is not None and index:
+                name = _cell_value(columns.names[level])
+                sheet.write(row, startcol + n_index - 1, name, header_format)
+            spans = []
+            for label in columns:
+                if n_levels > 1:
+                    key = label[: level + 1]
+                    label = label[level]
+                else:
+                    key = (label,)
+                if level < n_levels - 1 and len(spans) > 0 and spans[-1][0] == key:
+                    spans[-1][2] += 1
+                else:
+                    spans.append([key, label, 1])
+            col = startcol + n_index
+            for _, label, span in spans:
+                label = _cell_value(label)
+                if span > 1:
+                    sheet.merge_range(
+                        row, col, row, col + span - 1, label, header_format
+                    )
+                else:
+                    sheet.write(row, col, label, header_format)
+                col = col + span
+            if level < n_levels - 1:
+                row += 1
+        if index:
+            # The index names go in an additional row if the columns are a
+            # MultiIndex
+            if n_levels > 1:
+                row += 1
+            if any(name is not None for name in df.index.names):
+                for i, name in enumerate(df.index.names):
+                    sheet.write(row, startcol + i, _cell_value(name), header_format)
+        row += 1
+
+    for idx, values in zip(df.index, df.itertuples(index=False, name=None)):
+        col = startcol
+        if index:
+            if n_index == 1:
+                idx = (idx,)
+            for val in idx:
+                sheet.write(row, col, _cell_value(val), header_format)
+                col += 1
+        for val in values:
+            val = _cell_value(val)
+            if val is not None:
+                sheet.write(row, col, val)
+            col += 1
+        row += 1
+
+    return row
+
+
+def _cell_value(val):
+    """
+    Convert a DataFrame value to a value that can be written by XLSXwriter,
+    as done by DataFrame.to_excel(). NaN are left empty and infinite numbers
+    are written as text.
 
     Parameters
     ----------
-    source_sheet : str
-        sheet name in source workbook
-    target_sheet : str
-        sheet name in target workbook
-    """
-    for (row, col), source_cell in source_sheet._cells.items():
-        target_cell = target_sheet.cell(column=col, row=row)
+    val : object
+        value to be converted.
 
-        target_cell._value = source_cell._value
-        target_cell.data_type = source_cell.data_type
+    Returns
+    -------
+    object
+        converted value, None if the cell should be left empty.
+    """
+    if isinstance(val, np.generic):
+        val = val.item()
+    if isinstance(val, float):
+        if np.isnan(val):
+            return None
+        if np.isinf(val):
+            return "inf" if val > 0 else "-inf"
+    elif val is pd.NA or val is pd.NaT:
+        return None
+    return val
+
+
+class _RowBuffer:
+    """
+    Collect the cells, merged ranges and row settings of the layout of a
+    worksheet (titles, legends, out of bounds formatting) and write them in
+    row order together with the tables, as required by the constant_memory
+    mode. It supports the write(), merge_range() and set_row() methods of
+    the worksheet.
+    """
 
-        if source_cell.has_style:
-            target_cell.font = copy(source_cell.font)
-            target_cell.border = copy(source_cell.border)
-            target_cell.fill = copy(source_cell.fill)
-            target_cell.number_format = copy(source_cell.number_format)
-            target_cell.protection = copy(source_cell.protection)
-            target_cell.alignment = copy(source_cell.alignment)
+    def __init__(self, sheet):
+        """
+        Parameters
+        ----------
+        sheet : xlsxwriter.worksheet.Worksheet
+            worksheet where the layout will be written.
+
+        Returns
+        -------
+        None.
+        """
+        self.sheet = sheet
+        self.cells = {}
+        self.rows = {}
+        self.merges = []
+        # Range including each merged cell, also after the flush
+        self.merged_cells = {}
+
+    def write(self, *args):
+        """
+        Buffer a cell, in (row, col, data, format) or A1 notation
+        """
+        if isinstance(args[0], str):
+            row, col = xl_cell_to_rowcol(args[0])
+            args = (row, col) + args[1:]
+        row, col, data = args[:3]
+        cell_format = args[3] if len(args) > 3 else None
+        self.cells.setdefault(row, {})[col] = (data, cell_format)
+
+    def merge_range(self, *args):
+        """
+        Buffer a merged range, in (first_row, first_col, last_row, last_col,
+        data, format) or A1 notation
+        """
+        if isinstance(args[0], str):
+            first, last = args[0].split(":")
+            args = xl_cell_to_rowcol(first) + xl_cell_to_rowcol(last) + args[1:]
+        first_row, first_col, last_row, last_col, data = args[:5]
+        cell_format = args[5] if len(args) > 5 else None
+        # Overlapping ranges corrupt the file, as checked by xlsxwriter
+        cell_range = xl_range(first_row, first_col, last_row, last_col)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                previous_range = self.merged_cells.get((row, col))
+                if previous_range is not None:
+                    raise OverlappingRange(
+                        "Merge range '{}' overlaps previous merge range '{}'.".format(
+                            cell_range, previous_range
+                        )
+                    )
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self.merged_cells[(row, col)] = cell_range
+        # The other cells of the range are formatted blanks
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self.write(row, col, "", cell_format)
+        self.write(first_row, first_col, data, cell_format)
+        self.merges.append([first_row, first_col, last_row, last_col])
+
+    def set_row(self, row, height, cell_format=None):
+        """
+        Buffer the height and format of a row
+        """
+        self.rows[row] = (height, cell_format)
+
+    def flush(self, last_row=None):
+        """
+        Write the buffered rows up to last_row (included), all of them if
+        last_row is None. Rows above the last one already written in the
+        worksheet are lost.
+
+        Parameters
+        ----------
+        last_row : int, optional
+            last row to be written, by default None.
+
+        Returns
+        -------
+        None.
+        """
+        rows = sorted(set(self.cells) | set(self.rows))
+        if last_row is not None:
+            rows = [row for row in rows if row <= last_row]
+
+        for row in rows:
+            if row in self.rows:
+                height, cell_format = self.rows.pop(row)
+                self.sheet.set_row(row, height, cell_format)
+                # In constant_memory mode only the rows with cells are written
+                if row not in self.cells:
+                    self.sheet.write_blank(row, 0, None, cell_format)
+            for col, (data, cell_format) in sorted(self.cells.pop(row, {}).items()):
+                self.sheet.write(row, col, data, cell_format)
+
+        # merge_range() writes all the rows of the range at once, which is not
+        # possible in constant_memory mode. The ranges are registered directly.
+        merges = []
+        for merge in self.merges:
+            if last_row is None or merge[2] <= last_row:
+                _register_merge(self.sheet, merge)
+            else:
+                merges.append(merge)
+        self.merges = merges
+
+
+def _register_merge(sheet, merge):
+    """
+    Register a merged range whose cells were already written. xlsxwriter has
+    no public method for it, its worksheet merge list is used for the
+    versions known to store the ranges there. Otherwise the cells are left
+    unmerged.
 
-        if source_cell.hyperlink:
-            target_cell._hyperlink = copy(source_cell.hyperlink)
+    Parameters
+    ----------
+    sheet : xlsxwriter.worksheet.Worksheet
+        worksheet of the range.
+    merge : list
+        [first_row, first_col, last_row, last_col] of the range.
 
-        if source_cell.comment:
-            target_cell.comment = copy(source_cell.comment)
+    Returns
+    -------
+    None.
+    """
+    major = int(xlsxwriter.__version__.split(".")[0])
+    merge_list = getattr(sheet, "merge", None)
+    if major in MERGE_LIST_VERSIONS and isinstance(merge_list, list):
+        merge_list.append(merge)
+    else:
+        warnings.warn(
+            "Merged ranges not supported by xlsxwriter {}, {} left unmerged".format(
+                xlsxwriter.__version__, xl_range(*merge)
+            )
+        )
@@ -20,10 +20,11 @@
 # You should have received a copy of the GNU General Public License
 # along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 
+from __future__ import annotations
+
 import math
 import os
 import re
-import shutil
 from abc import abstractmethod
 
 import numpy as np
@@ -32,9 +33,13 @@ from scipy.interpolate import interp1d
 from tqdm import tqdm
 
 import jade.atlas as at
+import jade.dependencies as dependencies
+import jade.excelcache as excelcache
+import jade.excelsupport as exsupp
+import jade.rawstore as rawstore
 from jade.inputfile import D1S_Input
-from jade.output import BenchmarkOutput, MCNPoutput
-from jade.plotter import Plotter
+from jade.output import BenchmarkOutput, MCNPoutput, parse_outputs
+from jade.plotter import PlotRenderer, Plotter
 from jade.status import EXP_TAG
 
 MCNP_UNITS = {"Energy": "MeV", "Time": "shakes"}
@@ -50,6 +55,9 @@ TALLY_NORMALIZATION = {
 
 
 class ExperimentalOutput(BenchmarkOutput):
+    # Excel, raw data and atlas are produced together
+    partial_rebuild = False
+
     def __init__(self, *args, **kwargs):
         """
         This extends the Benchmark Output and creates an abstract class
@@ -103,6 +111,23 @@ class ExperimentalOutput(BenchmarkOutput):
         """
         raise AttributeError("\n No single pp is foreseen for exp benchmark")
 
+    def _get_dependencies(self) -> dict[str, dict]:
+        """
+        Get the current fingerprints of what each artifact is built from,
+        the experimental results included. See BenchmarkOutput doc.
+
+        Returns
+        -------
+        dict[str, dict]
+            dependencies of each artifact.
+
+        """
+        depends = super()._get_dependencies()
+        experiment = dependencies.fingerprint(self.path_exp_res)
+        for artifact_depends in depends.values():
+            artifact_depends["experiment"] = experiment
+        return depends
+
     def compare(self):
         """
         Complete the routines that perform the comparison of one or more
@@ -147,10 +172,8 @@ class ExperimentalOutput(BenchmarkOutput):
         -------
         None.
         """
-        # Build a temporary folder for images
-        tmp_path = os.path.join(self.atlas_path, "tmp")
-
-        os.mkdir(tmp_path)
+        # Images are rendered in memory, tmp_path is never written
+        tmp_path = self.atlas_path
 
         globalname = ""
         for lib in self.lib:
@@ -159,14 +182,22 @@ class ExperimentalOutput(BenchmarkOutput):
         globalname = self.testname + "_" + globalname
         # Initialize the atlas
         template = os.path.join(self.session.path_templates, "AtlasTemplate.docx")
-        atlas = at.Atlas(template, globalname)
+        # Plots are rendered in parallel while the atlas is filled
+        renderer = PlotRenderer(self.n_workers)
+        atlas = at.Atlas(
+            template,
+            globalname,
+            renderer=renderer,
+            draft=self.draft,
+            max_bins=self.max_bins,
+            cache=self.plot_cache,
+        )
 
         # Fill the atlas
         atlas = self._build_atlas(tmp_path, atlas)
 
         atlas.save(self.atlas_path)
-        # Remove tmp images
-        shutil.rmtree(tmp_path)
+        renderer.close()
 
     def _extract_outputs(self):
         """
@@ -178,72 +209,57 @@ class ExperimentalOutput(BenchmarkOutput):
         outputs = {}
         results = {}
         inputs = []
+        # Collect all the folders to be parsed, they are all parsed at once
+        # (possibly in parallel) and then processed in the same order
+        codes = []
+        if self.mcnp:
+            codes.append("mcnp")
+        if self.openmc:
+            print(
+                "Experimental comparison not implemented \
+                for OpenMC"
+            )
+        if self.serpent:
+            print(
+                "Experimental comparison not implemented \
+                for Serpent"
+            )
+        if self.d1s:
+            codes.append("d1s")
+        keys = []
+        arguments = []
         # Iterate on the different libraries results except 'Exp'
         for lib, test_path in self.test_path.items():
             if lib != EXP_TAG:
                 if self.multiplerun:
                     # Results are organized by folder and lib
-                    code_raw_data = {}
                     for folder in os.listdir(test_path):
                         # FIX MCNP HARD CODED PATH HERE
-                        if self.mcnp:
-                            results_path = os.path.join(test_path, folder, "mcnp")
-                            pieces = folder.split("_")
-                            # Get zaid
-                            input = pieces[-1]
-                            mfile, ofile = self._get_output_files(results_path)
-                            # Parse output
-                            output = MCNPoutput(mfile, ofile)
-                            outputs[input, lib] = output
-                            code_raw_data[input, lib] = output.tallydata
-                            # self.raw_data[input, lib] = output.tallydata
-
-                            # Get the meaningful results
-                            results[input, lib] = self._processMCNPdata(output)
-                            if input not in inputs:
-                                inputs.append(input)
-                        if self.openmc:
-                            print(
-                                "Experimental comparison not implemented \
-                                for OpenMC"
-                            )
-                            break
-                        if self.serpent:
-                            print(
-                                "Experimental comparison not implemented \
-                                for Serpent"
-                            )
-                            break
-                        if self.d1s:
-                            results_path = os.path.join(test_path, folder, "d1s")
+                        for code in codes:
+                            results_path = os.path.join(test_path, folder, code)
                             pieces = folder.split("_")
                             # Get zaid
                             input = pieces[-1]
-                            mfile, ofile = self._get_output_files(results_path)
-                            # Parse output
-                            output = MCNPoutput(mfile, ofile)
-                            outputs[input, lib] = output
-                            code_raw_data[input, lib] = output.tallydata
-                            # self.raw_data[input, lib] = output.tallydata
-
-                            # Get the meaningful results
-                            results[input, lib] = self._processMCNPdata(output)
-                            if input not in inputs:
-                                inputs.append(input)
-                    if self.mcnp:
-                        self.raw_data["mcnp"].update(code_raw_data)
-                    if self.d1s:
-                        self.raw_data["d1s"].update(code_raw_data)
+                            keys.append((code, input, lib))
+                            arguments.append((results_path,))
                 # Results are organized just by lib
                 else:
-                    mfile, ofile = self._get_output_files(test_path)
-                    # Parse output
-                    output = MCNPoutput(mfile, ofile)
-                    outputs[self.testname, lib] = output
-                    # Adjourn raw Data
-                    self.raw_data[self.testname, lib] = output.tallydata
-                    # Get the meaningful results
-                    results[self.testname, lib] = self._processMCNPdata(output)
+                    keys.append((None, self.testname, lib))
+                    arguments.append((test_path,))
+
+        # Parse outputs
+        parsed = parse_outputs(_parse_mcnp_output, arguments, self.n_workers)
+        for (code, input, lib), output in zip(keys, parsed):
+            outputs[input, lib] = output
+            if code is None:
+                # Adjourn raw Data
+                self.raw_data[input, lib] = output.tallydata
+            else:
+                self.raw_data[code][input, lib] = output.tallydata
+                if input not in inputs:
+                    inputs.append(input)
+            # Get the meaningful results
+            results[input, lib] = self._processMCNPdata(output)
 
         self.outputs = outputs
         self.results = results
@@ -317,14 +333,27 @@ class ExperimentalOutput(BenchmarkOutput):
         None.
         """
         if self.mcnp:
-            raw_to_print = self.raw_data["mcnp"].items()
+            code = "mcnp"
         if self.openmc:
             pass
         if self.serpent:
             pass
         if self.d1s:
-            raw_to_print = self.raw_data["d1s"].items()
+            code = "d1s"
+        raw_to_print = self.raw_data[code].items()
 
+        # One dataset for each library, partitioned by input and tally
+        frames = {}
+        for (folder, lib), item in raw_to_print:
+            frames.setdefault(lib, {})
+            for key, data in item.items():
+                frames[lib][folder, key] = data
+        for lib, lib_frames in frames.items():
+            dataset = rawstore.get_dataset_path(self.raw_path, lib, self.testname, code)
+            rawstore.write_dataset(dataset, lib_frames, ["Input", "Tally"])
+
+        if not self.raw_csv:
+            return
         for (folder, lib), item in raw_to_print:
             # Create the lib directory if it is not there
             cd_lib = os.path.join(self.raw_path, lib)
@@ -374,7 +403,8 @@ class ExperimentalOutput(BenchmarkOutput):
         Parameters
         ----------
         tmp_path : path
-            path to the temporary folder where to dump images.
+            output path assigned to the plots. Plots inserted in the atlas
+            are rendered in memory and never written there.
         atlas : Atlas
             Object representing the plot Atlas.
         Returns
@@ -487,7 +517,8 @@ class FNGOutput(ExperimentalOutput):
             self.excel_path, self.testname + "_CE_tables.xlsx"
         )
         # Create a Pandas Excel writer using XlsxWriter as the engine.
-        with pd.ExcelWriter(ex_outpath, engine="xlsxwriter") as writer:
+        with exsupp.streaming_writer(ex_outpath) as writer:
+            header_format = writer.book.add_format(exsupp.HEADER_FORMAT)
             # --- build and dump the C/E table ---
             for folder in self.names:
                 # collect all available data
@@ -510,11 +541,11 @@ class FNGOutput(ExperimentalOutput):
 
                     df[libname] = gl_val + " +/- " + gl_err
 
-                # Dump the df
-                df.to_excel(writer, sheet_name=folder, startrow=2)
                 # Write description
-                ws = writer.sheets[folder]
+                ws = writer.book.add_worksheet(folder)
                 ws.write_string(0, 0, '"C/E (mean +/- σ)"')
+                # Dump the df
+                exsupp.write_df(ws, df, 2, 0, header_format=header_format)
 
     def _get_collected_data(self, folder):
         """
@@ -591,9 +622,8 @@ class FNGOutput(ExperimentalOutput):
             plot = Plotter(
                 data, title, tmp_path, outname, quantity, unit, xlabel, self.testname
             )
-            img_path = plot.plot("Discreet Experimental points")
             # Insert the image in the atlas
-            atlas.insert_img(img_path)
+            atlas.insert_plot(plot, "Discreet Experimental points")
 
             # --- Tracking PLOTs ---
             # -- Recover data to plot --
@@ -656,11 +686,12 @@ class FNGOutput(ExperimentalOutput):
                         unit,
                         xlabel,
                         self.testname,
+                        draft=self.draft,
                     )
-                    img_path = plot._contribution(legend_outside=True)
+                    img = plot.plot("Contribution", in_memory=True)
 
                     # Insert the image in the atlas
-                    atlas.insert_img(img_path)
+                    atlas.insert_img(img)
 
         return atlas
 
@@ -694,7 +725,7 @@ class SpectrumOutput(ExperimentalOutput):
 
         """
         self.tables = []
-        self.bench_conf = pd.read_excel(self.cnf_path)
+        self.bench_conf = excelcache.read_excel(self.cnf_path, self.excel_cache)
         self.bench_conf = self.bench_conf.set_index(["Tally"])
         # Loop over benchmark cases
         for input in tqdm(self.inputs, desc=" Inputs: "):
@@ -732,9 +763,8 @@ class SpectrumOutput(ExperimentalOutput):
                     xlabel,
                     self.testname,
                 )
-                img_path = plot.plot("Experimental points")
                 # Insert the image in the atlas
-                atlas.insert_img(img_path)
+                atlas.insert_plot(plot, "Experimental points")
 
         # Dump C/E table
         self._dump_ce_table()
@@ -822,7 +852,8 @@ class SpectrumOutput(ExperimentalOutput):
             )
 
             # Create a Pandas Excel writer using XlsxWriter as the engine.
-            with pd.ExcelWriter(ex_outpath, engine="xlsxwriter") as writer:
+            with exsupp.streaming_writer(ex_outpath) as writer:
+                header_format = writer.book.add_format(exsupp.HEADER_FORMAT)
                 # dump global table
                 todump = todump[
                     [
@@ -833,7 +864,8 @@ class SpectrumOutput(ExperimentalOutput):
                     ]
                 ]
 
-                todump.to_excel(writer, sheet_name="Global")
+                ws = writer.book.add_worksheet("Global")
+                exsupp.write_df(ws, todump, header_format=header_format)
                 col_min = x_lab + "-min " + "[" + MCNP_UNITS[x_ax] + "]"
                 col_max = x_lab + "-max " + "[" + MCNP_UNITS[x_ax] + "]"
                 # Elaborate table for better output format
@@ -868,13 +900,13 @@ class SpectrumOutput(ExperimentalOutput):
 
                     todump.sort_values(by=[col_min])
 
-                    todump.to_excel(writer, sheet_name=input, startrow=2)
-                    ws = writer.sheets[input]
+                    ws = writer.book.add_worksheet(input)
                     if skipcol_global == 0:
                         ws.write_string(0, 0, '"C/E (mean +/- σ)"')
+                    exsupp.write_df(ws, todump, 2, 0, header_format=header_format)
 
                     # adjust columns' width
-                    writer.sheets[input].set_column(0, 4, 18)
+                    ws.set_column(0, 4, 18)
 
         return
 
@@ -1045,6 +1077,26 @@ class SpectrumOutput(ExperimentalOutput):
         return flux, energies, errors
 
 
+def _parse_mcnp_output(results_path):
+    """
+    Parse the MCNP outputs contained in a run folder. Defined at module level
+    so that it can be executed by a worker process.
+
+    Parameters
+    ----------
+    results_path : path like object
+        path to the folder containing the MCNP outputs.
+
+    Returns
+    -------
+    MCNPoutput
+        parsed output.
+
+    """
+    mfile, ofile = ExperimentalOutput._get_output_files(results_path)
+    return MCNPoutput(mfile, ofile)
+
+
 def _get_tablevalues(
     df, interpolator, x="Energy [MeV]", y="C", e_intervals=[0.1, 1, 5, 10, 20]
 ):
@@ -1250,8 +1302,8 @@ class TiaraFCOutput(TiaraOutput):
         filepath = os.path.join(
             self.excel_path, "Tiara_Fission_Cells_CE_tables.xlsx"
         )
-        with pd.ExcelWriter(filepath, engine="xlsxwriter") as writer:
-
+        with exsupp.streaming_writer(filepath) as writer:
+            header_format = writer.book.add_format(exsupp.HEADER_FORMAT)
             # Create 1 worksheet for each energy/material combination
             mats = self.case_tree_df.index.unique(level="Shield Material").tolist()
             ens = self.case_tree_df.index.unique(level="Energy").tolist()
@@ -1325,8 +1377,14 @@ class TiaraFCOutput(TiaraOutput):
                     sort = ["Axis offset", "Shield Thickness"]
                     new_dataframe.sort_values(sort, axis=0, inplace=True)
                     new_dataframe = new_dataframe.drop_duplicates()
-                    new_dataframe.to_excel(writer, sheet_name=sheet_name)
-                    conv_df.to_excel(writer, sheet_name=sheet_name, startrow=18)
+                    ws = writer.book.add_worksheet(sheet_name)
+                    row = exsupp.write_df(
+                        ws, new_dataframe, header_format=header_format
+                    )
+                    # Rows can only be written in order
+                    exsupp.write_df(
+                        ws, conv_df, max(row + 1, 18), header_format=header_format
+                    )
 
     def _read_exp_results(self):
         """
@@ -1338,21 +1396,37 @@ class TiaraFCOutput(TiaraOutput):
             self.path_exp_res, "FC_BS_Experimental-results-CONDERC.xlsx"
         )
         FC_data = {
-            ("Iron", "43"): pd.read_excel(
-                filepath, sheet_name="Fission cell", usecols="A:E", skiprows=2, nrows=10
+            ("Iron", "43"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name="Fission cell",
+                usecols="A:E",
+                skiprows=2,
+                nrows=10,
             ),
-            ("Iron", "68"): pd.read_excel(
+            ("Iron", "68"): excelcache.read_excel(
                 filepath,
+                self.excel_cache,
                 sheet_name="Fission cell",
                 usecols="A:E",
                 skiprows=16,
                 nrows=10,
             ),
-            ("Concrete", "43"): pd.read_excel(
-                filepath, sheet_name="Fission cell", usecols="A:E", skiprows=30, nrows=8
+            ("Concrete", "43"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name="Fission cell",
+                usecols="A:E",
+                skiprows=30,
+                nrows=8,
             ),
-            ("Concrete", "68"): pd.read_excel(
-                filepath, sheet_name="Fission cell", usecols="A:E", skiprows=42, nrows=8
+            ("Concrete", "68"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name="Fission cell",
+                usecols="A:E",
+                skiprows=42,
+                nrows=8,
             ),
         }
         # Build experimental dataframe
@@ -1519,8 +1593,7 @@ class TiaraFCOutput(TiaraOutput):
                         xlabel,
                         self.testname,
                     )
-                    img_path = plot.plot("Waves")
-                    atlas.insert_img(img_path)
+                    atlas.insert_plot(plot, "Waves")
         return atlas
 
 
@@ -1552,7 +1625,8 @@ class TiaraBSOutput(TiaraOutput):
         filepath = os.path.join(
             self.excel_path, "Tiara_Bonner_Spheres_CE_tables.xlsx"
         )
-        with pd.ExcelWriter(filepath, engine="xlsxwriter") as writer:
+        with exsupp.streaming_writer(filepath) as writer:
+            header_format = writer.book.add_format(exsupp.HEADER_FORMAT)
             # Loop over shield material/energy combinations
             mat_list = self.case_tree_df.index.unique(level="Shield Material").tolist()
             e_list = self.case_tree_df.index.unique(level="Energy").tolist()
@@ -1609,8 +1683,14 @@ class TiaraBSOutput(TiaraOutput):
                     # Print the dataframe in a worksheet in Excel file
                     conv_df = self._get_conv_df(comp_data)
                     sheet_name = "Tiara {}, {} MeV".format(shield_material, str(energy))
-                    new_dataframe.to_excel(writer, sheet_name=sheet_name)
-                    conv_df.to_excel(writer, sheet_name=sheet_name, startrow=12)
+                    ws = writer.book.add_worksheet(sheet_name)
+                    row = exsupp.write_df(
+                        ws, new_dataframe, header_format=header_format
+                    )
+                    # Rows can only be written in order
+                    exsupp.write_df(
+                        ws, conv_df, max(row + 1, 12), header_format=header_format
+                    )
 
     def _read_exp_results(self):
         """
@@ -1624,17 +1704,37 @@ class TiaraBSOutput(TiaraOutput):
         # Read exp data from CONDERC excel file
         s_name = "Bonner sphere"
         BS_data = {
-            ("Iron", "43"): pd.read_excel(
-                filepath, sheet_name=s_name, usecols="A:F", skiprows=2, nrows=3
+            ("Iron", "43"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name=s_name,
+                usecols="A:F",
+                skiprows=2,
+                nrows=3,
             ),
-            ("Iron", "68"): pd.read_excel(
-                filepath, sheet_name=s_name, usecols="A:F", skiprows=9, nrows=3
+            ("Iron", "68"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name=s_name,
+                usecols="A:F",
+                skiprows=9,
+                nrows=3,
             ),
-            ("Concrete", "43"): pd.read_excel(
-                filepath, sheet_name=s_name, usecols="A:F", skiprows=16, nrows=4
+            ("Concrete", "43"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name=s_name,
+                usecols="A:F",
+                skiprows=16,
+                nrows=4,
             ),
-            ("Concrete", "68"): pd.read_excel(
-                filepath, sheet_name=s_name, usecols="A:F", skiprows=24, nrows=3
+            ("Concrete", "68"): excelcache.read_excel(
+                filepath,
+                self.excel_cache,
+                sheet_name=s_name,
+                usecols="A:F",
+                skiprows=24,
+                nrows=3,
             ),
         }
 
@@ -1717,8 +1817,7 @@ class TiaraBSOutput(TiaraOutput):
             plot = Plotter(
                 data, title, tmp_path, outname, quantity, unit, xlabel, self.testname
             )
-            img_path = plot.plot("Waves")
-            atlas.insert_img(img_path)
+            atlas.insert_plot(plot, "Waves")
 
         return atlas
 
@@ -1748,7 +1847,8 @@ class ShieldingOutput(ExperimentalOutput):
         column_index = pd.MultiIndex.from_tuples(column_names, names=names)
         # filepath = self.excel_path_mcnp + '\\' + self.testname + '_CE_tables.xlsx'
         filepath = os.path.join(self.excel_path, f"{self.testname}_CE_tables.xlsx")
-        with pd.ExcelWriter(filepath, engine="xlsxwriter") as writer:
+        with exsupp.streaming_writer(filepath) as writer:
+            header_format = writer.book.add_format(exsupp.HEADER_FORMAT)
             # TODO Replace when other transport codes implemented.
             code = "mcnp"
             for mat in self.inputs:
@@ -1815,8 +1915,12 @@ class ShieldingOutput(ExperimentalOutput):
                 conv_df = self._get_conv_df(mat, len(x))
                 sheet = self.testname.replace("-", " ")
                 sheet_name = sheet + ", Foil {}".format(mat)
-                df_tab.to_excel(writer, sheet_name=sheet_name)
-                conv_df.to_excel(writer, sheet_name=sheet_name, startrow=18)
+                ws = writer.book.add_worksheet(sheet_name)
+                row = exsupp.write_df(ws, df_tab, header_format=header_format)
+                # Rows can only be written in order
+                exsupp.write_df(
+                    ws, conv_df, max(row + 1, 18), header_format=header_format
+                )
 
     def _build_atlas(self, tmp_path, atlas):
         """
@@ -1894,8 +1998,7 @@ class ShieldingOutput(ExperimentalOutput):
             plot = Plotter(
                 data, title, tmp_path, outname, quantity, unit, xlabel, self.testname
             )
-            img_path = plot.plot("Waves")
-            atlas.insert_img(img_path)
+            atlas.insert_plot(plot, "Waves")
 
         return atlas
 
@@ -1932,7 +2035,7 @@ class MultipleSpectrumOutput(SpectrumOutput):
 
         """
         self.tables = []
-        self.groups = pd.read_excel(self.cnf_path)
+        self.groups = excelcache.read_excel(self.cnf_path, self.excel_cache)
         self.groups = self.groups.set_index(["Group", "Tally", "Input"])
         self.group_list = self.groups.index.get_level_values("Group").unique().tolist()
         for group in self.group_list:
@@ -2006,12 +2109,10 @@ class MultipleSpectrumOutput(SpectrumOutput):
             add_labels=group_lab,
             mult_factors=mult_factors,
         )
-        img_path = plot.plot("Experimental points group")
         atlas.doc.add_heading(title, level=1)
-        atlas.insert_img(img_path)
-        img_path = plot.plot("Experimental points group CE")
+        atlas.insert_plot(plot, "Experimental points group")
         atlas.doc.add_heading(title + " C/E", level=1)
-        atlas.insert_img(img_path)
+        atlas.insert_plot(plot, "Experimental points group CE")
         return atlas
 
     def _define_title(self, input, particle, quantity):
@@ -30,7 +30,6 @@ from typing import TYPE_CHECKING
 from tqdm import tqdm
 
 import jade.computational as cmp
-import jade.postprocess as pp
 import jade.testrun as testrun
 import jade.utilitiesgui as uty
 from jade.__version__ import __version__
@@ -92,6 +91,7 @@ principal_menu = (
  * Produce D1S Reaction file             (react)
  * Remove all runtpe files           (rmvruntpe)
  * Compare ACE/EXFOR                (comparelib)
+ * Print session timing report          (timing)
  -----------------------------------------------
 
  * Exit                                   (exit)
@@ -255,6 +255,9 @@ def mainloop(session: Session):
         elif option == "comparelib":
             uty.print_XS_EXFOR(session)
 
+        elif option == "timing":
+            print(session.timing_report())
+
         elif option == "exit":
             session.log.adjourn("\nSession concluded normally \n")
             sys.exit()
@@ -558,6 +561,10 @@ def pploop(session: Session):
     session: (Session) object representing the current Jade session
 
     """
+    # The post-processing (plotting, Excel and Word) stack is loaded only
+    # when the post-processing menu is opened
+    import jade.postprocess as pp
+
     clear_screen()
     print(pp_menu)
     while True:
@@ -571,7 +578,7 @@ def pploop(session: Session):
             # Update the configuration file
             session.conf.read_settings()
             # Select and check library
-            ans, to_single_pp, lib_input = session.state.check_override_pp(
+            ans, to_single_pp, lib_input, force = session.state.check_override_pp(
                 session, force_one_lib=True
             )
             if lib_input == "back":
@@ -595,9 +602,11 @@ def pploop(session: Session):
                 print(
                     "\n ########################### POST-PROCESSING STARTED ###########################\n"
                 )
-                # Core function
+                # Core function, only the outdated outputs are rebuilt if not forced
                 for code, testnames in to_perform.items():
-                    pp.postprocessBenchmark(session, lib_input, code, testnames)
+                    pp.postprocessBenchmark(
+                        session, lib_input, code, testnames, force=force
+                    )
                 # for testname in to_perform:
                 #    try:
                 #        pp.postprocessBenchmark(session, lib, testname)
@@ -618,7 +627,9 @@ def pploop(session: Session):
             session.conf.read_settings()
 
             # Select and check library
-            ans, to_single_pp, lib_input = session.state.check_override_pp(session)
+            ans, to_single_pp, lib_input, force = session.state.check_override_pp(
+                session
+            )
 
             if ans:
                 # Logging
@@ -655,7 +666,9 @@ Additional Post-Processing of library:"""
                 # Execute Comparison
                 for code, testnames in to_perform.items():
                     try:
-                        pp.compareBenchmark(session, lib_input, code, testnames)
+                        pp.compareBenchmark(
+                            session, lib_input, code, testnames, force=force
+                        )
                     except PermissionError as e:
                         clear_screen()
                         print(pp_menu)
@@ -674,7 +687,7 @@ Additional Post-Processing of library:"""
             session.conf.read_settings()
 
             # Select and check library
-            ans, to_single_pp, lib_input = session.state.check_override_pp(
+            ans, to_single_pp, lib_input, force = session.state.check_override_pp(
                 session, exp=True
             )
 
@@ -710,7 +723,7 @@ Additional Post-Processing of library:"""
                 for code, testname in to_perform.items():
                     try:
                         pp.compareBenchmark(
-                            session, lib_input, code, testname, exp=True
+                            session, lib_input, code, testname, exp=True, force=force
                         )
                     except PermissionError as e:
                         clear_screen()
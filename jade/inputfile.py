@@ -144,10 +144,8 @@ class InputFile:
         None.
 
         """
-        to_print = self._to_text()
-
         with open(out, "w") as outfile:
-            outfile.write(to_print)
+            outfile.writelines(self._iter_lines())
 
     def _to_text(self):
         """
@@ -158,36 +156,35 @@ class InputFile:
         str
             MCNP formatted text for the input
         """
-        lines = []
+        return "".join(self._iter_lines())
 
+    def _iter_lines(self):
+        """
+        Yield the MCNP formatted text of the input piece by piece, so that
+        it can be streamed to a file.
+        """
         if self.cards["title"] is not None:
-            lines.extend(self.cards["title"].lines)
+            yield from self.cards["title"].lines
 
         # Add cells
         for card in self.cards["cells"]:
-            lines.extend(card.lines)
+            yield from card.lines
 
-        lines.append("\n")  # Section breaker
+        yield "\n"  # Section breaker
 
         # Add surfaces
         for card in self.cards["surf"]:
-            lines.extend(card.lines)
+            yield from card.lines
 
-        lines.append("\n")  # Section breaker
+        yield "\n"  # Section breaker
 
         # Add materials
-        lines.append(self.matlist.to_text())
-        lines.append("\n")  # Missing
+        yield from self.matlist.iter_text()
+        yield "\n"  # Missing
 
         # Add remaining data cards
         for card in self.cards["settings"]:
-            lines.extend(card.lines)
-
-        toprint = ""
-        for line in lines:
-            toprint = toprint + line
-
-        return toprint
+            yield from card.lines
 
     def translate(self, newlib, libmanager, code="mcnp"):
         """
@@ -800,11 +797,7 @@ class SerpentInputFile:
         self.lines.append(self.matlist.to_text())
         self.lines.append("\n")  # Missing
 
-        toprint = ""
-        for line in self.lines:
-            toprint = toprint + line
-
-        return toprint
+        return "".join(self.lines)
 
     def write(self, out) -> None:
         """
@@ -947,18 +940,9 @@ class OpenMCInputFiles:
         # Add materials
         self.materials = self.matlist.to_xml(libmanager)
 
-        geometry = ""
-        for line in self.geometry:
-            geometry = geometry + line
-
-        settings = ""
-        for line in self.settings:
-            settings = settings + line
-
-        tallies = ""
-        for line in self.tallies:
-            tallies = tallies + line
-
+        geometry = "".join(self.geometry)
+        settings = "".join(self.settings)
+        tallies = "".join(self.tallies)
         materials = self.materials
 
         return geometry, settings, tallies, materials
@@ -977,20 +961,22 @@ class OpenMCInputFiles:
         None.
 
         """
-        geometry, settings, tallies, materials = self._to_xml(libmanager)
+        # Add materials
+        self.materials = self.matlist.to_xml(libmanager)
 
+        # the lines are streamed directly to the files
         geometry_file = os.path.join(path, "geometry.xml")
         with open(geometry_file, "w") as outfile:
-            outfile.write(geometry)
+            outfile.writelines(self.geometry)
 
         settings_file = os.path.join(path, "settings.xml")
         with open(settings_file, "w") as outfile:
-            outfile.write(settings)
+            outfile.writelines(self.settings)
 
         tallies_file = os.path.join(path, "tallies.xml")
         with open(tallies_file, "w") as outfile:
-            outfile.write(tallies)
+            outfile.writelines(self.tallies)
 
         materials_file = os.path.join(path, "materials.xml")
         with open(materials_file, "w") as outfile:
-            outfile.write(materials)
+            outfile.write(self.materials)
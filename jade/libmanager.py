@@ -26,6 +26,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import pickle
 import re
 import sys
 import warnings
@@ -44,6 +45,13 @@ CEND = "\033[0m"
 
 
 MSG_DEFLIB = " The Default library {} was used for zaid {}"
+# xsdir reader of each code
+XSDIR_CODES = {
+    "mcnp": Xsdir,
+    "d1s": Xsdir,
+    "serpent": SerpentXsdir,
+    "openmc": OpenMCXsdir,
+}
 
 
 class IsotopeDataParser:
@@ -54,12 +62,51 @@ class IsotopeDataParser:
         abundances.set_index("idx", inplace=True)
         self.isotopes = abundances
 
+        # Lookup tables are computed only once since they are used inside
+        # per-zaid loops.
+        # {Z: [(zaid, abundance, atomic mass), ...]}
+        natural_expansions = {}
+        # {Z: (element name, element symbol)}, first occurrence is kept
+        elements = {}
+        # {element symbol: Z}
+        symbols = {}
+        # {zaid: atomic mass}
+        masses = {}
+        for idx, z, symbol, name, abundance, mass in zip(
+            abundances.index,
+            abundances["Z"],
+            abundances["E"],
+            abundances["Element"],
+            abundances["Mean value"],
+            abundances["Atomic Mass"],
+        ):
+            z = int(z)
+            natural_expansions.setdefault(z, []).append(
+                (idx, float(abundance), float(mass))
+            )
+            if z not in elements:
+                elements[z] = (name, symbol)
+            if symbol not in symbols:
+                symbols[symbol] = z
+            masses[idx] = float(mass)
+
+        # {Z: natural atomic mass}
+        natural_masses = {}
+        for z, expansion in natural_expansions.items():
+            partial_masses = np.array([ab * mass for _, ab, mass in expansion])
+            natural_masses[z] = float(partial_masses.sum())
+
+        self.natural_expansions = natural_expansions
+        self.elements = elements
+        self.symbols = symbols
+        self.masses = masses
+        self.natural_masses = natural_masses
+
     def get_formulazaid(self, formula):
         match = re.match(r"([a-z]+)([0-9]+)", formula, re.I)
         parts = match.groups()
         E, A = parts[0], int(parts[1])
-        newiso = self.isotopes[self.isotopes["E"] == E]
-        Z = newiso["Z"].values[0]
+        Z = self.symbols[E]
         zaid = "{0}{1:0>3}".format(Z, A)
         return zaid
 
@@ -74,6 +121,7 @@ class LibManager:
         defaultlib: str = None,
         activationfile: os.PathLike = None,
         isotopes_file: os.PathLike = None,
+        reactions_cache: os.PathLike = None,
     ) -> None:
         """
         Object dealing with all complex operations that involves nuclear data.
@@ -91,6 +139,11 @@ class LibManager:
         isotopes_file : str or path, optional
             path to the isotopes files. If None (default) the file is searched
             in the current directory.
+        reactions_cache : str or path, optional
+            path to a binary (pickle) copy of the activation file data. If
+            provided, it is used instead of parsing the activation file when
+            the latter was not modified since the cache was written, otherwise
+            it is (re)generated. The default is None.
 
         Attributes
         ----------
@@ -103,13 +156,22 @@ class LibManager:
         data : dict[str, dict[str, Union[Xsdir, OpenMCXsdir, SerpentXsdir]]]
             contains the libraries data. first level keys are the codes, second
             level keys are the library suffixes. ultimate value is the xsdir
-            object.
+            object. The xsdir files of a code are read the first time the
+            code is accessed.
         codes : list
             list of codes available.
         libraries : dict[str, list[str]]
-            contains the libraries available for each code.
+            contains the libraries available for each code. Filled on first
+            access of each code as data.
         reactions : dict[str, pd.DataFrame]
             contains the reactions data for the different activation libraries.
+        reactions_index : dict[str, dict[str, list[tuple[str, str]]]]
+            reactions data indexed by activation library and parent formula
+            (e.g. F19). Values are lists of (MT, daughter zaid).
+        translations : dict[tuple, dict]
+            cache of the zaid translations already computed. Keys are
+            (zaid, lib, code, defaultlib). See convertZaid and
+            clear_translation_cache.
 
         Returns
         -------
@@ -118,9 +180,14 @@ class LibManager:
         """
         if isotopes_file is None:
             isotopes_file = os.path.join("resources", "Isotopes.txt")
-
-        self.isotope_parser = IsotopeDataParser(isotopes_file)
-        self.isotopes = self.isotope_parser.isotopes
+        # The isotopes, activation and xsdir files are read on first use
+        self._isotopes_file = isotopes_file
+        self._activationfile = activationfile
+        self._reactions_cache = reactions_cache
+        self._isotope_parser = None
+        self._isotopes = None
+        self._reactions = None
+        self._reactions_index = None
 
         # Convert all columns to lower case
         new_columns = []
@@ -133,112 +200,131 @@ class LibManager:
         else:
             self.defaultlib = defaultlib
 
-        self.data = {}
         self.codes = []
         lib_df.set_index("suffix", inplace=True)
         # Initilize the Xsdir object
         # self.XS = xs.Xsdir(xsdir_file)
 
-        # this block of code needs to check the availability of the libraries.
-        # Only libraries specified in the config file are checked, if paths
+        # this block of code collects the paths of the libraries. Only
+        # libraries specified in the config file are checked, if paths
         # for the libraries are left empty, the library is not not checked and
         # it is not registered as available. If the path is not empty but
         # library is not found, a warning is raised, choice for interrupting the
         # session is left to the user.
+        self._lib_paths = {}
         for code in lib_df.columns[2:]:
             code = code.lower()
             self.codes.append(code)
-            self.data[code] = {}
+            self._lib_paths[code] = {}
             for library, row in lib_df.iterrows():
                 path = row[code]
                 # if the path is empty just ignore it
                 if path is None or path == "":
                     logging.info("No path for %s library", library)
                     continue
+                if code not in XSDIR_CODES:
+                    raise ValueError(f"{code} code not implemented")
+                self._lib_paths[code][library] = path
 
-                # if the path is not empty, check if the file exists
-                # and if it does not, raise a warning since it may not be the
-                # intended behaviour by the user
-                if not os.path.exists(path):
-                    logging.warning(
-                        "Library %s for code %s not found at %s", library, code, path
-                    )
-                    # fatal_exception(path + " does not exist")
-
-                if code == "mcnp":
-                    xsdir = Xsdir(path)
-                    # verify that the library is actually in the xsdir
-                    available_libs = set(np.array(xsdir.tablenames)[:, 1])
-                    if library in available_libs:
-                        self.data[code][library] = xsdir
-                    else:
-                        logging.warning(
-                            "Library %s not present in MCNP XSDIR file: %s", library, path
-                        )
-
-                elif code == "openmc":
-                    self.data[code][library] = OpenMCXsdir(path, self, library)
-
-                elif code == "serpent":
-                    xsdir = SerpentXsdir(path)
-                    available_libs = set(np.array(xsdir.tablenames)[:, 1])
-                    if library in available_libs:
-                        self.data[code][library] = xsdir
-                    else:
-                        logging.warning(
-                            "Library %s not present in Serpent XSDIR file: %s", library, path
-                        )
-
-                elif code == "d1s":
-                    xsdir = Xsdir(path)
-                    # verify that the library is actually in the xsdir
-                    available_libs = set(np.array(xsdir.tablenames)[:, 1])
-                    if library in available_libs:
-                        self.data[code][library] = xsdir
-                    else:
-                        logging.warning(
-                            "Library %s not present in D1S XSDIR file: %s", library, path
-                        )
+        # The xsdir files of a code are read only when the code is first used,
+        # libraries have now been checked at the source, they may be different
+        # for each code
+        self._xsdirs = {}
+        self.data = _LazyDict(self._read_code_libraries)
+        self.libraries = _LazyDict(lambda code: list(self.data[code]))
+
+        self.translations = {}
+
+    @property
+    def isotope_parser(self) -> IsotopeDataParser:
+        if self._isotope_parser is None:
+            self._isotope_parser = IsotopeDataParser(self._isotopes_file)
+        return self._isotope_parser
+
+    @property
+    def isotopes(self) -> pd.DataFrame:
+        if self._isotopes is None:
+            self._isotopes = self.isotope_parser.isotopes
+        return self._isotopes
+
+    @property
+    def reactions(self) -> dict[str, pd.DataFrame] | None:
+        # Load the activation reaction data if available
+        if self._reactions is None and self._activationfile is not None:
+            self._reactions = _read_activation_file(
+                self._activationfile, self._reactions_cache
+            )
+        return self._reactions
+
+    @property
+    def reactions_index(self) -> dict[str, dict[str, list[tuple[str, str]]]]:
+        if self._reactions_index is None:
+            self._reactions_index = self._index_reactions()
+        return self._reactions_index
+
+    def _read_code_libraries(self, code: str) -> dict:
+        """
+        Read the xsdir files of the libraries available for a code. Files
+        shared by more libraries (or codes) are parsed only once.
 
-                else:
-                    raise ValueError(f"{code} code not implemented")
+        Parameters
+        ----------
+        code : str
+            transport code.
 
-        # Identify different libraries installed. This is done checking H
-        # libraries = self.check4zaid('1001')
-        # libraries.extend(self.check4zaid('1000'))  # photons
+        Returns
+        -------
+        data : dict[str, Union[Xsdir, OpenMCXsdir, SerpentXsdir]]
+            xsdir object of each available library.
 
-        # """ Legacy library definition changed """
-        # """
-        # libraries = []
-        # for table in self.XS:
-        #     lib = table.name.split('.')[1]
-        #     if lib not in libraries:
-        #         libraries.append(lib)
+        """
+        data = {}
+        for library, path in self._lib_paths[code].items():
+            # if the path is not empty, check if the file exists
+            # and if it does not, raise a warning since it may not be the
+            # intended behaviour by the user
+            if not os.path.exists(path):
+                logging.warning(
+                    "Library %s for code %s not found at %s", library, code, path
+                )
+                # fatal_exception(path + " does not exist")
+
+            if code == "openmc":
+                data[library] = OpenMCXsdir(path, self, library)
+                continue
+
+            xsdir_class = XSDIR_CODES[code]
+            key = (xsdir_class, path)
+            if key not in self._xsdirs:
+                xsdir = xsdir_class(path)
+                # verify that the library is actually in the xsdir
+                available_libs = set(np.array(xsdir.tablenames)[:, 1])
+                self._xsdirs[key] = (xsdir, available_libs)
+            xsdir, available_libs = self._xsdirs[key]
+            if library in available_libs:
+                data[library] = xsdir
+            else:
+                logging.warning(
+                    "Library %s not present in %s XSDIR file: %s",
+                    library,
+                    code.upper(),
+                    path,
+                )
 
-        # self.libraries = libraries
-        # """
+        return data
 
-        # libraries have now been checked at the source, they may be different
-        # for each code
-        libraries = {}
-        for key, value in self.data.items():
-            libraries[key] = []
-            for lib, _ in value.items():
-                libraries[key].append(lib)
-        self.libraries = libraries
+    def clear_translation_cache(self) -> None:
+        """
+        Empty the cache of the zaid translations. It needs to be called if
+        the libraries data or the default library are modified after
+        initialization.
 
-        # Load the activation reaction data if available
-        if activationfile is not None:
-            reactions = {}
-            file = pd.ExcelFile(activationfile)
-            for sheet in file.sheet_names:
-                # Load the df that also needs to be filled
-                reactions[sheet] = file.parse(sheet).ffill()
-                # translate the formula name to zaid
-        else:
-            reactions = None
+        Returns
+        -------
+        None.
 
-        self.reactions = reactions
+        """
+        self.translations = {}
 
     def check4zaid(self, zaid: str, code: str = "mcnp"):
         # Needs fixing
@@ -281,7 +367,9 @@ class LibManager:
     def convertZaid(self, zaid: str, lib: str, code: str = "mcnp"):
         # Needs fixing
         """
-        This methods will convert a zaid into the requested library
+        This methods will convert a zaid into the requested library.
+        Translations are cached, the same zaid is computed only once for
+        each combination of library, code and default library.
 
         modes:
             - 1to1: there is one to one correspondence for the zaid
@@ -314,7 +402,20 @@ class LibManager:
         if lib not in self.libraries[code]:
             raise ValueError("Library " + lib + " is not available in xsdir file")
 
-        zaidlibs = self.check4zaid(zaid, code)
+        key = (zaid, lib, code, self.defaultlib)
+        try:
+            translation = self.translations[key]
+        except KeyError:
+            translation = self._translate_zaid(zaid, lib, code)
+            self.translations[key] = translation
+
+        # a copy is provided so that the cached value cannot be altered
+        return dict(translation)
+
+    def _translate_zaid(self, zaid: str, lib: str, code: str) -> dict:
+        """Compute the translation of a zaid, see convertZaid."""
+        if code == "openmc":
+            raise NotImplementedError("{} not implemented yet".format(code))
 
         if code in ["mcnp", "d1s", "serpent"]:
             XS = self.data[code][lib]
@@ -326,8 +427,10 @@ class LibManager:
 
                 else:  # Has to be expanded
                     translation = {}
-                    reduced = self.isotopes[self.isotopes["Z"] == int(zaid[:-3])]
-                    for idx, row in reduced.iterrows():
+                    expansion = self.isotope_parser.natural_expansions.get(
+                        int(zaid[:-3]), []
+                    )
+                    for idx, abundance, mass in expansion:
                         # zaid availability must be checked
                         if XS.find_table(idx + "." + lib, mode="exact"):
                             newlib = lib
@@ -343,13 +446,9 @@ class LibManager:
                                 + "It is needed for natural zaid expansion."
                             )
 
-                        translation[idx] = (
-                            newlib,
-                            row["Mean value"],
-                            row["Atomic Mass"],
-                        )
+                        translation[idx] = (newlib, abundance, mass)
             # 1to1
-            elif lib in zaidlibs:
+            elif XS.find_table(zaid + "." + lib, mode="exact"):
                 translation = {zaid: (lib, 1, 1)}  # mass not important
 
             # No possible correspondence, natural or default lib has to be used
@@ -434,14 +533,11 @@ class LibManager:
             i = int(zaid.element)
             isotope = zaid.isotope
 
-        newiso = self.isotopes.set_index("Z")
-        newiso = newiso.loc[~newiso.index.duplicated(keep="first")]
-
-        name = newiso["Element"].loc[i]
+        name, symbol = self.isotope_parser.elements[i]
         if int(isotope) > 0:
-            formula = newiso["E"].loc[i] + "-" + str(int(isotope))
+            formula = symbol + "-" + str(int(isotope))
         else:
-            formula = newiso["E"].loc[i]
+            formula = symbol
 
         return name, formula
 
@@ -460,9 +556,6 @@ class LibManager:
             number of the zaid ZZZAA
 
         """
-        # get the table and drop the duplicates
-        newiso = self.isotopes.set_index(["E"])
-        newiso = newiso.loc[~newiso.index.duplicated(keep="first")]
         # split the name
         patnum = re.compile(r"\d+")
         patname = re.compile(r"[a-zA-Z]+")
@@ -472,7 +565,7 @@ class LibManager:
         except AttributeError:
             raise ValueError("No correspondent zaid found for " + zaidformula)
 
-        atomnumber = newiso.loc[name, "Z"]
+        atomnumber = self.isotope_parser.symbols[name]
 
         zaidnum = "{}{:03d}".format(atomnumber, int(num))
 
@@ -565,13 +658,10 @@ class LibManager:
 
         """
         try:
-            m = self.isotopes["Atomic Mass"].loc[zaid.element + zaid.isotope]
+            m = self.isotope_parser.masses[zaid.element + zaid.isotope]
         except KeyError:  # It means that it is a natural zaid
             # For a natural zaid the natural abundance mass is used
-            df = self.isotopes.reset_index()
-            df["Partial mass"] = df["Atomic Mass"] * df["Mean value"]
-            masked = df.set_index("Z").loc[int(zaid.element)]
-            m = masked["Partial mass"].sum()
+            m = self.isotope_parser.natural_masses[int(zaid.element)]
 
         return float(m)
 
@@ -592,29 +682,103 @@ class LibManager:
             contains tuple of (MT, daughter).
 
         """
-        reactions = []
         try:
-            df = self.reactions[lib].set_index("Parent")
             isotopename, formula = self.get_zaidname(parent)
             formulazaid = formula.replace("-", "")  # eliminate the '-'
-            # collect and provide as tuples
-            subset = df.loc[formulazaid]
-            try:
-                for _, row in subset.iterrows():
-                    MT = str(int(row["MT"]))
-                    daughter = row["Daughter"]
-                    daughter = self.get_zaidnum(daughter)
-                    reactions.append((MT, daughter))
-
-            except AttributeError:
-                # then is not a DF but a Series
-                MT = str(int(subset["MT"]))
-                daughter = subset["Daughter"]
-                daughter = self.get_zaidnum(daughter)
-                reactions.append((MT, daughter))
-
+            reactions = list(self.reactions_index[lib][formulazaid])
         except KeyError:
             # library is not available or parent is not available
-            pass
+            reactions = []
 
         return reactions
+
+    def _index_reactions(self) -> dict[str, dict[str, list[tuple[str, str]]]]:
+        """Index the activation reactions by library and parent formula."""
+        index = {}
+        if self.reactions is None:
+            return index
+
+        for lib, df in self.reactions.items():
+            lib_index = {}
+            for parent, MT, daughter in zip(df["Parent"], df["MT"], df["Daughter"]):
+                try:
+                    daughterzaid = self.get_zaidnum(daughter)
+                except (KeyError, ValueError):
+                    logging.warning(
+                        "Reaction %s -> %s of library %s ignored, daughter not"
+                        " recognized",
+                        parent,
+                        daughter,
+                        lib,
+                    )
+                    continue
+                lib_index.setdefault(parent, []).append((str(int(MT)), daughterzaid))
+            index[lib] = lib_index
+
+        return index
+
+
+def _read_activation_file(
+    activationfile: os.PathLike, cache: os.PathLike = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Read the activation file, one DataFrame for each sheet. If a cache path is
+    provided, the parsed data are stored there in binary form and reused as
+    long as the activation file is not modified.
+
+    Parameters
+    ----------
+    activationfile : os.PathLike
+        path to the activation file.
+    cache : os.PathLike, optional
+        path to the binary cache file. The default is None.
+
+    Returns
+    -------
+    reactions : dict[str, pd.DataFrame]
+        reactions data for each activation library.
+
+    """
+    stat = os.stat(activationfile)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    if cache is not None and os.path.exists(cache):
+        try:
+            with open(cache, "rb") as infile:
+                cached = pickle.load(infile)
+            if cached["signature"] == signature:
+                return cached["reactions"]
+        except Exception:
+            # e.g. corrupted or written by another pandas version
+            logging.warning("Invalid activation cache %s, it will be rebuilt", cache)
+
+    reactions = {}
+    file = pd.ExcelFile(activationfile)
+    for sheet in file.sheet_names:
+        # Load the df that also needs to be filled
+        reactions[sheet] = file.parse(sheet).ffill()
+
+    if cache is not None:
+        # Written aside and then moved, other sessions never read half a file
+        tmp_path = "{}.{}.tmp".format(cache, os.getpid())
+        try:
+            with open(tmp_path, "wb") as outfile:
+                pickle.dump({"signature": signature, "reactions": reactions}, outfile)
+            os.replace(tmp_path, cache)
+        except OSError:
+            logging.warning("The activation cache %s could not be written", cache)
+
+    return reactions
+
+
+class _LazyDict(dict):
+    """Dictionary whose missing values are computed (and stored) on access"""
+
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def __missing__(self, key):
+        value = self._factory(key)
+        self[key] = value
+        return value
@@ -28,8 +28,10 @@ import shutil
 import sys
 import time
 import warnings
+from contextlib import contextmanager
 
 import jade.configuration as cnf
+import jade.excelcache as excelcache
 import jade.gui as gui
 import jade.libmanager as libmanager
 import jade.status as status
@@ -52,6 +54,28 @@ DEFAULT_SETTINGS_RESTORATION = """
  Configuration/Config.xlsx file.
 """
 CODES = {"MCNP": "mcnp", "Serpent": "serpent", "d1S": "d1s", "OpenMC": "openmc"}
+# Subsystems of the session built on first use
+LAZY_SUBSYSTEMS = ["conf", "lib_manager", "state"]
+
+
+class _subsystem:
+    """
+    Session attribute built by its method on first access and then stored in
+    the instance __dict__, like functools.cached_property (Python 3.8+).
+    Once removed from __dict__, it is built again on the next access.
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.name = method.__name__
+        self.__doc__ = method.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.method(instance)
+        instance.__dict__[self.name] = value
+        return value
 
 
 class Session:
@@ -72,15 +96,21 @@ class Session:
         """
         Initialize JADE session:
             - folders structure is created if absent
-            - Configuration file is read and correspondent object is created
-            - Libmanager is created
             - Logfile is created
+        The configuration, the library manager and the status are created
+        the first time they are used, the time spent for each of them is
+        stored in the timings attribute.
 
         Returns
         -------
         None.
 
         """
+        start = time.perf_counter()
+        self.timings = {}
+        # Subsystems of a previous initialization are built again
+        for name in LAZY_SUBSYSTEMS:
+            self.__dict__.pop(name, None)
 
         code_root = os.path.join(os.path.dirname(os.path.abspath(__file__)))
         jade_root = os.getcwd()
@@ -106,6 +136,7 @@ class Session:
         # Utilities
         self.path_uti = os.path.join(jade_root, "Utilities")
         self.path_logs = os.path.join(jade_root, "Utilities", "Log_Files")
+        self.path_cache = os.path.join(jade_root, "Utilities", "Cache")
         self.path_test_install = os.path.join(
             jade_root, "Utilities", "Installation_Test"
         )
@@ -119,6 +150,7 @@ class Session:
             self.path_single,
             self.path_comparison,
             self.path_logs,
+            self.path_cache,
             self.path_test_install,
         ]
         for path in keypaths:
@@ -152,10 +184,13 @@ class Session:
             # the application needs to be closed
             sys.exit()
 
-        # Read global configuration file. All vital variables are stored here
-        self.conf = cnf.Configuration(
-            os.path.join(jade_root, "Configuration", "Config.xlsx")
+        # Global configuration file. All vital variables are stored here
+        self.path_config = os.path.join(jade_root, "Configuration", "Config.xlsx")
+        # Library manager files
+        self.path_activation = os.path.join(
+            jade_root, "Configuration", "Activation.xlsx"
         )
+        self.path_isotopes = os.path.join(code_root, "resources", "Isotopes.txt")
 
         # --- Create the session LOG ---
         log = os.path.join(
@@ -163,16 +198,59 @@ class Session:
         )
         self.log = cnf.Log(log)
 
-        # --- Create the library manager ---
-        # dl = self.conf.default_lib
-        activationfile = os.path.join(jade_root, "Configuration", "Activation.xlsx")
-        isotopes_file = os.path.join(code_root, "resources", "Isotopes.txt")
-        self.lib_manager = libmanager.LibManager(
-            self.conf.lib, activationfile=activationfile, isotopes_file=isotopes_file
-        )
+        self.timings["Session"] = time.perf_counter() - start
+
+    @_subsystem
+    def conf(self) -> cnf.Configuration:
+        """Global configuration, read from Config.xlsx on first use"""
+        with self._timing("Configuration"):
+            cache_dir = os.path.join(self.path_cache, excelcache.CACHE_FOLDER)
+            return cnf.Configuration(self.path_config, cache_dir=cache_dir)
+
+    @_subsystem
+    def lib_manager(self) -> libmanager.LibManager:
+        """Library manager, the xsdir files are read on first use of a code"""
+        lib_df = self.conf.lib
+        with self._timing("Library manager"):
+            reactions_cache = os.path.join(self.path_cache, "Activation.pickle")
+            return libmanager.LibManager(
+                lib_df,
+                activationfile=self.path_activation,
+                isotopes_file=self.path_isotopes,
+                reactions_cache=reactions_cache,
+            )
+
+    @_subsystem
+    def state(self) -> status.Status:
+        """Status of the runs and post-processing, built on first use"""
+        self.conf  # the configuration is timed on its own
+        with self._timing("Status"):
+            return status.Status(self)
+
+    @contextmanager
+    def _timing(self, name: str):
+        """Record the time spent building a subsystem"""
+        start = time.perf_counter()
+        yield
+        self.timings[name] = time.perf_counter() - start
+
+    def timing_report(self) -> str:
+        """
+        Get a report of the time spent initializing the session and its
+        subsystems. Subsystems that were not used yet are not listed.
 
-        # --- Initialize status ---
-        self.state = status.Status(self)
+        Returns
+        -------
+        str
+            timing report.
+
+        """
+        text = " Session timing report\n"
+        for name, elapsed in self.timings.items():
+            text += " - {:<20}{:>8.3f} s\n".format(name, elapsed)
+        total = sum(self.timings.values())
+        text += " {:<22}{:>8.3f} s\n".format("Total", total)
+        return text
 
     def check_active_tests(self, action: str, exp=False) -> dict[str, list[str]]:
         """
@@ -256,7 +334,23 @@ class Session:
         sys.exit()  # exit to allow for settings of key ambient variables
 
 
-def main():
+def main(argv: list[str] = None) -> None:
+    """
+    Start JADE. Without arguments the interactive menus are opened, otherwise
+    the batch mode is used (see jade.batch).
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        command line arguments. The default is None, meaning sys.argv.
+
+    Returns
+    -------
+    None.
+
+    """
+    if argv is None:
+        argv = sys.argv[1:]
     # Module having problem with log(0) for tick position in graphs
     warnings.filterwarnings("ignore", r"invalid value encountered in double_scalars")
     warnings.filterwarnings("ignore", r"overflow encountered in power")
@@ -265,8 +359,13 @@ def main():
         "ignore", message=r"Warning: converting a masked element to nan."
     )
 
-    session = Session()
-    gui.mainloop(session)
+    if len(argv) > 0:
+        import jade.batch as batch
+
+        batch.main(argv)
+    else:
+        session = Session()
+        gui.mainloop(session)
 
 
 def _eval_bool_config(arg):
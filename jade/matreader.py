@@ -456,27 +456,26 @@ class SubMaterial:
             formatted submaterial text.
 
         """
+        pieces = []
         if self.header is not None:
-            text = self.header + "\n"
-        else:
-            text = ""
+            pieces.append(self.header + "\n")
         # if self.name is not None:
         #     text = text+'\n'+self.name
         if self.elements is not None:
             for elem in self.elements:
                 for zaid in elem.zaids:
-                    text = text + zaid.to_text() + "\n"
+                    pieces.append(zaid.to_text() + "\n")
         else:
             for zaid in self.zaidList:
-                text = text + zaid.to_text() + "\n"
+                pieces.append(zaid.to_text() + "\n")
 
         # Add additional keys
         if len(self.additional_keys) > 0:
-            text = text + "\t"
+            pieces.append("\t")
             for key in self.additional_keys:
-                text = text + " " + key
+                pieces.append(" " + key)
 
-        return text.strip("\n")
+        return "".join(pieces).strip("\n")
 
     def to_xml(self, libmanager, material) -> None:
         """Generate XML content for a material and add it to a material tree.
@@ -895,13 +894,14 @@ class Material:
             else:
                 text = self.name.upper()
         if self.submaterials is not None:
+            pieces = [text]
             for submaterial in self.submaterials:
-                text = text + "\n" + submaterial.to_text()
+                pieces.append(submaterial.to_text())
             # Add mx cards
             for mx in self.mx_cards:
                 for line in mx:
-                    line = line.strip("\n")
-                    text = text + "\n" + line.upper()
+                    pieces.append(line.strip("\n").upper())
+            text = "\n".join(pieces)
         else:
             text = "  Not supported yet, generate submaterials first"
             pass  # TODO
@@ -1119,11 +1119,18 @@ class MatCardsList(Sequence):
 
     def append(self, material):
         self.materials.append(material)
-        self.matdic = self._compute_dic()
+        self.matdic[material.name.upper()] = material
 
     def remove(self, item):
         self.materials.remove(item)  # TODO this should get the key instead
-        self.matdic = self._compute_dic()
+        key = item.name.upper()
+        if self.matdic.get(key) is item:
+            del self.matdic[key]
+            # Another material with the same name may still be in the list
+            for material in reversed(self.materials):
+                if material.name.upper() == key:
+                    self.matdic[key] = material
+                    break
 
     def _compute_dic(self):
         matdic = {}
@@ -1214,11 +1221,26 @@ class MatCardsList(Sequence):
             material card list MCNP formatted text.
 
         """
-        text = ""
-        for material in self.materials:
-            text = text + "\n" + material.to_text()
+        return "".join(self.iter_text()).strip("\n")
 
-        return text.strip("\n")
+    def iter_text(self):
+        """
+        Yield the text of the material cards in order, one material at a
+        time. It allows to stream the cards to a file without building the
+        full text.
+
+        Yields
+        ------
+        str
+            MCNP formatted text of a material, newline separated from the
+            previous one.
+
+        """
+        for i, material in enumerate(self.materials):
+            if i == 0:
+                yield material.to_text()
+            else:
+                yield "\n" + material.to_text()
 
     def to_xml(self, libmanager) -> str:
         """Generate an XML representation of materials and return it as a string.
@@ -25,10 +25,11 @@ from __future__ import annotations
 
 import abc
 import os
-import pickle
 import shutil
+import sqlite3
 import string
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -38,9 +39,14 @@ import pandas as pd
 from tqdm import tqdm
 
 import jade.atlas as at
+import jade.dependencies as dependencies
+import jade.excelcache as excelcache
 import jade.excelsupport as exsupp
 import jade.MCTAL_READER2 as mtal
 import jade.plotter as plotter
+import jade.rawstore as rawstore
+import jade.warehouse as warehouse
+from jade.__version__ import __version__
 from jade.configuration import Configuration
 from jade.meshtal import Meshtal
 from jade.outputFile import OutputFile
@@ -116,6 +122,9 @@ class AbstractOutput(abc.ABC):
 
 
 class BenchmarkOutput(AbstractOutput):
+    # The artifacts can be rebuilt independently
+    partial_rebuild = True
+
     def __init__(self, lib, code, testname: str, session: Session):
         """
         General class for a Benchmark output
@@ -143,6 +152,25 @@ class BenchmarkOutput(AbstractOutput):
         self.state = session.state
         self.session = session
         self.path_templates = session.path_templates
+        # Number of processes to be used for the outputs parsing
+        self.n_workers = session.conf.pp_workers
+        # Produce draft atlases
+        self.draft = session.conf.atlas_draft
+        # Dense spectra are plotted with aggregated bins
+        self.max_bins = session.conf.plot_max_bins
+        # Export the raw data also as .csv files
+        self.raw_csv = session.conf.raw_csv
+        # Images of plots already rendered in previous post-processing
+        if session.conf.plot_cache_size is None:
+            self.plot_cache = None
+        else:
+            self.plot_cache = plotter.PlotCache(
+                os.path.join(session.path_cache, "Plots"),
+                session.conf.plot_cache_size,
+            )
+
+        # Parsed Excel files are cached between sessions
+        self.excel_cache = os.path.join(session.path_cache, excelcache.CACHE_FOLDER)
 
         # Read specific configuration
         cnf_path = os.path.join(session.path_cnf, self.testname + ".xlsx")
@@ -204,16 +232,14 @@ class BenchmarkOutput(AbstractOutput):
             if not os.path.exists(out):
                 os.mkdir(out)
 
+            # Previous results are kept, only the stale ones are rebuilt
             out = os.path.join(out, self.testname, code)
-            if os.path.exists(out):
-                shutil.rmtree(out)
-            os.makedirs(out)
             excel_path = os.path.join(out, "Excel")
             atlas_path = os.path.join(out, "Atlas")
             raw_path = os.path.join(out, "Raw_Data")
-            os.makedirs(excel_path)
-            os.makedirs(atlas_path)
-            os.makedirs(raw_path)
+            os.makedirs(excel_path, exist_ok=True)
+            os.makedirs(atlas_path, exist_ok=True)
+            os.makedirs(raw_path, exist_ok=True)
             self.excel_path = excel_path
             self.raw_path = raw_path
             self.atlas_path = atlas_path
@@ -232,20 +258,104 @@ class BenchmarkOutput(AbstractOutput):
             if not os.path.exists(out):
                 os.mkdir(out)
 
+            # Previous results are kept, only the stale ones are rebuilt
             out = os.path.join(out, self.testname, code)
-            if os.path.exists(out):
-                shutil.rmtree(out)
-            os.makedirs(out)
             excel_path = os.path.join(out, "Excel")
             atlas_path = os.path.join(out, "Atlas")
             raw_path = os.path.join(out, "Raw_Data")
-            os.makedirs(excel_path)
-            os.makedirs(atlas_path)
-            os.makedirs(raw_path)
+            os.makedirs(excel_path, exist_ok=True)
+            os.makedirs(atlas_path, exist_ok=True)
+            os.makedirs(raw_path, exist_ok=True)
             self.excel_path = excel_path
             self.raw_path = raw_path
             self.atlas_path = atlas_path
 
+        self.code = code
+        # Dependencies of the artifacts built by a previous post-processing
+        self.manifest = dependencies.Manifest(os.path.dirname(self.excel_path))
+        # Artifacts to be (re)built, see update()
+        self.stale = list(dependencies.ARTIFACTS)
+
+    def update(self, action: str, force: bool = False) -> bool:
+        """
+        Rebuild the artifacts (Excel, raw data, atlas) whose dependencies
+        (simulation outputs, configuration, options) changed since the last
+        post-processing. Up to date artifacts are kept.
+
+        Parameters
+        ----------
+        action : str
+            either 'pp' for the single library post-processing or 'compare'.
+        force : bool, optional
+            if True all the artifacts are rebuilt, e.g. when the user asked
+            to override the previous results. The default is False.
+
+        Returns
+        -------
+        bool
+            False if everything was already up to date.
+
+        """
+        depends = self._get_dependencies()
+        if force:
+            stale = list(dependencies.ARTIFACTS)
+        else:
+            stale = self.manifest.get_stale(depends)
+        if len(stale) == 0:
+            print(" Post-processing up to date, skipped")
+            return False
+        if not self.partial_rebuild:
+            stale = list(dependencies.ARTIFACTS)
+
+        for artifact in stale:
+            path = os.path.join(self.manifest.out_path, artifact)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.makedirs(path)
+        self.stale = stale
+
+        if action == "pp":
+            self.single_postprocess()
+        else:
+            self.compare()
+        self.manifest.record(depends)
+        return True
+
+    def _get_dependencies(self) -> dict[str, dict]:
+        """
+        Get the current fingerprints of what each artifact is built from.
+
+        Returns
+        -------
+        dict[str, dict]
+            dependencies of each artifact.
+
+        """
+        if self.single:
+            test_paths = {self.lib: self.test_path}
+        else:
+            test_paths = self.test_path
+
+        common = {
+            "version": __version__,
+            "configuration": dependencies.fingerprint(self.cnf_path),
+            "templates": dependencies.fingerprint(self.path_templates),
+        }
+        for lib, test_path in test_paths.items():
+            common["run " + lib] = dependencies.fingerprint(test_path, self.code)
+            common["name " + lib] = str(self.session.conf.get_lib_name(lib))
+
+        depends = {artifact: dict(common) for artifact in dependencies.ARTIFACTS}
+        depends["Raw_Data"]["raw_csv"] = bool(self.raw_csv)
+        # Options shaping the atlases
+        conf = self.session.conf
+        depends["Atlas"]["draft"] = bool(self.draft)
+        depends["Atlas"]["max_bins"] = self.max_bins
+        depends["Atlas"]["volume_size"] = conf.atlas_volume_size
+        depends["Atlas"]["volume_max_size"] = conf.atlas_volume_max_size
+        depends["Atlas"]["volume_per_section"] = bool(conf.atlas_volume_per_section)
+        return depends
+
     def single_postprocess(self):
         """
         Execute the full post-processing of a single library (i.e. excel,
@@ -258,20 +368,33 @@ class BenchmarkOutput(AbstractOutput):
         """
         print(" Generating Excel Recap...")
         self._generate_single_excel_output()
-        self._print_raw()
+        if "Raw_Data" in self.stale:
+            self._print_raw()
+        if "Atlas" not in self.stale:
+            return
 
         print(" Creating Atlas...")
-        if self.mcnp:
-            outpath = os.path.join(self.atlas_path, "tmp")
-        os.mkdir(outpath)
+        # Plots are rendered in memory, outpath is never written
+        outpath = self.atlas_path
 
         # Get atlas configuration
-        atl_cnf = pd.read_excel(self.cnf_path, sheet_name="Atlas")
+        atl_cnf = excelcache.read_excel(
+            self.cnf_path, self.excel_cache, sheet_name="Atlas"
+        )
         atl_cnf.set_index("Tally", inplace=True)
 
         # Printing Atlas
         template = template = os.path.join(self.path_templates, "AtlasTemplate.docx")
-        atlas = at.Atlas(template, self.testname + "_" + self.lib)
+        # Plots are rendered in parallel while the atlas is filled
+        renderer = plotter.PlotRenderer(self.n_workers)
+        atlas = at.Atlas(
+            template,
+            self.testname + "_" + self.lib,
+            renderer=renderer,
+            draft=self.draft,
+            max_bins=self.max_bins,
+            cache=self.plot_cache,
+        )
 
         # Iterate over each type of plot (first one is quantity
         # and second one the measure unit)
@@ -347,13 +470,10 @@ class BenchmarkOutput(AbstractOutput):
                         xlabel,
                         self.testname,
                     )
-                    img_path = plot.plot(plot_type)
-
-                    atlas.insert_img(img_path)
+                    atlas.insert_plot(plot, plot_type)
         if self.mcnp:
             atlas.save(self.atlas_path)
-        # Remove tmp images
-        shutil.rmtree(outpath)
+        renderer.close()
 
     def compare(self):
         """
@@ -366,36 +486,45 @@ class BenchmarkOutput(AbstractOutput):
         """
         print(" Generating Excel Recap...")
         self._generate_comparison_excel_output()
+        if "Atlas" not in self.stale:
+            return
 
         print(" Creating Atlas...")
-        if self.mcnp:
-            outpath = os.path.join(self.atlas_path, "tmp")
-        os.mkdir(outpath)
+        # Plots are rendered in memory, outpath is never written
+        outpath = self.atlas_path
 
         # Get atlas configuration
-        atl_cnf = pd.read_excel(self.cnf_path, sheet_name="Atlas")
+        atl_cnf = excelcache.read_excel(
+            self.cnf_path, self.excel_cache, sheet_name="Atlas"
+        )
         atl_cnf.set_index("Tally", inplace=True)
 
         # Printing Atlas
         template = os.path.join(self.path_templates, "AtlasTemplate.docx")
 
-        atlas = at.Atlas(template, self.testname + "_" + self.name)
+        # Plots are rendered in parallel while the atlas is filled
+        renderer = plotter.PlotRenderer(self.n_workers)
+        atlas = at.Atlas(
+            template,
+            self.testname + "_" + self.name,
+            renderer=renderer,
+            draft=self.draft,
+            max_bins=self.max_bins,
+            cache=self.plot_cache,
+        )
 
         # Recover data
+        ex_cnf = excelcache.read_excel(
+            self.cnf_path, self.excel_cache, sheet_name="Excel"
+        )
+        ex_cnf.set_index("Tally", inplace=True)
         outputs_dic = {}
         for lib in self.lib:
             # Recover lib output
             if self.mcnp:
-                out_path = os.path.join(
-                    self.session.path_single,
-                    lib,
-                    self.testname,
-                    "mcnp",
-                    "Raw_Data",
-                    lib + ".pickle",
+                outputs = self._get_tally_outputs(
+                    self.raw_data["mcnp"][lib], self.tally_titles[lib], ex_cnf
                 )
-            with open(out_path, "rb") as handle:
-                outputs = pickle.load(handle)
             outputs_dic[lib] = outputs
 
         # Iterate over each type of plot (first one is quantity
@@ -485,14 +614,10 @@ class BenchmarkOutput(AbstractOutput):
                         xlabel,
                         self.testname,
                     )
-                    img_path = plot.plot(plot_type)
-
-                    atlas.insert_img(img_path)
+                    atlas.insert_plot(plot, plot_type)
         if self.mcnp:
             atlas.save(self.atlas_path)
-
-        # Remove tmp images
-        shutil.rmtree(outpath)
+        renderer.close()
 
     @staticmethod
     def _reorder_df(df, x_set):
@@ -519,13 +644,155 @@ class BenchmarkOutput(AbstractOutput):
 
         return df
 
+    def _get_tally_outputs(self, tallydata, titles, ex_cnf):
+        """
+        Elaborate the tallies data in the tables used for the Excel outputs
+        and the atlas, according to the benchmark configuration.
+
+        Parameters
+        ----------
+        tallydata : dict
+            tallies data (long format), keys are the tally numbers.
+        titles : dict
+            tallies descriptions, keys are the tally numbers.
+        ex_cnf : pd.DataFrame
+            Excel configuration of the benchmark, indexed by tally number.
+
+        Returns
+        -------
+        outputs : dict
+            for each tally number, its title, x label and 'Value' and 'Error'
+            tables.
+
+        """
+        outputs = {}
+        for label in ["Value", "Error"]:
+            # keys = {}
+            for num, key in titles.items():
+                tdata = tallydata[num].copy()  # Full tally data
+                try:
+                    tally_settings = ex_cnf.loc[num]
+                except KeyError:
+                    print(" Warning!: tally n." + str(num) + " is not in configuration")
+                    continue
+
+                # Re-Elaborate tdata Dataframe
+                x_name = tally_settings["x"]
+                x_tag = tally_settings["x name"]
+                y_name = tally_settings["y"]
+                y_tag = tally_settings["y name"]
+                ylim = tally_settings["cut Y"]
+
+                if label == "Value":
+                    outputs[num] = {"title": key, "x_label": x_tag}
+
+                # select the index format
+                if x_name == "Energy":
+                    idx_format = "0.00E+00"
+                    # TODO all possible cases should be addressed
+                else:
+                    idx_format = "0"
+
+                if y_name != "tally":
+                    tdata.set_index(x_name, inplace=True)
+                    x_set = list(set(tdata.index))
+                    y_set = list(set(tdata[y_name].values))
+                    rows = []
+                    for xval in x_set:
+                        try:
+                            row = tdata.loc[xval, label].values
+                            prev_len = len(row)
+                        except AttributeError:
+                            # There is only one total value, fill the rest with
+                            # nan
+                            row = []
+                            for i in range(prev_len - 1):
+                                row.append(np.nan)
+                            row.append(tdata.loc[xval, label])
+
+                        rows.append(row)
+
+                    try:
+                        main_value_df = pd.DataFrame(rows, columns=y_set, index=x_set)
+                        main_value_df.index.name = x_name
+                    except ValueError:
+                        print(
+                            CRED
+                            + """
+        A ValueError was triggered, a probable cause may be that more than 2 binnings
+         are defined in tally {}. This is a fatal exception,  application will now
+        close""".format(
+                                str(num)
+                            )
+                            + CEND
+                        )
+                        # Safely exit from excel and from application
+                        # ex.save()
+                        sys.exit()
+
+                    # reorder index (quick reset of the index)
+                    main_value_df.reset_index(inplace=True)
+                    main_value_df = self._reorder_df(main_value_df, x_name)
+                    main_value_df.set_index(x_name, inplace=True)
+                    # memorize for atlas
+                    outputs[num][label] = main_value_df
+                    # insert the df in pieces
+                    # ex.insert_cutted_df(
+                    #    "B",
+                    #    main_value_df,
+                    #    label + "s",
+                    #    ylim,
+                    #    header=(key, "Tally n." + str(num)),
+                    #    index_name=x_tag,
+                    #    cols_name=y_tag,
+                    #    index_num_format=idx_format,
+                    # )
+                else:
+                    # reorder df
+                    try:
+                        tdata = self._reorder_df(tdata, x_name)
+                    except KeyError:
+                        print(
+                            CRED
+                            + """
+ {} is not available in tally {}. Please check the configuration file.
+ The application will now exit """.format(
+                                x_name, str(num)
+                            )
+                            + CEND
+                        )
+                        # Safely exit from excel and from application
+                        # ex.save()
+                        sys.exit()
+
+                    if label == "Value":
+                        del tdata["Error"]
+                    elif label == "Error":
+                        del tdata["Value"]
+                    # memorize for atlas and set index
+                    tdata.set_index(x_name, inplace=True)
+                    outputs[num][label] = tdata
+
+                    # Insert DF
+                    # ex.insert_df(
+                    #    "B",
+                    #    tdata,
+                    #    label + "s",
+                    #    print_index=True,
+                    #    header=(key, "Tally n." + str(num)),
+                    # )
+
+        return outputs
+
     def _generate_single_excel_output(self):
         # Get excel configuration
         self.outputs = {}
         self.results = {}
         self.errors = {}
         self.stat_checks = {}
-        ex_cnf = pd.read_excel(self.cnf_path, sheet_name="Excel")
+        ex_cnf = excelcache.read_excel(
+            self.cnf_path, self.excel_cache, sheet_name="Excel"
+        )
         ex_cnf.set_index("Tally", inplace=True)
 
         # Open the excel file
@@ -535,7 +802,6 @@ class BenchmarkOutput(AbstractOutput):
             outpath = os.path.join(
                 self.excel_path, self.testname + "_" + self.lib + ".xlsx"
             )
-            outputs = {}
             # ex = ExcelOutputSheet(template, outpath)
             # Get results
             # results = []
@@ -556,146 +822,24 @@ class BenchmarkOutput(AbstractOutput):
             mctal = mcnp_output.mctal
             # Adjourn raw Data
             self.raw_data = mcnp_output.tallydata
+            # Stored with the raw data to be reused by the comparisons
+            self.tally_titles = {}
+            for tally in mctal.tallies:
+                self.tally_titles[tally.tallyNumber] = tally.tallyComment[0]
+            self.run_signature = get_run_signature(results_path)
 
             # res, err = output.get_single_excel_data()
+            outputs = self._get_tally_outputs(
+                mcnp_output.tallydata, self.tally_titles, ex_cnf
+            )
+            # memorize data for atlas
+            self.outputs["mcnp"] = outputs
 
-            for label in ["Value", "Error"]:
-                # keys = {}
-                for tally in mctal.tallies:
-                    num = tally.tallyNumber
-                    key = tally.tallyComment[0]
-                    # keys[num] = key  # Memorize tally descriptions
-                    tdata = mcnp_output.tallydata[num].copy()  # Full tally data
-                    try:
-                        tally_settings = ex_cnf.loc[num]
-                    except KeyError:
-                        print(
-                            " Warning!: tally n."
-                            + str(num)
-                            + " is not in configuration"
-                        )
-                        continue
-
-                    # Re-Elaborate tdata Dataframe
-                    x_name = tally_settings["x"]
-                    x_tag = tally_settings["x name"]
-                    y_name = tally_settings["y"]
-                    y_tag = tally_settings["y name"]
-                    ylim = tally_settings["cut Y"]
-
-                    if label == "Value":
-                        outputs[num] = {"title": key, "x_label": x_tag}
-
-                    # select the index format
-                    if x_name == "Energy":
-                        idx_format = "0.00E+00"
-                        # TODO all possible cases should be addressed
-                    else:
-                        idx_format = "0"
-
-                    if y_name != "tally":
-                        tdata.set_index(x_name, inplace=True)
-                        x_set = list(set(tdata.index))
-                        y_set = list(set(tdata[y_name].values))
-                        rows = []
-                        for xval in x_set:
-                            try:
-                                row = tdata.loc[xval, label].values
-                                prev_len = len(row)
-                            except AttributeError:
-                                # There is only one total value, fill the rest with
-                                # nan
-                                row = []
-                                for i in range(prev_len - 1):
-                                    row.append(np.nan)
-                                row.append(tdata.loc[xval, label])
-
-                            rows.append(row)
-
-                        try:
-                            main_value_df = pd.DataFrame(
-                                rows, columns=y_set, index=x_set
-                            )
-                            main_value_df.index.name = x_name
-                        except ValueError:
-                            print(
-                                CRED
-                                + """
-        A ValueError was triggered, a probable cause may be that more than 2 binnings
-         are defined in tally {}. This is a fatal exception,  application will now
-        close""".format(
-                                    str(num)
-                                )
-                                + CEND
-                            )
-                            # Safely exit from excel and from application
-                            # ex.save()
-                            sys.exit()
-
-                        # reorder index (quick reset of the index)
-                        main_value_df.reset_index(inplace=True)
-                        main_value_df = self._reorder_df(main_value_df, x_name)
-                        main_value_df.set_index(x_name, inplace=True)
-                        # memorize for atlas
-                        outputs[num][label] = main_value_df
-                        # insert the df in pieces
-                        # ex.insert_cutted_df(
-                        #    "B",
-                        #    main_value_df,
-                        #    label + "s",
-                        #    ylim,
-                        #    header=(key, "Tally n." + str(num)),
-                        #    index_name=x_tag,
-                        #    cols_name=y_tag,
-                        #    index_num_format=idx_format,
-                        # )
-                    else:
-                        # reorder df
-                        try:
-                            tdata = self._reorder_df(tdata, x_name)
-                        except KeyError:
-                            print(
-                                CRED
-                                + """
- {} is not available in tally {}. Please check the configuration file.
- The application will now exit """.format(
-                                    x_name, str(num)
-                                )
-                                + CEND
-                            )
-                            # Safely exit from excel and from application
-                            # ex.save()
-                            sys.exit()
-
-                        if label == "Value":
-                            del tdata["Error"]
-                        elif label == "Error":
-                            del tdata["Value"]
-                        # memorize for atlas and set index
-                        tdata.set_index(x_name, inplace=True)
-                        outputs[num][label] = tdata
-
-                        # Insert DF
-                        # ex.insert_df(
-                        #    "B",
-                        #    tdata,
-                        #    label + "s",
-                        #    print_index=True,
-                        #    header=(key, "Tally n." + str(num)),
-                        # )
-                # memorize data for atlas
-                self.outputs["mcnp"] = outputs
-                # print(outputs)
-                # Dump them for comparisons
-                raw_outpath = os.path.join(self.raw_path, self.lib + ".pickle")
-                with open(raw_outpath, "wb") as outfile:
-                    pickle.dump(outputs, outfile)
-
-                # Compile general infos in the sheet
-                # ws = ex.current_ws
-                # title = self.testname + " RESULTS RECAP: " + label + "s"
-                # ws.range("A3").value = title
-                # ws.range("C1").value = self.lib
+            # Compile general infos in the sheet
+            # ws = ex.current_ws
+            # title = self.testname + " RESULTS RECAP: " + label + "s"
+            # ws.range("A3").value = title
+            # ws.range("C1").value = self.lib
 
             # --- Compile statistical checks sheet ---
             # ws = ex.wb.sheets["Statistical Checks"]
@@ -717,15 +861,108 @@ class BenchmarkOutput(AbstractOutput):
             # ws.range("A9").options(index=False, header=False).value = df
 
             # ex.save()
-            exsupp.single_excel_writer(
-                self, outpath, self.lib, self.testname, outputs, stats
-            )
+            if "Excel" in self.stale:
+                exsupp.single_excel_writer(
+                    self, outpath, self.lib, self.testname, outputs, stats
+                )
 
     def _print_raw(self):
         if self.mcnp:
-            for key, data in self.raw_data.items():
-                file = os.path.join(self.raw_path, str(key) + ".csv")
-                data.to_csv(file, header=True, index=False)
+            dataset = rawstore.get_dataset_path(
+                self.raw_path, self.lib, self.testname, "mcnp"
+            )
+            attrs = {
+                "signature": self.run_signature,
+                "titles": list(self.tally_titles.items()),
+            }
+            rawstore.write_dataset(dataset, self.raw_data, ["Tally"], attrs=attrs)
+            tables = [
+                (self.testname, num, self.tally_titles.get(num), data)
+                for num, data in self.raw_data.items()
+            ]
+            self._add_to_warehouse("mcnp", tables)
+            if self.raw_csv:
+                for key, data in self.raw_data.items():
+                    file = os.path.join(self.raw_path, str(key) + ".csv")
+                    data.to_csv(file, header=True, index=False)
+
+    def _add_to_warehouse(self, code, tables):
+        """
+        Add the results of the single library post-processing to the
+        cross-library results warehouse
+
+        Parameters
+        ----------
+        code : str
+            code that produced the results.
+        tables : iterable
+            (input, tally number, tally title, tally data) tuples, see
+            warehouse.ResultsWarehouse.add_results().
+
+        Returns
+        -------
+        None.
+
+        """
+        path = os.path.join(self.session.path_pp, warehouse.WAREHOUSE_FILE)
+        try:
+            results = warehouse.ResultsWarehouse(path)
+            results.add_results(self.lib, self.testname, code, tables)
+        except sqlite3.Error as e:
+            message = " Warning!: results not added to the warehouse ({})".format(e)
+            print(CRED + message + CEND)
+
+    def _load_raw_data(self, lib):
+        """
+        Recover the tallies data of a library from the raw data of its single
+        library post-processing. If the raw data is not available or if the
+        simulation outputs changed after it was produced, the outputs are
+        parsed again.
+
+        Parameters
+        ----------
+        lib : str
+            library suffix.
+
+        Returns
+        -------
+        tallydata : dict
+            tallies data (long format), keys are the tally numbers.
+        titles : dict
+            tallies descriptions, keys are the tally numbers.
+
+        """
+        results_path = os.path.join(self.test_path[lib], "mcnp")
+        raw_path = os.path.join(
+            self.session.path_single, lib, self.testname, "mcnp", "Raw_Data"
+        )
+        dataset = rawstore.get_dataset_path(raw_path, lib, self.testname, "mcnp")
+        try:
+            attrs = rawstore.read_metadata(dataset)["attrs"]
+        except (OSError, ValueError, KeyError):
+            attrs = {}
+        signature = [list(entry) for entry in get_run_signature(results_path)]
+        if attrs.get("signature") == signature:
+            titles = {num: title for num, title in attrs["titles"]}
+            return rawstore.read_dataset(dataset), titles
+
+        print(" Raw data for {} not found or outdated, parsing...".format(lib))
+        # Get mfile and outfile and possibly meshtal file
+        meshtalfile = None
+        for file in os.listdir(results_path):
+            if file[-1] == "m":
+                mfile = os.path.join(results_path, file)
+            elif file[-1] == "o":
+                ofile = os.path.join(results_path, file)
+            elif file[-4:] == "msht":
+                meshtalfile = os.path.join(results_path, file)
+        # Parse output
+        mcnp_output = MCNPoutput(mfile, ofile, meshtal_file=meshtalfile)
+        titles = {}
+        for tally in mcnp_output.mctal.tallies:
+            titles[tally.tallyNumber] = tally.tallyComment[0]
+
+        return mcnp_output.tallydata, titles
 
     def _generate_comparison_excel_output(self):
         # Get excel configuration
@@ -733,7 +970,9 @@ class BenchmarkOutput(AbstractOutput):
         self.results = {}
         self.errors = {}
         self.stat_checks = {}
-        ex_cnf = pd.read_excel(self.cnf_path, sheet_name="Excel")
+        ex_cnf = excelcache.read_excel(
+            self.cnf_path, self.excel_cache, sheet_name="Excel"
+        )
         ex_cnf.set_index("Tally", inplace=True)
 
         # Open the excel file
@@ -741,7 +980,8 @@ class BenchmarkOutput(AbstractOutput):
         # template = os.path.join(os.getcwd(), "templates", name_tag)
 
         if self.mcnp:
-            mcnp_outputs = {}
+            tallydata = {}
+            titles = {}
             comps = {}
             abs_diffs = {}
             std_devs = {}
@@ -755,35 +995,17 @@ class BenchmarkOutput(AbstractOutput):
                 # ex = ExcelOutputSheet(template, outpath)
                 # Get results
 
-                # for lib in to_read:
-                #    results_path = self.test_path[lib]
-                for lib, results_path in {
-                    reflib: os.path.join(self.test_path[reflib], "mcnp"),
-                    tarlib: os.path.join(self.test_path[tarlib], "mcnp"),
-                }.items():
-                    results = []
-                    errors = []
-                    # Get mfile and outfile and possibly meshtal file
-                    meshtalfile = None
-                    for file in os.listdir(results_path):
-                        if file[-1] == "m":
-                            mfile = os.path.join(results_path, file)
-                        elif file[-1] == "o":
-                            ofile = os.path.join(results_path, file)
-                        elif file[-4:] == "msht":
-                            meshtalfile = os.path.join(results_path, file)
-                    # Parse output
-                    mcnp_output = MCNPoutput(mfile, ofile, meshtal_file=meshtalfile)
-                    mcnp_outputs[lib] = mcnp_output
+                for lib in [reflib, tarlib]:
+                    # The reference is shared by all couples
+                    if lib in tallydata:
+                        continue
+                    tallydata[lib], titles[lib] = self._load_raw_data(lib)
                 # Build the comparison
                 for label in ["Value", "Error"]:
-                    for tally in mcnp_outputs[reflib].mctal.tallies:
-                        num = tally.tallyNumber
-                        key = tally.tallyComment[0]
-
+                    for num, key in titles[reflib].items():
                         # Full tally data
-                        tdata_ref = mcnp_outputs[reflib].tallydata[num].copy()
-                        tdata_tar = mcnp_outputs[tarlib].tallydata[num].copy()
+                        tdata_ref = tallydata[reflib][num].copy()
+                        tdata_tar = tallydata[tarlib][num].copy()
                         try:
                             tally_settings = ex_cnf.loc[num]
                         except KeyError:
@@ -956,6 +1178,11 @@ class BenchmarkOutput(AbstractOutput):
 
                 # ex.save()
                 self.outputs["mcnp"] = comps
+                # Reused for the atlas
+                self.raw_data["mcnp"] = tallydata
+                self.tally_titles = titles
+                if "Excel" not in self.stale:
+                    continue
                 exsupp.comp_excel_writer(
                     self,
                     outpath,
@@ -967,6 +1194,353 @@ class BenchmarkOutput(AbstractOutput):
                 )
 
 
+class ParsedOutput:
+    def __init__(self, tallydata, totalbin, stat_checks=None):
+        """
+        Compact representation of a parsed output. It only retains the
+        tallies data, their total bins and the statistical checks so that it
+        can be cheaply shipped back from a worker process.
+
+        Parameters
+        ----------
+        tallydata : pd.DataFrame or dict of pd.DataFrame
+            organized tally data.
+        totalbin : pd.DataFrame or dict of pd.DataFrame
+            organized tally data (only total bins).
+        stat_checks : dict, optional
+            results of the statistical checks. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.tallydata = tallydata
+        self.totalbin = totalbin
+        self.stat_checks = stat_checks
+
+    @classmethod
+    def from_output(cls, output):
+        """
+        Build the compact representation of a full output object
+
+        Parameters
+        ----------
+        output : MCNPoutput or OpenMCOutput
+            parsed output.
+
+        Returns
+        -------
+        ParsedOutput
+            compact version of the output.
+
+        """
+        return cls(output.tallydata, output.totalbin, output.stat_checks)
+
+
+class ResultCube:
+    def __init__(self, data, present, cases, bins, libraries):
+        """
+        Dense representation of the results of different libraries. The data
+        is stored in a single array with axes (case, bin, library,
+        value/error) where cases are e.g. zaids or materials and bins are the
+        compared quantities (e.g. tally bins).
+
+        Parameters
+        ----------
+        data : np.ndarray
+            array of shape (cases, bins, libraries, 2). Missing results are
+            set to NaN.
+        present : np.ndarray
+            boolean array of shape (cases, libraries), True if the case is
+            available for the library.
+        cases : pd.Index
+            labels of the cases axis.
+        bins : pd.Index
+            labels of the bins axis.
+        libraries : list[str]
+            labels of the library axis.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.data = data
+        self.present = present
+        self.cases = cases
+        self.bins = bins
+        self.libraries = list(libraries)
+
+    @classmethod
+    def from_dataframes(cls, values, errors):
+        """
+        Build the cube from the results DataFrames of the different
+        libraries. The cases are the union of all libraries cases, in order
+        of appearance, while the bins are the ones of the first library.
+
+        Parameters
+        ----------
+        values : dict[str, pd.DataFrame]
+            results of each library. Rows identify the cases and columns the
+            bins.
+        errors : dict[str, pd.DataFrame]
+            relative errors associated to the results of each library.
+
+        Returns
+        -------
+        ResultCube
+            aligned results.
+
+        """
+        libraries = list(values.keys())
+        cases = values[libraries[0]].index
+        for lib in libraries[1:]:
+            new_cases = values[lib].index.difference(cases, sort=False)
+            cases = cases.append(new_cases)
+        bins = values[libraries[0]].columns
+
+        data = np.full((len(cases), len(bins), len(libraries), 2), np.nan)
+        present = np.zeros((len(cases), len(libraries)), dtype=bool)
+        for j, lib in enumerate(libraries):
+            present[:, j] = cases.isin(values[lib].index)
+            for k, dfs in enumerate([values, errors]):
+                df = dfs[lib].reindex(index=cases, columns=bins)
+                data[:, :, j, k] = df.to_numpy(dtype=float)
+
+        return cls(data, present, cases, bins, libraries)
+
+    @property
+    def values(self):
+        """Results, array of shape (cases, bins, libraries)"""
+        return self.data[..., 0]
+
+    @property
+    def errors(self):
+        """Relative errors, array of shape (cases, bins, libraries)"""
+        return self.data[..., 1]
+
+    def absolute_difference(self, reflib):
+        """
+        Absolute difference of all libraries with respect to the reference
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+
+        Returns
+        -------
+        np.ndarray
+            array of shape (cases, bins, libraries).
+
+        """
+        ref = self.libraries.index(reflib)
+        return self.values[:, :, [ref]] - self.values
+
+    def relative_difference(self, reflib):
+        """
+        Relative difference of all libraries with respect to the reference
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+
+        Returns
+        -------
+        np.ndarray
+            array of shape (cases, bins, libraries).
+
+        """
+        ref = self.libraries.index(reflib)
+        # !!! True divide warnings are suppressed !!!
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.absolute_difference(reflib) / self.values[:, :, [ref]]
+
+    def sigma_distance(self, reflib, sigma_ref=True):
+        """
+        Distance in standard deviations of all libraries from the reference
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+        sigma_ref : bool, optional
+            if True the reference errors are used, otherwise each library
+            uses its own. The default is True.
+
+        Returns
+        -------
+        np.ndarray
+            array of shape (cases, bins, libraries).
+
+        """
+        if sigma_ref:
+            ref = self.libraries.index(reflib)
+            errors = self.errors[:, :, [ref]]
+        else:
+            errors = self.errors
+        # !!! True divide warnings are suppressed !!!
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.absolute_difference(reflib) / errors
+
+    def shared(self, reflib):
+        """
+        Cases shared by each library with the reference
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+
+        Returns
+        -------
+        np.ndarray
+            boolean array of shape (cases, libraries).
+
+        """
+        ref = self.libraries.index(reflib)
+        return self.present & self.present[:, [ref]]
+
+    def to_dataframe(self, array, lib, reflib):
+        """
+        Extract the slice of a library from a (cases, bins, libraries) array,
+        keeping only the cases shared with the reference.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            array of shape (cases, bins, libraries).
+        lib : str
+            library to extract.
+        reflib : str
+            reference library.
+
+        Returns
+        -------
+        pd.DataFrame
+            cases as index and bins as columns.
+
+        """
+        j = self.libraries.index(lib)
+        mask = self.shared(reflib)[:, j]
+        return pd.DataFrame(
+            array[mask, :, j], index=self.cases[mask], columns=self.bins
+        )
+
+    def compare(self, reflib, sigma_ref=True):
+        """
+        Compare all target libraries with the reference one.
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+        sigma_ref : bool, optional
+            see sigma_distance. The default is True.
+
+        Returns
+        -------
+        comparisons : dict[str, tuple[pd.DataFrame]]
+            for each target library (relative difference, absolute
+            difference, distance in std. dev.).
+
+        """
+        arrays = [
+            self.relative_difference(reflib),
+            self.absolute_difference(reflib),
+            self.sigma_distance(reflib, sigma_ref=sigma_ref),
+        ]
+        comparisons = {}
+        for lib in self.libraries:
+            if lib != reflib:
+                comparisons[lib] = tuple(
+                    self.to_dataframe(array, lib, reflib) for array in arrays
+                )
+
+        return comparisons
+
+    def summary(self, reflib, limits=(0.05, 0.1, 0.2)):
+        """
+        Fraction of the cases of each bin that falls in the different ranges
+        of relative difference with respect to the reference.
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+        limits : tuple, optional
+            limits of the ranges. The default is (0.05, 0.1, 0.2).
+
+        Returns
+        -------
+        summaries : dict[str, pd.DataFrame]
+            for each target library, ranges as index and bins as columns.
+
+        """
+        reldiff = np.abs(self.relative_difference(reflib))
+        shared = self.shared(reflib)[:, np.newaxis, :]
+        reldiff = np.where(shared, reldiff, np.nan)
+        valid = ~np.isnan(reldiff)
+        n_cases = valid.sum(axis=0)
+        # cumulative counts below each limit, shape (bins, libraries, limits)
+        below = (reldiff[..., np.newaxis] < np.array(limits)).sum(axis=0)
+        below = np.concatenate([np.zeros_like(below[..., :1]), below], axis=-1)
+        counts = list(np.moveaxis(np.diff(below, axis=-1), -1, 0))
+        counts.append((reldiff > limits[-1]).sum(axis=0))
+
+        labels = []
+        old_lim = 0
+        for lim in limits:
+            labels.append(
+                str(old_lim * 100) + " < " + "% of cells" + " < " + str(lim * 100)
+            )
+            old_lim = lim
+        labels.append("% of cells > " + str(limits[-1] * 100))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fractions = np.stack(counts) / n_cases
+
+        summaries = {}
+        for j, lib in enumerate(self.libraries):
+            if lib != reflib:
+                summary = pd.DataFrame(
+                    fractions[:, :, j],
+                    index=pd.Index(labels, name="Range"),
+                    columns=self.bins,
+                )
+                summaries[lib] = summary
+
+        return summaries
+
+    def ranking(self, reflib):
+        """
+        Rank the target libraries by their mean absolute relative difference
+        from the reference (only shared cases and finite values).
+
+        Parameters
+        ----------
+        reflib : str
+            reference library.
+
+        Returns
+        -------
+        pd.Series
+            mean absolute relative difference of each target, ascending.
+
+        """
+        reldiff = np.abs(self.relative_difference(reflib))
+        valid = np.isfinite(reldiff) & self.shared(reflib)[:, np.newaxis, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(valid, reldiff, 0).sum(axis=(0, 1)) / valid.sum(
+                axis=(0, 1)
+            )
+        ranking = pd.Series(means, index=self.libraries).drop(reflib)
+
+        return ranking.sort_values()
+
+
 class MCNPoutput:
     def __init__(self, mctal_file, output_file, meshtal_file=None):
         """
@@ -1651,6 +2225,98 @@ class ExcelOutputSheet:
         self.app.quit()
 
 
+def parse_outputs(parser, arguments, workers=1):
+    """
+    Apply a parser to a list of run folders, fanning the work out to a pool
+    of processes when more than one worker is requested. The results are
+    always returned in the same order of the arguments.
+
+    Parameters
+    ----------
+    parser : function
+        module level (i.e. picklable) function performing the parsing of a
+        single folder.
+    arguments : list of tuple
+        positional arguments to be passed to the parser for each folder.
+    workers : int, optional
+        number of processes to be used. The default is 1, meaning that the
+        parsing is performed in the current process.
+
+    Returns
+    -------
+    list
+        parser results, one per item of arguments.
+
+    """
+    arguments = list(arguments)
+    if workers is None or workers <= 1 or len(arguments) <= 1:
+        return [parser(*args) for args in arguments]
+
+    workers = min(workers, len(arguments))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map preserves the ordering of the submitted arguments
+        results = list(executor.map(parser, *zip(*arguments)))
+
+    return results
+
+
+def compare_libraries(values, errors, reflib, sigma_ref=True):
+    """
+    Compare the results of a reference library against all the target
+    libraries at once. All libraries are aligned in a ResultCube and the
+    differences are computed on the stacked arrays.
+
+    Parameters
+    ----------
+    values : dict[str, pd.DataFrame]
+        results of each library. Rows identify the cases (e.g. zaids) and
+        columns the compared quantities.
+    errors : dict[str, pd.DataFrame]
+        relative errors associated to the results of each library.
+    reflib : str
+        reference library, all the others are treated as targets.
+    sigma_ref : bool, optional
+        if True the distance in standard deviations is computed using the
+        reference errors, otherwise the target ones are used. The default is
+        True.
+
+    Returns
+    -------
+    comparisons : dict[str, tuple[pd.DataFrame]]
+        for each target library (relative difference, absolute difference,
+        distance in std. dev.). Only the cases shared with the reference are
+        included.
+
+    """
+    cube = ResultCube.from_dataframes(values, errors)
+    return cube.compare(reflib, sigma_ref=sigma_ref)
+
+
+def get_run_signature(results_path):
+    """
+    Get a signature of the outputs contained in a run folder that allows
+    to detect if they have been modified.
+
+    Parameters
+    ----------
+    results_path : path like object
+        path to the run folder.
+
+    Returns
+    -------
+    tuple
+        (name, modification time [ns], size) of each file in the folder.
+
+    """
+    signature = []
+    for entry in os.scandir(results_path):
+        if entry.is_file():
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+
+    return tuple(sorted(signature))
+
+
 def fatal_exception(message=None):
     """
     Use this function to exit with a code error from a handled exception
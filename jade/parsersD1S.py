@@ -61,7 +61,7 @@ class IrradiationFile:
 
         """
         self.nsc = nsc
-        self.irr_schedules = irr_schedules
+        self.irr_schedules = irr_schedules  # also builds the daughter index
         self.header = header
         self.formatting = formatting
 
@@ -80,6 +80,21 @@ class IrradiationFile:
         self.irrformat = head
         self.name = name
 
+    @property
+    def irr_schedules(self):
+        """list of Irradiation objects. The list should be replaced and not
+        modified in place, in order to keep the daughter index updated."""
+        return self._irr_schedules
+
+    @irr_schedules.setter
+    def irr_schedules(self, irr_schedules):
+        self._irr_schedules = irr_schedules
+        # index the schedules by daughter, the first occurrence is kept
+        index = {}
+        for i, irradiation in enumerate(irr_schedules):
+            index.setdefault(irradiation.daughter, i)
+        self._daughter_index = index
+
     def get_daughters(self):
         """
         Get a list of all daughters among all irradiation files
@@ -113,11 +128,45 @@ class IrradiationFile:
             If no irradiation is found returns None.
 
         """
-        for irradiation in self.irr_schedules:
-            if daughter == irradiation.daughter:
-                return irradiation
+        try:
+            return self._irr_schedules[self._daughter_index[daughter]]
+        except KeyError:
+            return None
+
+    def select(self, daughters):
+        """
+        Get a new irradiation file containing only the schedules of the
+        selected daughters. The original order of the schedules is kept.
 
-        return None
+        Parameters
+        ----------
+        daughters : Iterable[str]
+            daughters to be selected (e.g. 24051).
+
+        Returns
+        -------
+        IrradiationFile
+            new irradiation file with the selected schedules.
+        missing : list[str]
+            daughters for which no irradiation schedule was found.
+
+        """
+        positions = []
+        missing = []
+        for daughter in daughters:
+            try:
+                positions.append(self._daughter_index[daughter])
+            except KeyError:
+                missing.append(daughter)
+        irr_schedules = [self._irr_schedules[i] for i in sorted(set(positions))]
+        newfile = IrradiationFile(
+            self.nsc,
+            irr_schedules,
+            header=self.header,
+            formatting=self.formatting,
+            name=self.name,
+        )
+        return newfile, missing
 
     @classmethod
     def from_text(cls, filepath):
@@ -21,8 +21,13 @@
 # You should have received a copy of the GNU General Public License
 # along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 
+import copy
+import hashlib
 import math
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
 
 import matplotlib.pyplot as plt
 
@@ -44,6 +49,11 @@ np.seterr(
     divide="ignore", invalid="ignore"
 )  # Suppressing divide by zero error in plots
 DEFAULT_EXTENSION = ".png"
+# Draft mode: resolution of the images
+DRAFT_DPI = 40
+# Version of the plots appearance, to be increased each time the style of
+# the plots is modified in order to invalidate the cached images
+PLOT_STYLE_VERSION = 1
 
 SMALL_SIZE = 22
 MEDIUM_SIZE = 26
@@ -154,6 +164,9 @@ class Plotter:
         group_num=None,
         add_labels=None,
         mult_factors=None,
+        draft=False,
+        cache=None,
+        max_bins=None,
     ):
         """
         Object Handling plots
@@ -180,6 +193,18 @@ class Plotter:
             name of the benchmark
         ext : str
             extension of the image to save. Default is '.png'
+        draft : bool
+            if True, the plot is rendered at low resolution without
+            minor decorations. Default is False.
+        cache : PlotCache
+            cache of the rendered images. If an image of an identical plot
+            is found there, it is used instead of rendering the plot again.
+            Default is None.
+        max_bins : int
+            if provided, the spectra of binned graphs with more bins are
+            shown with adjacent bins aggregated, so that each curve has at
+            most max_bins bins. The plot data is not modified. Default is
+            None.
 
         Returns
         -------
@@ -189,6 +214,12 @@ class Plotter:
         self.data = data
         self.title = title
         self.outpath = os.path.join(outpath, outname + ext)
+        self.ext = ext
+        # If True images are saved in memory instead of in outpath
+        self.in_memory = False
+        self.draft = draft
+        self.cache = cache
+        self.max_bins = max_bins
         self.xlabel = xlabel
         self.unit = unit
         self.quantity = quantity
@@ -213,7 +244,7 @@ class Plotter:
             "#dede00",
         ] * 50
 
-    def plot(self, plot_type):
+    def plot(self, plot_type, in_memory=False):
         """
         Function to be called to actually perform the plot
 
@@ -222,7 +253,11 @@ class Plotter:
         plot_type : str
             plot type. The current available ones are ['Binned graph',
             'Ratio graph', 'Experimental points',
-            'Discreet Experimental points', 'Grouped bars', 'Waves'].
+            'Discreet Experimental points', 'Grouped bars', 'Waves',
+            'Contribution'].
+        in_memory : bool, optional
+            if True the image is not saved to file but returned as an
+            in-memory buffer. The default is False.
 
         Raises
         ------
@@ -231,13 +266,20 @@ class Plotter:
 
         Returns
         -------
-        outp : path like object
-            path to the saved image.
+        outp : path like object or io.BytesIO
+            path to the saved image or buffer containing it.
 
         """
+        if self.cache is not None:
+            key = self.cache.get_key(self, plot_type)
+            outp = self.cache.load(key, self.outpath, in_memory)
+            if outp is not None:
+                return outp
+
+        self.in_memory = in_memory
         # --- Binned Plot ---
         if plot_type == "Binned graph":
-            outp = self._binned_plot()
+            outp = _rebinned(self)._binned_plot()
 
         # --- Ratio Plot ---
         elif plot_type == "Ratio graph":
@@ -304,10 +346,17 @@ class Plotter:
         elif plot_type == "Waves":
             outp = self._waves()
 
+        # --- Contributions plot (legend outside the axes) ---
+        elif plot_type == "Contribution":
+            outp = self._contribution(legend_outside=True)
+
         # --- Deafault ---
         else:
             raise ValueError(plot_type + " is not an admissible plot type")
 
+        if self.cache is not None:
+            self.cache.store(key, outp)
+
         return outp
 
     def _waves(self, upperlimit=1.5, lowerlimit=0.5):
@@ -1206,67 +1255,18 @@ class Plotter:
         title = self.title
         colors = self.colors
         ylabel = self.quantity + " [" + self.unit + "]"
-        if len(data) > 1:
-            nrows = 3
-        else:
-            nrows = 2
 
-        # Set properties for the plot spacing
-        if len(data) > 1:
-            gridspec_kw = {"height_ratios": [4, 1, 1], "hspace": 0.13}
-        else:
-            gridspec_kw = {"height_ratios": [4, 1], "hspace": 0.13}
         # Initiate plot
-        fig, axes = plt.subplots(
-            nrows=nrows,
-            ncols=1,
-            sharex=True,
-            figsize=(18, 13.5),
-            gridspec_kw=gridspec_kw,
-        )
-
-        # --- Main plot ---
+        fig, axes = _binned_layout(len(data) > 1, draft=self.draft)
         ax1 = axes[0]
         ax1.set_title(title)
-        # Labels
         ax1.set_ylabel(ylabel)
-
-        # Ticks
-        subs = (0.2, 0.4, 0.6, 0.8)
-        ax1.set_xscale("log")
-
-        ax1.set_yscale("log")
-        ax1.xaxis.set_major_locator(LogLocator(base=10, numticks=15))
-        ax1.yaxis.set_major_locator(LogLocator(base=10, numticks=15))
-        ax1.xaxis.set_minor_locator(LogLocator(base=10.0, subs=subs, numticks=12))
-        ax1.yaxis.set_minor_locator(LogLocator(base=10.0, subs=subs, numticks=12))
-
-        # --- Error Plot ---
         ax2 = axes[1]
-        ax2.axhline(y=10, linestyle="--", color="black")
-        ax2.set_ylabel("1σ [%]", labelpad=35)
-        ax2.set_yscale("log")
-        ax2.set_ylim(bottom=1, top=100)
-        ax2.yaxis.set_major_locator(LogLocator(base=10, numticks=15))
-        ax2.yaxis.set_minor_locator(LogLocator(base=10.0, subs=subs, numticks=12))
-
-        # --- Comparison Plot ---
         if len(data) > 1:
             ax3 = axes[2]
-            ax3.axhline(y=1, linestyle="--", color="black")
-            ax3.set_ylabel("$T_i/R$", labelpad=30)
-            ax3.yaxis.set_major_locator(MultipleLocator(0.5))
-            ax3.yaxis.set_minor_locator(AutoMinorLocator(5))
-            ax3.axhline(y=2, linestyle="--", color="red", linewidth=0.5)
-            ax3.axhline(y=0.5, linestyle="--", color="red", linewidth=0.5)
-            ax3.set_ylim(bottom=0.3, top=2.2)
 
         # Generate X axis for bin properties
-        oldX = np.array([0] + list(data[0]["x"]))
-        base = np.log(oldX[:-1])
-        shifted = np.log(oldX[1:])
-        newX = np.exp((base + shifted) / 2)
-        newX[0] = (oldX[1] + oldX[0]) / 2
+        newX = _get_bin_centers(data[0]["x"])
         # --- Plot Data ---
         for idx, dic_data in enumerate(data):
             x = np.array([0] + list(dic_data["x"]))
@@ -1288,14 +1288,15 @@ class Plotter:
             else:
                 tag = "R: "
             ax1.step(x, y, label=tag + dic_data["ylabel"], color=colors[idx])
-            ax1.errorbar(
-                newX,
-                y[1:],
-                linewidth=0,
-                yerr=err_multi,
-                elinewidth=0.5,
-                color=colors[idx],
-            )
+            if not self.draft:
+                ax1.errorbar(
+                    newX,
+                    y[1:],
+                    linewidth=0,
+                    yerr=err_multi,
+                    elinewidth=0.5,
+                    color=colors[idx],
+                )
 
             # Error Plot
             ax2.plot(
@@ -1326,44 +1327,10 @@ class Plotter:
                         c=colors[idx + 1],
                     )
 
-                # Build ax3 legend
-                leg = [
-                    Line2D(
-                        [0],
-                        [0],
-                        marker=CARETUPBASE,
-                        color="black",
-                        label="> 2",
-                        markerfacecolor="black",
-                        markersize=8,
-                        lw=0,
-                    ),
-                    Line2D(
-                        [0],
-                        [0],
-                        marker=CARETDOWNBASE,
-                        color="black",
-                        label="< 0.5",
-                        markerfacecolor="black",
-                        markersize=8,
-                        lw=0,
-                    ),
-                ]
-                ax3.legend(handles=leg, loc="best")
-
         # Final operations
         ax1.legend(loc="best")
         axes[-1].set_xlabel(self.xlabel)
 
-        # --- Common Features ---
-        for ax in axes:
-            # Grid control
-            ax.grid()
-            ax.grid("True", which="minor", linewidth=0.25)
-            # Ticks
-            ax.tick_params(which="major", width=1.00, length=5)
-            ax.tick_params(which="minor", width=0.75, length=2.50)
-
         return self._save()
 
     def _contribution(self, yscale="linear", legend_outside="False"):
@@ -1413,10 +1380,650 @@ class Plotter:
         return self._save()
 
     def _save(self):
-        plt.savefig(self.outpath, bbox_inches="tight")
+        if self.draft:
+            dpi = DRAFT_DPI
+        else:
+            dpi = "figure"
+        if self.in_memory:
+            outp = BytesIO()
+            plt.savefig(outp, format=self.ext[1:], bbox_inches="tight", dpi=dpi)
+            outp.seek(0)
+        else:
+            plt.savefig(self.outpath, bbox_inches="tight", dpi=dpi)
+            outp = self.outpath
         plt.close()
         plt.clf()
-        return self.outpath
+        return outp
+
+
+# ============================================================================
+#                   Batch plotting
+# ============================================================================
+class BatchPlotter:
+    # Plot types whose figure can be reused among plots
+    BATCH_TYPES = ["Binned graph"]
+
+    def __init__(self):
+        """
+        Plot many graphs with the same layout. The figure of each layout is
+        built only once, then only the data, title and labels of its artists
+        are updated before saving a new image. Plot types that do not
+        support batch plotting are delegated to Plotter.plot.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Reused figures (plot type, layout, draft) -> _BinnedFigure
+        self._figures = {}
+
+    def plot(self, plot, plot_type, in_memory=False):
+        """
+        Perform a plot reusing, if possible, a figure of a previous one.
+
+        Parameters
+        ----------
+        plot : Plotter
+            plot to be performed.
+        plot_type : str
+            plot type, see Plotter.plot.
+        in_memory : bool, optional
+            if True the image is returned as an in-memory buffer. The
+            default is False.
+
+        Returns
+        -------
+        outp : path like object or io.BytesIO
+            path to the saved image or buffer containing it.
+
+        """
+        if plot_type not in self.BATCH_TYPES:
+            return plot.plot(plot_type, in_memory=in_memory)
+
+        if plot.cache is not None:
+            key = plot.cache.get_key(plot, plot_type)
+            outp = plot.cache.load(key, plot.outpath, in_memory)
+            if outp is not None:
+                return outp
+
+        plot = _rebinned(plot)
+        layout = (plot_type, len(plot.data) > 1, plot.draft)
+        try:
+            figure = self._figures[layout]
+        except KeyError:
+            figure = _BinnedFigure(len(plot.data) > 1, draft=plot.draft)
+            self._figures[layout] = figure
+
+        outp = figure.plot(plot, in_memory=in_memory)
+        if plot.cache is not None:
+            plot.cache.store(key, outp)
+
+        return outp
+
+    def close(self):
+        """
+        Close all the reused figures releasing their memory
+        """
+        for figure in self._figures.values():
+            plt.close(figure.fig)
+        self._figures = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _BinnedFigure:
+    def __init__(self, comparison, draft=False):
+        """
+        Reusable figure of a binned graph (see Plotter._binned_plot). The
+        artists of each library are created the first time they are needed
+        and then updated, or hidden if the library is not present in a plot.
+
+        Parameters
+        ----------
+        comparison : bool
+            if True the figure includes the comparison subplot.
+        draft : bool, optional
+            if True the figure is a draft one (see Plotter). The default is
+            False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.fig, self.axes = _binned_layout(comparison, draft=draft)
+        self.comparison = comparison
+        self.draft = draft
+        # Artists of each library
+        self.artists = []
+
+    def _get_artists(self, idx, color):
+        while len(self.artists) <= idx:
+            ax1 = self.axes[0]
+            ax2 = self.axes[1]
+            artists = {}
+            (artists["step"],) = ax1.step([], [], color=color)
+            # Errorbars are vertical segments, updated directly. They are
+            # not drawn in draft mode
+            if not self.draft:
+                artists["errorbar"] = ax1.vlines([], [], [], linewidth=0.5, color=color)
+            (artists["error"],) = ax2.plot([], [], "o", markersize=2, color=color)
+            if self.comparison:
+                ax3 = self.axes[2]
+                (artists["ratio"],) = ax3.plot([], [], "o", markersize=2, color=color)
+                artists["upper"] = ax3.scatter(
+                    [], [], marker=CARETUPBASE, s=50, c=color
+                )
+                artists["lower"] = ax3.scatter(
+                    [], [], marker=CARETDOWNBASE, s=50, c=color
+                )
+            self.artists.append(artists)
+
+        return self.artists[idx]
+
+    def plot(self, plot, in_memory=False):
+        """
+        Update the figure with the data of a plot and save it.
+
+        Parameters
+        ----------
+        plot : Plotter
+            plot to be performed.
+        in_memory : bool, optional
+            if True the image is returned as an in-memory buffer. The
+            default is False.
+
+        Returns
+        -------
+        outp : str/path or io.BytesIO
+            path to the saved image or buffer containing it.
+
+        """
+        data = plot.data
+        ax1 = self.axes[0]
+        ax1.set_title(plot.title)
+        ax1.set_ylabel(plot.quantity + " [" + plot.unit + "]")
+        self.axes[-1].set_xlabel(plot.xlabel)
+
+        newX = _get_bin_centers(data[0]["x"])
+        errorbar_points = []
+        for idx, dic_data in enumerate(data):
+            artists = self._get_artists(idx, plot.colors[idx])
+            x = np.array([0] + list(dic_data["x"]))
+            y = np.array([0] + list(dic_data["y"]))
+            err_multi = y[1:] * np.abs(np.array(dic_data["err"]))
+
+            # Main plot
+            if idx > 0:
+                tag = "T" + str(idx) + ": "
+            else:
+                tag = "R: "
+            artists["step"].set_data(x, y)
+            artists["step"].set_label(tag + dic_data["ylabel"])
+            if not self.draft:
+                segments = np.stack(
+                    [
+                        np.column_stack([newX, y[1:] - err_multi]),
+                        np.column_stack([newX, y[1:] + err_multi]),
+                    ],
+                    axis=1,
+                )
+                artists["errorbar"].set_segments(segments)
+                errorbar_points.append(segments.reshape(-1, 2))
+
+            # Error Plot
+            artists["error"].set_data(newX, np.array(dic_data["err"]) * 100)
+
+            # Comparison
+            if self.comparison and idx > 0:
+                ratio = np.array(dic_data["y"]) / np.array(data[0]["y"])
+                norm, upper, lower = _get_limits(0.5, 2, ratio, newX)
+                artists["ratio"].set_data(norm[0], norm[1])
+                artists["upper"].set_offsets(np.column_stack(upper))
+                artists["lower"].set_offsets(np.column_stack(lower))
+
+            for artist in artists.values():
+                artist.set_visible(True)
+
+        # Hide the artists of libraries not present in this plot
+        for artists in self.artists[len(data) :]:
+            artists["step"].set_label("_nolegend_")
+            for artist in artists.values():
+                artist.set_visible(False)
+
+        # Rescale on the new data
+        for ax in self.axes:
+            ax.relim(visible_only=True)
+        # relim() does not account for the errorbars collections
+        if len(errorbar_points) > 0:
+            points = np.concatenate(errorbar_points)
+            valid = np.isfinite(points).all(axis=1) & (points[:, 1] > 0)
+            ax1.update_datalim(points[valid])
+        ax1.autoscale_view()
+        ax1.legend(loc="best")
+
+        if self.draft:
+            dpi = DRAFT_DPI
+        else:
+            dpi = "figure"
+        if in_memory:
+            outp = BytesIO()
+            self.fig.savefig(outp, format=plot.ext[1:], bbox_inches="tight", dpi=dpi)
+            outp.seek(0)
+        else:
+            self.fig.savefig(plot.outpath, bbox_inches="tight", dpi=dpi)
+            outp = plot.outpath
+
+        return outp
+
+
+# ============================================================================
+#                   Plots cache
+# ============================================================================
+class PlotCache:
+    def __init__(self, path, max_size):
+        """
+        Disk cache of rendered images. Images are identified by a hash of
+        all the inputs of the plot (data, labels, plot type and style
+        version), so that plots that did not change are not rendered again.
+        When the cache exceeds its maximum size the least recently used
+        images are removed.
+
+        Parameters
+        ----------
+        path : str/path
+            folder of the cache. It is created if it does not exist.
+        max_size : int
+            maximum size of the cache [bytes].
+
+        Returns
+        -------
+        None.
+
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_size = max_size
+        self._size = None  # computed only when needed
+
+    @staticmethod
+    def get_key(plot, plot_type):
+        """
+        Get the hash identifying the image of a plot
+
+        Parameters
+        ----------
+        plot : Plotter
+            plot to be identified.
+        plot_type : str
+            plot type, see Plotter.plot.
+
+        Returns
+        -------
+        str
+            key of the plot image.
+
+        """
+        hasher = hashlib.sha256()
+        inputs = [
+            PLOT_STYLE_VERSION,
+            plot_type,
+            plot.data,
+            plot.title,
+            plot.quantity,
+            plot.unit,
+            plot.xlabel,
+            plot.testname,
+            plot.group_num,
+            plot.add_labels,
+            plot.mult_factors,
+            plot.draft,
+            plot.max_bins,
+        ]
+        _update_hash(hasher, inputs)
+        return hasher.hexdigest() + plot.ext
+
+    def load(self, key, outpath, in_memory=False):
+        """
+        Recover a cached image
+
+        Parameters
+        ----------
+        key : str
+            key of the image.
+        outpath : str/path
+            where to copy the image if it is not requested in memory.
+        in_memory : bool, optional
+            if True the image is returned as an in-memory buffer. The
+            default is False.
+
+        Returns
+        -------
+        outp : str/path, io.BytesIO or None
+            path to the image or buffer containing it. None if the image is
+            not in the cache.
+
+        """
+        filepath = os.path.join(self.path, key)
+        try:
+            with open(filepath, "rb") as infile:
+                content = infile.read()
+            # Mark as recently used
+            os.utime(filepath)
+        except FileNotFoundError:
+            return None
+
+        if in_memory:
+            return BytesIO(content)
+
+        with open(outpath, "wb") as outfile:
+            outfile.write(content)
+        return outpath
+
+    def store(self, key, outp):
+        """
+        Add an image to the cache, removing the least recently used ones if
+        the maximum size is exceeded.
+
+        Parameters
+        ----------
+        key : str
+            key of the image.
+        outp : str/path or io.BytesIO
+            path to the image or buffer containing it.
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(outp, BytesIO):
+            content = outp.getvalue()
+        else:
+            with open(outp, "rb") as infile:
+                content = infile.read()
+
+        # Write and rename so that other processes never read partial files
+        filepath = os.path.join(self.path, key)
+        tmp_filepath = filepath + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_filepath, "wb") as outfile:
+            outfile.write(content)
+        os.replace(tmp_filepath, filepath)
+
+        if self._size is not None:
+            self._size += len(content)
+        if self._size is None or self._size > self.max_size:
+            # The estimate misses what other processes stored or removed
+            self._size = sum(entry[1] for entry in self._get_entries())
+            if self._size > self.max_size:
+                self.evict()
+
+    def _get_entries(self):
+        """
+        Get (last use time, size, path) of all the images in the cache,
+        files still being written (.tmp) are excluded
+        """
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """
+        Remove the least recently used images until the cache is filled
+        below 80% of its maximum size.
+
+        Returns
+        -------
+        None.
+
+        """
+        entries = sorted(self._get_entries())
+
+        size = sum(entry[1] for entry in entries)
+        for _, filesize, filepath in entries:
+            if size <= 0.8 * self.max_size:
+                break
+            try:
+                os.remove(filepath)
+            except FileNotFoundError:
+                pass
+            size -= filesize
+        self._size = size
+
+
+def _update_hash(hasher, obj):
+    """
+    Update a hash with any of the objects composing the plots inputs
+    (containers, arrays, pandas objects and scalars).
+    """
+    if isinstance(obj, dict):
+        hasher.update(b"{")
+        for key in sorted(obj, key=str):
+            _update_hash(hasher, key)
+            _update_hash(hasher, obj[key])
+        hasher.update(b"}")
+    elif isinstance(obj, pd.DataFrame):
+        _update_hash(hasher, list(obj.columns))
+        hasher.update(pd.util.hash_pandas_object(obj).values.tobytes())
+    elif isinstance(obj, (list, tuple, np.ndarray, pd.Series, pd.Index)):
+        try:
+            array = np.asarray(obj)
+        except ValueError:
+            # Nested sequences of different lengths
+            array = np.empty(0, dtype=object)
+        if array.dtype == object:
+            # Mixed content (e.g. list of arrays with different lengths)
+            hasher.update(b"[")
+            for item in obj:
+                _update_hash(hasher, item)
+            hasher.update(b"]")
+        else:
+            hasher.update(str(array.dtype).encode())
+            hasher.update(str(array.shape).encode())
+            hasher.update(np.ascontiguousarray(array).tobytes())
+    else:
+        hasher.update(repr(obj).encode())
+
+
+# ============================================================================
+#                   Plots rendering
+# ============================================================================
+# Figures reused by a worker process in batch mode
+_worker_batch = None
+
+
+def _render(plot, plot_type, batch=False, in_memory=False):
+    """
+    Render a single plot, defined at module level in order to be executed by
+    worker processes. Workers import this module, hence they also use the
+    non-interactive Agg backend. In batch mode each worker keeps reusing its
+    own figures until the pool is shut down.
+    """
+    global _worker_batch
+    if batch:
+        if _worker_batch is None:
+            _worker_batch = BatchPlotter()
+        return _worker_batch.plot(plot, plot_type, in_memory=in_memory)
+    return plot.plot(plot_type, in_memory=in_memory)
+
+
+class PlotRenderer:
+    def __init__(self, workers=1, batch=False):
+        """
+        Render Plotter objects. If more than one worker is requested, the
+        plots are rendered in a pool of processes and the results are
+        available as futures.
+
+        Parameters
+        ----------
+        workers : int, optional
+            number of rendering processes. The default is 1, meaning that
+            plots are rendered as soon as they are submitted.
+        batch : bool, optional
+            if True, figures are reused among plots with the same layout
+            (see BatchPlotter). The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.batch = batch
+        self.workers = workers
+        if workers is not None and workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+            self.batch_plotter = None
+        else:
+            self.executor = None
+            if batch:
+                self.batch_plotter = BatchPlotter()
+            else:
+                self.batch_plotter = None
+        # Images paths of the submitted plots
+        self._outpaths = set()
+
+    def submit(self, plot, plot_type, in_memory=False):
+        """
+        Submit a plot for rendering. Since images of rendered plots may not
+        have been used yet, a plot that would overwrite the image of a
+        previous one is saved with a different name.
+
+        Parameters
+        ----------
+        plot : Plotter
+            plot to be rendered.
+        plot_type : str
+            plot type, see Plotter.plot.
+        in_memory : bool, optional
+            if True the image is rendered in an in-memory buffer instead of
+            a file. The default is False.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            its result is the path to the saved image or the buffer
+            containing it.
+
+        """
+        if not in_memory:
+            if plot.outpath in self._outpaths:
+                plot = copy.copy(plot)
+                root, ext = os.path.splitext(plot.outpath)
+                plot.outpath = root + "_" + str(len(self._outpaths)) + ext
+            self._outpaths.add(plot.outpath)
+
+        if self.executor is None:
+            future = Future()
+            try:
+                if self.batch_plotter is None:
+                    outp = plot.plot(plot_type, in_memory=in_memory)
+                else:
+                    outp = self.batch_plotter.plot(plot, plot_type, in_memory=in_memory)
+                future.set_result(outp)
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = self.executor.submit(
+                _render, plot, plot_type, self.batch, in_memory
+            )
+
+        return future
+
+    def render(self, jobs, in_memory=False):
+        """
+        Render a list of plots
+
+        Parameters
+        ----------
+        jobs : list of tuple
+            (Plotter, plot type) to be rendered.
+        in_memory : bool, optional
+            if True the images are rendered in in-memory buffers. The
+            default is False.
+
+        Returns
+        -------
+        list
+            paths to the images (or buffers), in the same order of the jobs.
+
+        """
+        futures = [
+            self.submit(plot, plot_type, in_memory=in_memory)
+            for plot, plot_type in jobs
+        ]
+        return [future.result() for future in futures]
+
+    def stream(self, jobs, in_memory=False, window=None):
+        """
+        Render plots lazily, keeping only a limited number of them in flight.
+        Jobs are consumed as the rendered images are requested, so that the
+        images can be used (e.g. inserted in an atlas) and released one by
+        one instead of being all kept in memory.
+
+        Parameters
+        ----------
+        jobs : iterable of tuple
+            (key, Plotter, plot type) to be rendered. The key is any object
+            identifying the plot.
+        in_memory : bool, optional
+            if True the images are rendered in in-memory buffers. The
+            default is False.
+        window : int, optional
+            maximum number of plots submitted and not yet requested. The
+            default is None, meaning twice the number of workers.
+
+        Yields
+        ------
+        key : object
+            key of the job.
+        future : concurrent.futures.Future
+            its result is the path to the image or the buffer containing it.
+            Jobs are yielded in the same order they were given.
+
+        """
+        if window is None:
+            if self.executor is None:
+                window = 1
+            else:
+                window = 2 * self.workers
+        pending = deque()
+        for key, plot, plot_type in jobs:
+            pending.append((key, self.submit(plot, plot_type, in_memory=in_memory)))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while len(pending) > 0:
+            yield pending.popleft()
+
+    def close(self):
+        """
+        Wait for all the submitted plots and release the workers and the
+        reused figures
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.batch_plotter is not None:
+            self.batch_plotter.close()
+            self.batch_plotter = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 # ============================================================================
@@ -1459,6 +2066,201 @@ def _add_recs(ax, rec_data, height, y_origin=0):
         ax.add_patch(rectangle)
 
 
+def _binned_layout(comparison, draft=False):
+    """
+    Build the figure of a binned graph with all its static features (scales,
+    locators, reference lines and grids). Data, title and labels are left to
+    be added by the caller.
+
+    Parameters
+    ----------
+    comparison : bool
+        if True the ratio subplot among reference and target values is
+        added.
+    draft : bool, optional
+        if True minor ticks and grids are not drawn. The default is False.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+        figure of the plot.
+    axes : numpy.ndarray
+        axes of the main, error and (optionally) comparison plot.
+
+    """
+    # Set properties for the plot spacing
+    if comparison:
+        nrows = 3
+        gridspec_kw = {"height_ratios": [4, 1, 1], "hspace": 0.13}
+    else:
+        nrows = 2
+        gridspec_kw = {"height_ratios": [4, 1], "hspace": 0.13}
+    fig, axes = plt.subplots(
+        nrows=nrows,
+        ncols=1,
+        sharex=True,
+        figsize=(18, 13.5),
+        gridspec_kw=gridspec_kw,
+    )
+
+    # --- Main plot ---
+    ax1 = axes[0]
+    # Ticks
+    subs = (0.2, 0.4, 0.6, 0.8)
+    ax1.set_xscale("log")
+
+    ax1.set_yscale("log")
+    ax1.xaxis.set_major_locator(LogLocator(base=10, numticks=15))
+    ax1.yaxis.set_major_locator(LogLocator(base=10, numticks=15))
+    if not draft:
+        ax1.xaxis.set_minor_locator(LogLocator(base=10.0, subs=subs, numticks=12))
+        ax1.yaxis.set_minor_locator(LogLocator(base=10.0, subs=subs, numticks=12))
+
+    # --- Error Plot ---
+    ax2 = axes[1]
+    ax2.axhline(y=10, linestyle="--", color="black")
+    ax2.set_ylabel("1σ [%]", labelpad=35)
+    ax2.set_yscale("log")
+    ax2.set_ylim(bottom=1, top=100)
+    ax2.yaxis.set_major_locator(LogLocator(base=10, numticks=15))
+    if not draft:
+        ax2.yaxis.set_minor_locator(LogLocator(base=10.0, subs=subs, numticks=12))
+
+    # --- Comparison Plot ---
+    if comparison:
+        ax3 = axes[2]
+        ax3.axhline(y=1, linestyle="--", color="black")
+        ax3.set_ylabel("$T_i/R$", labelpad=30)
+        ax3.yaxis.set_major_locator(MultipleLocator(0.5))
+        ax3.yaxis.set_minor_locator(AutoMinorLocator(5))
+        ax3.axhline(y=2, linestyle="--", color="red", linewidth=0.5)
+        ax3.axhline(y=0.5, linestyle="--", color="red", linewidth=0.5)
+        ax3.set_ylim(bottom=0.3, top=2.2)
+
+        # Build ax3 legend
+        leg = [
+            Line2D(
+                [0],
+                [0],
+                marker=CARETUPBASE,
+                color="black",
+                label="> 2",
+                markerfacecolor="black",
+                markersize=8,
+                lw=0,
+            ),
+            Line2D(
+                [0],
+                [0],
+                marker=CARETDOWNBASE,
+                color="black",
+                label="< 0.5",
+                markerfacecolor="black",
+                markersize=8,
+                lw=0,
+            ),
+        ]
+        ax3.legend(handles=leg, loc="best")
+
+    # --- Common Features ---
+    for ax in axes:
+        # Grid control
+        ax.grid()
+        if draft:
+            ax.minorticks_off()
+        else:
+            ax.grid("True", which="minor", linewidth=0.25)
+        # Ticks
+        ax.tick_params(which="major", width=1.00, length=5)
+        ax.tick_params(which="minor", width=0.75, length=2.50)
+
+    return fig, axes
+
+
+def _rebinned(plot):
+    """
+    Get the plot to be rendered for a binned graph: if the plot has a maximum
+    number of bins, a copy of it with the dense spectra rebinned (see
+    _rebin) is returned, otherwise the plot itself.
+    """
+    if plot.max_bins is None:
+        return plot
+    plot = copy.copy(plot)
+    plot.data = _rebin(plot.data, plot.max_bins)
+    return plot
+
+
+def _rebin(data, max_bins):
+    """
+    Aggregate adjacent bins of very dense spectra, so that each curve has at
+    most max_bins bins. The value of an aggregated bin is the sum of the
+    values of its bins (i.e. the tally of the coarser bin) and its relative
+    error is obtained summing the absolute errors in quadrature.
+
+    Parameters
+    ----------
+    data : list
+        data of the plot, see Plotter. x are the upper boundaries of the
+        bins.
+    max_bins : int
+        maximum number of bins for each curve.
+
+    Returns
+    -------
+    list
+        new data of the plot, curves with less bins than max_bins are left
+        untouched.
+
+    """
+    newdata = []
+    for libdata in data:
+        nbins = len(libdata["x"])
+        values = np.asarray(libdata["y"], dtype=float)
+        if nbins <= max_bins or values.shape != (nbins,):
+            newdata.append(libdata)
+            continue
+
+        size = math.ceil(nbins / max_bins)
+        # first bin of each group
+        starts = np.arange(0, nbins, size)
+        ends = np.minimum(starts + size, nbins) - 1
+        libdata = libdata.copy()
+        libdata["x"] = np.asarray(libdata["x"])[ends]
+        summed = np.add.reduceat(values, starts)
+        errors = np.asarray(libdata["err"], dtype=float)
+        if errors.shape == (nbins,):
+            abs_err2 = np.add.reduceat((values * errors) ** 2, starts)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                libdata["err"] = np.sqrt(abs_err2) / np.abs(summed)
+        libdata["y"] = summed
+        newdata.append(libdata)
+
+    return newdata
+
+
+def _get_bin_centers(x):
+    """
+    Get the (logarithmic) centers of the bins given their upper boundaries.
+
+    Parameters
+    ----------
+    x : list/np.array
+        upper boundaries of the bins.
+
+    Returns
+    -------
+    np.array
+        centers of the bins.
+
+    """
+    oldX = np.array([0] + list(x))
+    base = np.log(oldX[:-1])
+    shifted = np.log(oldX[1:])
+    newX = np.exp((base + shifted) / 2)
+    newX[0] = (oldX[1] + oldX[0]) / 2
+    return newX
+
+
 def _get_limits(lowerlimit, upperlimit, ydata, xdata):
     """
     Given an X, Y dataset and bounding y limits it returns three datasets
@@ -22,13 +22,16 @@ You should have received a copy of the GNU General Public License
 along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 """
 import datetime
+import os
 
 import jade.expoutput as expo
 import jade.output as bencho
 import jade.sphereoutput as spho
 
 
-def compareBenchmark(session, lib_input: str, code: str, testnames: list , exp=False) -> None:
+def compareBenchmark(
+    session, lib_input: str, code: str, testnames: list, exp=False, force=False
+) -> None:
     """Compare benchmark results and perform post-processing.
 
     Parameters
@@ -39,6 +42,8 @@ def compareBenchmark(session, lib_input: str, code: str, testnames: list , exp=F
         Data library
     testname : str
         Named of the test to be compared and post-processed
+    force : bool
+        if True all the outputs are rebuilt, even if up to date
     """
 
     #print("\n Comparing " + testname + ":" + "    " + str(datetime.datetime.now()))
@@ -64,7 +69,9 @@ def compareBenchmark(session, lib_input: str, code: str, testnames: list , exp=F
         # get the correct output object
         out = _get_output("compare", code, testname, lib, session)
         if out:
-            out.compare()
+            # only the stale artifacts are rebuilt
+            out.update("compare", force=force)
+            session.state.register(os.path.dirname(out.excel_path))
         log.adjourn(
             testname
             + " benchmark post-processing completed"
@@ -73,7 +80,9 @@ def compareBenchmark(session, lib_input: str, code: str, testnames: list , exp=F
         )
 
 
-def postprocessBenchmark(session, lib: str, code: str, testnames: list) -> None:
+def postprocessBenchmark(
+    session, lib: str, code: str, testnames: list, force=False
+) -> None:
     """Perform post-processing for specific benchmarks where specified.
 
     Parameters
@@ -82,6 +91,8 @@ def postprocessBenchmark(session, lib: str, code: str, testnames: list) -> None:
         JADE session
     lib : str
         Data library
+    force : bool
+        if True all the outputs are rebuilt, even if up to date
     """
 
     # Get the settings for the tests
@@ -104,7 +115,9 @@ def postprocessBenchmark(session, lib: str, code: str, testnames: list) -> None:
         # get the correct output object
         out = _get_output("pp", code, testname, lib, session)
         if out:
-            out.single_postprocess()
+            # only the stale artifacts are rebuilt
+            out.update("pp", force=force)
+            session.state.register(os.path.dirname(out.excel_path))
         log.adjourn(
             testname
             + " benchmark post-processing completed"
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+@author: JADE Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+
+Columnar store of the raw data produced by the post-processing. Each dataset
+is a folder partitioned in the hive style (e.g. 'Zaid=1001/part-0.parquet')
+with a JSON metadata file listing the partitions, so that a subset of them
+can be read without touching the others. Parquet files are used if pyarrow
+is installed, otherwise partitions are stored as pickled DataFrames.
+"""
+import json
+import os
+import shutil
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    DEFAULT_FORMAT = "parquet"
+except ImportError:
+    DEFAULT_FORMAT = "pickle"
+
+METADATA = "_metadata.json"
+EXTENSIONS = {"parquet": ".parquet", "pickle": ".pkl"}
+
+
+def get_dataset_path(raw_path, lib, testname, code):
+    """
+    Get the path of the raw data dataset of a (library, benchmark, code)
+
+    Parameters
+    ----------
+    raw_path : path like object
+        Raw_Data folder of the post-processing.
+    lib : str
+        library suffix.
+    testname : str
+        name of the benchmark.
+    code : str
+        transport code.
+
+    Returns
+    -------
+    str
+        path to the dataset folder.
+
+    """
+    return os.path.join(raw_path, "{}_{}_{}".format(testname, lib, code))
+
+
+def write_dataset(path, frames, partition_cols, attrs=None, fmt=None):
+    """
+    Write a dataset, any previous content of the folder is removed.
+
+    Parameters
+    ----------
+    path : path like object
+        dataset folder.
+    frames : dict
+        DataFrames to be stored, keys are the values of the partition columns
+        (tuples if more than one partition column is used). The index of the
+        DataFrames is not stored.
+    partition_cols : list of str
+        names of the partition columns.
+    attrs : dict, optional
+        JSON serializable data stored with the dataset (e.g. signatures of
+        the runs or tallies titles). The default is None.
+    fmt : str, optional
+        'parquet' or 'pickle'. The default is None, meaning parquet if
+        pyarrow is available.
+
+    Returns
+    -------
+    None.
+
+    """
+    if fmt is None:
+        fmt = DEFAULT_FORMAT
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+    partitions = []
+    for key, df in frames.items():
+        if len(partition_cols) == 1:
+            key = (key,)
+        key = [_to_json(val) for val in key]
+        folder = os.path.join(
+            *[
+                "{}={}".format(col, quote(str(val), safe=" -_.+"))
+                for col, val in zip(partition_cols, key)
+            ]
+        )
+        os.makedirs(os.path.join(path, folder), exist_ok=True)
+        file = os.path.join(folder, "part-0" + EXTENSIONS[fmt])
+
+        df = df.reset_index(drop=True)
+        df.columns = [str(col) for col in df.columns]
+        mixed = []
+        if fmt == "parquet":
+            df, mixed = _encode_mixed(df)
+            df.to_parquet(os.path.join(path, file), index=False)
+        else:
+            df.to_pickle(os.path.join(path, file))
+        partitions.append({"key": key, "file": file, "mixed": mixed})
+
+    metadata = {
+        "format": fmt,
+        "partition_cols": list(partition_cols),
+        "partitions": partitions,
+        "attrs": attrs if attrs is not None else {},
+    }
+    with open(os.path.join(path, METADATA), "w") as outfile:
+        json.dump(metadata, outfile, default=_to_json)
+
+
+def read_metadata(path):
+    """
+    Read the metadata of a dataset
+
+    Parameters
+    ----------
+    path : path like object
+        dataset folder.
+
+    Returns
+    -------
+    dict
+        metadata of the dataset, 'attrs' contains the data stored by the
+        user.
+
+    """
+    with open(os.path.join(path, METADATA), "r") as infile:
+        return json.load(infile)
+
+
+def read_dataset(path, filters=None, columns=None):
+    """
+    Read (part of) a dataset. Only the partitions selected by the filters
+    are read.
+
+    Parameters
+    ----------
+    path : path like object
+        dataset folder.
+    filters : dict, optional
+        allowed values (single value or list) of the partition columns, e.g.
+        {'Tally': [14, 24]}. The default is None, meaning all partitions.
+    columns : list of str, optional
+        columns to be read. The default is None, meaning all columns.
+
+    Returns
+    -------
+    dict
+        DataFrames of the selected partitions, keys are the values of the
+        partition columns (tuples if more than one partition column is
+        used).
+
+    """
+    metadata = read_metadata(path)
+    partition_cols = metadata["partition_cols"]
+    allowed = {}
+    if filters is not None:
+        for col, values in filters.items():
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            allowed[partition_cols.index(col)] = [_to_json(val) for val in values]
+
+    frames = {}
+    for partition in metadata["partitions"]:
+        key = partition["key"]
+        if any(key[i] not in values for i, values in allowed.items()):
+            continue
+        file = os.path.join(path, partition["file"])
+        if metadata["format"] == "parquet":
+            df = pd.read_parquet(file, columns=columns)
+            for col in partition["mixed"]:
+                if col in df.columns:
+                    df[col] = df[col].map(_decode_value)
+        else:
+            df = pd.read_pickle(file)
+            if columns is not None:
+                df = df[columns]
+        if len(partition_cols) == 1:
+            frames[key[0]] = df
+        else:
+            frames[tuple(key)] = df
+
+    return frames
+
+
+def read_table(path, filters=None, columns=None):
+    """
+    Read (part of) a dataset as a single DataFrame, where the partitions are
+    identified by the partition columns.
+
+    Parameters
+    ----------
+    path : path like object
+        dataset folder.
+    filters : dict, optional
+        allowed values (single value or list) of the partition columns. The
+        default is None, meaning all partitions.
+    columns : list of str, optional
+        columns to be read. The default is None, meaning all columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        data of the selected partitions.
+
+    """
+    partition_cols = read_metadata(path)["partition_cols"]
+    dfs = []
+    for key, df in read_dataset(path, filters=filters, columns=columns).items():
+        if len(partition_cols) == 1:
+            key = (key,)
+        df = df.copy()
+        for i, (col, val) in enumerate(zip(partition_cols, key)):
+            df.insert(i, col, val)
+        dfs.append(df)
+
+    if len(dfs) == 0:
+        return pd.DataFrame(columns=partition_cols)
+    return pd.concat(dfs, ignore_index=True)
+
+
+def _to_json(val):
+    """Convert numpy scalars and tuples to JSON serializable values"""
+    if isinstance(val, np.generic):
+        return val.item()
+    if isinstance(val, tuple):
+        return list(val)
+    return val
+
+
+def _encode_mixed(df):
+    """
+    Parquet columns must have a single type. Object columns mixing strings
+    and numbers (e.g. energies and 'total') are stored as strings.
+    """
+    mixed = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        types = {type(val) for val in df[col] if not pd.isnull(val)}
+        if len(types) > 0 and types != {str}:
+            if len(mixed) == 0:
+                df = df.copy()
+            df[col] = df[col].map(lambda val: None if pd.isnull(val) else str(val))
+            mixed.append(col)
+
+    return df, mixed
+
+
+def _decode_value(val):
+    """Restore the numbers of a mixed column"""
+    if val is None:
+        return np.nan
+    for conversion in [int, float]:
+        try:
+            return conversion(val)
+        except ValueError:
+            pass
+    return val
@@ -25,7 +25,6 @@ from __future__ import annotations
 
 import math
 import os
-import shutil
 import sys
 
 from typing import TYPE_CHECKING
@@ -40,14 +39,33 @@ from xlsxwriter.utility import xl_rowcol_to_cell
 import jade.atlas as at
 import jade.excelsupport as exsupp
 import jade.plotter as plotter
+import jade.rawstore as rawstore
 from jade.configuration import Configuration
-from jade.output import BenchmarkOutput, MCNPoutput, OpenMCOutput
+from jade.output import (
+    BenchmarkOutput,
+    MCNPoutput,
+    OpenMCOutput,
+    ParsedOutput,
+    ResultCube,
+    compare_libraries,
+    get_run_signature,
+    parse_outputs,
+)
 
 if TYPE_CHECKING:
     from jade.main import Session
 
+# Tallies reported in the single library excel
+MCNP_TALLIES = ["2", "4", "6", "12", "14", "24", "34", "22", "32", "44", "46"]
+OPENMC_TALLIES = ["4", "14"]
+# Tallies compared between libraries
+MCNP_COMPARISON_TALLIES = ["12", "22", "24", "14", "34", "6", "46"]
+
 
 class SphereOutput(BenchmarkOutput):
+    # Excel, raw data and plots are produced together
+    partial_rebuild = False
+
     def __init__(self, lib: str, code: str, testname: str, session: Session):
         """
         Initialises the SphereOutput class from the general BenchmarkOutput
@@ -99,7 +117,7 @@ class SphereOutput(BenchmarkOutput):
 
     def _generate_single_plots(self):
         """
-        Generate all the requested plots in a temporary folder
+        Generate all the requested plots in memory and build the atlas
 
         Returns
         -------
@@ -109,8 +127,8 @@ class SphereOutput(BenchmarkOutput):
 
         for code, outputs in self.outputs.items():
             # edited by T. Wheeler. openmc requires separate tally numbers which is accounted for here
-            outpath = os.path.join(self.atlas_path, "tmp")
-            os.mkdir(outpath)
+            # Images are kept in memory, outpath is never written
+            outpath = self.atlas_path
             if self.openmc:
                 tally_info = [
                     (
@@ -131,52 +149,112 @@ class SphereOutput(BenchmarkOutput):
                     ),
                     (32, "Averaged Gamma Flux (24 groups)", "Gamma Flux", r"$\#/cm^2$"),
                 ]
-            for tally, title, quantity, unit in tally_info:
-                print(" Plotting tally n." + str(tally))
-                for zaidnum, output in tqdm(outputs.items()):
-                    title = title
-                    tally_data = output.tallydata.set_index("Tally N.").loc[tally]
-                    energy = tally_data["Energy"].values
-                    values = tally_data["Value"].values
-                    error = tally_data["Error"].values
-                    lib_name = self.session.conf.get_lib_name(self.lib)
-                    lib = {
-                        "x": energy,
-                        "y": values,
-                        "err": error,
-                        "ylabel": str(zaidnum) + " (" + lib_name + ")",
-                    }
-                    data = [lib]
-                    outname = str(zaidnum) + "-" + self.lib + "-" + str(tally)
-                    plot = plotter.Plotter(
-                        data,
-                        title,
-                        outpath,
-                        outname,
-                        quantity,
-                        unit,
-                        "Energy [MeV]",
-                        self.testname,
-                    )
-                    plot.plot("Binned graph")
-
-            self._build_atlas(outpath)
-
-    def _build_atlas(self, outpath):
-        """
-        Build the atlas using all plots contained in directory
+            renderer = plotter.PlotRenderer(self.n_workers, batch=True)
+            jobs = self._get_single_plots(outputs, tally_info, outpath)
+            self._build_atlas(self._stream_images(renderer, jobs))
+            renderer.close()
+
+    def _get_single_plots(self, outputs, tally_info, outpath):
+        """
+        Generate the plots of a single library in the order of the atlas
+        (tally, then zaid).
+
+        Parameters
+        ----------
+        outputs : dict
+            parsed outputs, keys are zaid numbers or material names.
+        tally_info : list
+            (tally, title, quantity, unit) of the tallies to plot.
+        outpath : str/path
+            path to the images (not written, images are rendered in memory).
+
+        Yields
+        ------
+        tuple
+            ((section, title), plot, plot type) as accepted by
+            plotter.PlotRenderer.stream.
+
+        """
+        lib_name = self.session.conf.get_lib_name(self.lib)
+        for tally, title, quantity, unit in tally_info:
+            print(" Plotting tally n." + str(tally))
+            for zaidnum in tqdm(at.sort_zaids(outputs)):
+                output = outputs[zaidnum]
+                tally_data = output.tallydata.set_index("Tally N.").loc[tally]
+                energy = tally_data["Energy"].values
+                values = tally_data["Value"].values
+                error = tally_data["Error"].values
+                lib = {
+                    "x": energy,
+                    "y": values,
+                    "err": error,
+                    "ylabel": str(zaidnum) + " (" + lib_name + ")",
+                }
+                data = [lib]
+                outname = str(zaidnum) + "-" + self.lib + "-" + str(tally)
+                plot = plotter.Plotter(
+                    data,
+                    title,
+                    outpath,
+                    outname,
+                    quantity,
+                    unit,
+                    "Energy [MeV]",
+                    self.testname,
+                    draft=self.draft,
+                    max_bins=self.max_bins,
+                    cache=self.plot_cache,
+                )
+                key = ("Tally N." + str(tally), self._get_plot_title(zaidnum))
+                yield key, plot, "Binned graph"
+
+    def _get_plot_title(self, zaidnum):
+        return at.sphere_title(
+            str(zaidnum), self.session.lib_manager, self.mat_settings
+        )
+
+    @staticmethod
+    def _stream_images(renderer, jobs):
+        """
+        Render the atlas plots as they are inserted, so that only few images
+        are kept in memory at the same time.
+
+        Parameters
+        ----------
+        renderer : plotter.PlotRenderer
+            renderer of the plots.
+        jobs : iterable
+            ((section, title), plot, plot type) to be rendered.
+
+        Yields
+        ------
+        tuple
+            (section, title, image) as accepted by atlas.insert_images.
+
+        """
+        for (section, title), future in renderer.stream(jobs, in_memory=True):
+            try:
+                img = future.result()
+            except IndexError:
+                print(" Plot " + title + " could not be produced")
+                continue
+            yield section, title, img
+
+    def _build_atlas(self, images):
+        """
+        Build the atlas streaming the plots in it
 
         Parameters
         ----------
-        outpath : str or path
-            temporary folder containing all plots.
+        images : iterable
+            (section, title, image buffer) of all the plots, in the atlas
+            order.
 
         Returns
         -------
         None.
 
         """
-        atlas_path = os.path.join(outpath, "..")
         # Printing Atlas
         template = os.path.join(self.path_templates, "AtlasTemplate.docx")
         if self.single:
@@ -184,11 +262,28 @@ class SphereOutput(BenchmarkOutput):
         else:
             name = self.name
 
-        atlas = at.Atlas(template, "Sphere " + name)
-        atlas.build(outpath, self.session.lib_manager, self.mat_settings)
-        atlas.save(atlas_path)
-        # Remove tmp images
-        shutil.rmtree(outpath)
+        conf = self.session.conf
+        if (
+            conf.atlas_volume_size is None
+            and conf.atlas_volume_max_size is None
+            and not conf.atlas_volume_per_section
+        ):
+            atlas = at.Atlas(template, "Sphere " + name)
+            atlas.insert_images(images)
+            atlas.save(self.atlas_path)
+        else:
+            # Big atlases are split in volumes linked by an index, each
+            # volume is saved and released as soon as it is full
+            atlas = at.AtlasVolumes(
+                template,
+                "Sphere " + name,
+                self.atlas_path,
+                max_images=conf.atlas_volume_size,
+                per_section=conf.atlas_volume_per_section,
+                max_size=conf.atlas_volume_max_size,
+            )
+            atlas.insert_images(images)
+            atlas.save()
 
     def compare(self):
         """
@@ -243,9 +338,8 @@ class SphereOutput(BenchmarkOutput):
 
         """
         for code, code_outputs in self.outputs.items():
-            outpath = os.path.join(self.atlas_path, "tmp")
-            if not os.path.exists(outpath):
-                os.mkdir(outpath)
+            # Images are kept in memory, outpath is never written
+            outpath = self.atlas_path
             if code == "mcnp":
                 tally_info = [
                     (
@@ -266,51 +360,82 @@ class SphereOutput(BenchmarkOutput):
                     ),
                     (14, "Averaged Gamma Flux (24 groups)", "Gamma Flux", r"$\#/cm^2$"),
                 ]
-            for tally, title, quantity, unit in tally_info:
-                print(" Plotting tally n." + str(tally))
-                for zaidnum in tqdm(allzaids):
-                    # title = title
-                    data = []
-                    for library, lib_outputs in code_outputs.items():
-                        try:  # Zaid could not be common to the libraries
-                            tally_data = (
-                                lib_outputs[zaidnum]
-                                .tallydata.set_index("Tally N.")
-                                .loc[tally]
-                            )
-                            # print(lib_outputs[zaidnum])
-                            energy = tally_data["Energy"].values
-                            values = tally_data["Value"].values
-                            error = tally_data["Error"].values
-                            lib_name = self.session.conf.get_lib_name(library)
-                            lib = {
-                                "x": energy,
-                                "y": values,
-                                "err": error,
-                                "ylabel": str(zaidnum) + " (" + str(lib_name) + ")",
-                            }
-                            data.append(lib)
-                        except KeyError:
-                            # It is ok, simply nothing to plot here
-                            pass
-
-                    outname = str(zaidnum) + "-" + globalname + "-" + str(tally)
-                    plot = plotter.Plotter(
-                        data,
-                        title,
-                        outpath,
-                        outname,
-                        quantity,
-                        unit,
-                        "Energy [MeV]",
-                        self.testname,
-                    )
-                    try:
-                        plot.plot("Binned graph")
-                    except IndexError:
-                        print(data)
+            renderer = plotter.PlotRenderer(self.n_workers, batch=True)
+            jobs = self._get_comparison_plots(
+                code_outputs, allzaids, tally_info, globalname, outpath
+            )
+            self._build_atlas(self._stream_images(renderer, jobs))
+            renderer.close()
 
-            self._build_atlas(outpath)
+    def _get_comparison_plots(
+        self, code_outputs, allzaids, tally_info, globalname, outpath
+    ):
+        """
+        Generate the plots of a comparison in the order of the atlas (tally,
+        then zaid).
+
+        Parameters
+        ----------
+        code_outputs : dict
+            outputs of each library.
+        allzaids : list
+            zaids resulting from the union of the results of the libraries.
+        tally_info : list
+            (tally, title, quantity, unit) of the tallies to plot.
+        globalname : str
+            name for the output.
+        outpath : str/path
+            path to the images (not written, images are rendered in memory).
+
+        Yields
+        ------
+        tuple
+            ((section, title), plot, plot type) as accepted by
+            plotter.PlotRenderer.stream.
+
+        """
+        for tally, title, quantity, unit in tally_info:
+            print(" Plotting tally n." + str(tally))
+            for zaidnum in tqdm(at.sort_zaids(allzaids)):
+                data = []
+                for library, lib_outputs in code_outputs.items():
+                    try:  # Zaid could not be common to the libraries
+                        tally_data = (
+                            lib_outputs[zaidnum]
+                            .tallydata.set_index("Tally N.")
+                            .loc[tally]
+                        )
+                        energy = tally_data["Energy"].values
+                        values = tally_data["Value"].values
+                        error = tally_data["Error"].values
+                        lib_name = self.session.conf.get_lib_name(library)
+                        lib = {
+                            "x": energy,
+                            "y": values,
+                            "err": error,
+                            "ylabel": str(zaidnum) + " (" + str(lib_name) + ")",
+                        }
+                        data.append(lib)
+                    except KeyError:
+                        # It is ok, simply nothing to plot here
+                        pass
+
+                outname = str(zaidnum) + "-" + globalname + "-" + str(tally)
+                plot = plotter.Plotter(
+                    data,
+                    title,
+                    outpath,
+                    outname,
+                    quantity,
+                    unit,
+                    "Energy [MeV]",
+                    self.testname,
+                    draft=self.draft,
+                    max_bins=self.max_bins,
+                    cache=self.plot_cache,
+                )
+                key = ("Tally N." + str(tally), self._get_plot_title(zaidnum))
+                yield key, plot, "Binned graph"
 
     def _get_organized_output(self):
         """
@@ -342,6 +467,317 @@ class SphereOutput(BenchmarkOutput):
 
         return libraries, allzaids, outputs
 
+    def _get_zaid_from_folder(self, folder):
+        """
+        Recover the zaid (or material) number and name from the name of a
+        run folder
+
+        Parameters
+        ----------
+        folder : str
+            name of the run folder.
+
+        Returns
+        -------
+        zaidnum : str
+            zaid number or material name.
+        zaidname : str
+            zaid or material extended name.
+
+        """
+        pieces = folder.split("_")
+        # Get zaid
+        zaidnum = pieces[-2]
+        # Check for material exception
+        if zaidnum == "Sphere":
+            zaidnum = pieces[-1].upper()
+            zaidname = self.mat_settings.loc[zaidnum, "Name"]
+        else:
+            zaidname = pieces[-1]
+
+        return zaidnum, zaidname
+
+    def _parse_folders(self, test_path, code):
+        """
+        Parse all the run folders of a library for a specific code. The
+        parsing is distributed among the configured number of workers.
+
+        Parameters
+        ----------
+        test_path : path like object
+            path to the library test folder.
+        code : str
+            either 'mcnp' or 'openmc'.
+
+        Returns
+        -------
+        parsed : list of tuple
+            (zaidnum, zaidname, output, res, err) for each run folder, sorted
+            by folder name.
+
+        """
+        folders = sorted(os.listdir(test_path))
+        zaids = [self._get_zaid_from_folder(folder) for folder in folders]
+        if code == "mcnp":
+            parser = _parse_sphere_mcnp
+            arguments = [
+                (os.path.join(test_path, folder, "mcnp"), MCNP_TALLIES)
+                for folder in folders
+            ]
+        elif code == "openmc":
+            parser = _parse_sphere_openmc
+            arguments = [
+                (os.path.join(test_path, folder, "openmc", "tallies.out"),)
+                for folder in folders
+            ]
+        else:
+            raise NotImplementedError(code)
+
+        # Parse outputs
+        outputs = parse_outputs(parser, arguments, self.n_workers)
+        parsed = []
+        for (zaidnum, zaidname), (output, res, err) in zip(zaids, outputs):
+            parsed.append((zaidnum, zaidname, output, res, err))
+
+        return parsed
+
+    def _get_store_path(self, lib, code):
+        """
+        Get the path to the raw data dataset of the single library
+        post-processing of a library, which also stores the results to be
+        reused by the comparisons.
+
+        Parameters
+        ----------
+        lib : str
+            library suffix.
+        code : str
+            code that produced the results.
+
+        Returns
+        -------
+        str
+            path to the result store.
+
+        """
+        raw_path = os.path.join(
+            self.session.path_single, lib, self.testname, code, "Raw_Data"
+        )
+        return rawstore.get_dataset_path(raw_path, lib, self.testname, code)
+
+    def _save_result_store(self, code, outputs):
+        """
+        Persist the parsed results of the single library post-processing so
+        that they can be reused by the comparisons. The tallies data and total
+        bins of each zaid are stored in the raw data dataset, partitioned by
+        zaid.
+
+        Parameters
+        ----------
+        code : str
+            code that produced the results.
+        outputs : dict
+            parsed outputs, keys are zaid numbers or material names.
+
+        Returns
+        -------
+        None.
+
+        """
+        zaids = []
+        signatures = {}
+        frames = {}
+        stat_checks = []
+        for folder in sorted(os.listdir(self.test_path)):
+            zaidnum, zaidname = self._get_zaid_from_folder(folder)
+            results_path = os.path.join(self.test_path, folder, code)
+            signatures[folder] = get_run_signature(results_path)
+            zaids.append([folder, zaidnum, zaidname])
+            output = outputs[zaidnum]
+            frames[zaidnum, "tallydata"] = output.tallydata
+            frames[zaidnum, "totalbin"] = output.totalbin
+            stat_checks.append([zaidnum, output.stat_checks])
+
+        attrs = {"signatures": signatures, "zaids": zaids, "stat_checks": stat_checks}
+        rawstore.write_dataset(
+            self._get_store_path(self.lib, code), frames, ["Zaid", "Table"], attrs
+        )
+
+        # The total bins are added to the warehouse as 'total' energies
+        tables = []
+        for zaidnum, output in outputs.items():
+            totalbin = output.totalbin.assign(Energy="total")
+            data = pd.concat([output.tallydata, totalbin], ignore_index=True)
+            key = ["Tally N.", "Tally Description"]
+            for (num, title), df in data.groupby(key, sort=False):
+                tables.append((zaidnum, num, title, df.drop(columns=key)))
+        self._add_to_warehouse(code, tables)
+
+    def _load_result_store(self, lib, code):
+        """
+        Recover the results of a library from the store produced by its
+        single library post-processing. If the store is not available or if
+        the simulation outputs changed after it was produced, the outputs
+        are parsed again.
+
+        Parameters
+        ----------
+        lib : str
+            library suffix.
+        code : str
+            code that produced the results.
+
+        Returns
+        -------
+        outputs : dict
+            parsed outputs, keys are zaid numbers or material names.
+        zaidnames : dict
+            zaid or material names, keys are zaid numbers or material names.
+
+        """
+        test_path = self.test_path[lib]
+        store_path = self._get_store_path(lib, code)
+        try:
+            store = rawstore.read_metadata(store_path)["attrs"]
+        except (OSError, ValueError, KeyError):
+            store = None
+
+        if store is not None:
+            signatures = {}
+            for folder in sorted(os.listdir(test_path)):
+                results_path = os.path.join(test_path, folder, code)
+                signature = get_run_signature(results_path)
+                # as stored in the JSON metadata
+                signatures[folder] = [list(entry) for entry in signature]
+            if signatures != store.get("signatures"):
+                store = None
+
+        outputs = {}
+        zaidnames = {}
+        # Fallback, parse the outputs
+        if store is None:
+            print(
+                " Stored results for {} not found or outdated, parsing...".format(lib)
+            )
+            for zaidnum, zaidname, output, _, _ in self._parse_folders(test_path, code):
+                outputs[zaidnum] = output
+                zaidnames[zaidnum] = zaidname
+            return outputs, zaidnames
+
+        frames = rawstore.read_dataset(store_path)
+        stat_checks = dict(store["stat_checks"])
+        for _, zaidnum, zaidname in store["zaids"]:
+            outputs[zaidnum] = SphereParsedOutput(
+                frames[zaidnum, "tallydata"],
+                frames[zaidnum, "totalbin"],
+                stat_checks[zaidnum],
+            )
+            zaidnames[zaidnum] = zaidname
+
+        return outputs, zaidnames
+
+    def _get_comparison_dfs(self, outputs, zaidnames, tallies2pp, code):
+        """
+        Collect the results and errors of a library to be used in the
+        comparisons
+
+        Parameters
+        ----------
+        outputs : dict
+            parsed outputs, keys are zaid numbers or material names.
+        zaidnames : dict
+            zaid or material names, keys are zaid numbers or material names.
+        tallies2pp : list of str
+            tallies to be compared.
+        code : str
+            code that produced the results.
+
+        Returns
+        -------
+        comp_df : pd.DataFrame
+            results to be compared.
+        error_df : pd.DataFrame
+            errors associated to the results.
+
+        """
+        results = []
+        errors = []
+        for zaidnum, output in outputs.items():
+            res, err, columns = output.get_comparison_data(tallies2pp, code)
+            try:
+                zn = int(zaidnum)
+            except ValueError:  # Happens for typical materials
+                zn = zaidnum
+
+            res.append(zn)
+            err.append(zn)
+            res.append(zaidnames[zaidnum])
+            err.append(zaidnames[zaidnum])
+
+            results.append(res)
+            errors.append(err)
+
+        # Generate DataFrames
+        columns.extend(["Zaid", "Zaid/Mat Name"])
+        comp_df = pd.DataFrame(results, columns=columns)
+        error_df = pd.DataFrame(errors, columns=columns)
+        comp_df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
+        error_df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
+
+        return comp_df, error_df
+
+    def _get_single_dfs(self, outputs, zaidnames, code):
+        """
+        Recover the single library excel results of a library from its
+        parsed outputs, to be added to the comparison workbooks
+
+        Parameters
+        ----------
+        outputs : dict
+            parsed outputs, keys are zaid numbers or material names.
+        zaidnames : dict
+            zaid or material names, keys are zaid numbers or material names.
+        code : str
+            code that produced the results.
+
+        Returns
+        -------
+        results : pd.DataFrame
+            contents of the "Values" worksheet.
+        errors : pd.DataFrame
+            contents of the "Errors" worksheet.
+        stat_checks : pd.DataFrame
+            contents of the "Statistical Checks" worksheet, None if the code
+            does not provide them.
+
+        """
+        if code == "mcnp":
+            tallies2pp = MCNP_TALLIES
+        else:
+            tallies2pp = OPENMC_TALLIES
+
+        results = []
+        errors = []
+        stat_checks = []
+        for zaidnum, output in outputs.items():
+            res, err = output.get_single_excel_data(tallies2pp)
+            dics = [res, err]
+            # Only MCNP currently has statistical checks
+            if code == "mcnp":
+                st_ck = dict(output.stat_checks)
+                stat_checks.append(st_ck)
+                dics.append(st_ck)
+            for dic in dics:
+                dic["Zaid"] = zaidnum
+                dic["Zaid/Mat Name"] = zaidnames[zaidnum]
+            results.append(res)
+            errors.append(err)
+
+        if code != "mcnp":
+            stat_checks = None
+
+        return self._generate_dataframe(results, errors, stat_checks)
+
     def _read_mcnp_output(self):
         """Reads all MCNP outputs from a library
 
@@ -365,36 +801,13 @@ class SphereOutput(BenchmarkOutput):
         stat_checks = []
         outputs = {}
         # test_path_mcnp = os.path.join(self.test_path, "mcnp")
-        for folder in sorted(os.listdir(self.test_path)):
-            results_path = os.path.join(self.test_path, folder, "mcnp")
-            pieces = folder.split("_")
-            # Get zaid
-            zaidnum = pieces[-2]
-            # Check for material exception
-            if zaidnum == "Sphere":
-                zaidnum = pieces[-1].upper()
-                zaidname = self.mat_settings.loc[zaidnum, "Name"]
-            else:
-                zaidname = pieces[-1]
-            # Get mfile
-            for file in os.listdir(results_path):
-                if file[-1] == "m":
-                    mfile = file
-                elif file[-1] == "o":
-                    ofile = file
-            # Parse output
-            output = SphereMCNPoutput(
-                os.path.join(results_path, mfile), os.path.join(results_path, ofile)
-            )
+        parsed = self._parse_folders(self.test_path, "mcnp")
+        for zaidnum, zaidname, output, res, err in parsed:
             outputs[zaidnum] = output
             # Adjourn raw Data
             self.raw_data["mcnp"][zaidnum] = output.tallydata
             # Recover statistical checks
             st_ck = output.stat_checks
-            # Recover results and precisions
-            res, err = output.get_single_excel_data(
-                ["2", "4", "6", "12", "14", "24", "34", "22", "32", "44", "46"]
-            )
             for dic in [res, err, st_ck]:
                 dic["Zaid"] = zaidnum
                 dic["Zaid/Mat Name"] = zaidname
@@ -450,26 +863,13 @@ class SphereOutput(BenchmarkOutput):
         # stat_checks = []
         outputs = {}
         # test_path_openmc = os.path.join(self.test_path, "openmc")
-        for folder in sorted(os.listdir(self.test_path)):
-            results_path = os.path.join(self.test_path, folder, "openmc")
-            pieces = folder.split("_")
-            # Get zaid
-            zaidnum = pieces[-2]
-            # Check for material exception
-            if zaidnum == "Sphere":
-                zaidnum = pieces[-1].upper()
-                zaidname = self.mat_settings.loc[zaidnum, "Name"]
-            else:
-                zaidname = pieces[-1]
-            # Parse output
-            output = SphereOpenMCoutput(os.path.join(results_path, "tallies.out"))
+        parsed = self._parse_folders(self.test_path, "openmc")
+        for zaidnum, zaidname, output, res, err in parsed:
             outputs[zaidnum] = output
             # Adjourn raw Data
             self.raw_data["openmc"][zaidnum] = output.tallydata
             # Recover statistical checks
             # st_ck = output.stat_checks
-            # Recover results and precisions
-            res, err = output.get_single_excel_data(["4", "14"])
             for dic in [res, err]:
                 dic["Zaid"] = zaidnum
                 dic["Zaid/Mat Name"] = zaidname
@@ -554,6 +954,8 @@ class SphereOutput(BenchmarkOutput):
             self.results["mcnp"] = results
             self.errors["mcnp"] = errors
             self.stat_checks["mcnp"] = stat_checks
+            # Persist the results for the comparisons
+            self._save_result_store("mcnp", outputs)
             lib_name = self.session.conf.get_lib_name(self.lib)
             # Generate DataFrames
             # results = pd.DataFrame(results)
@@ -589,6 +991,8 @@ class SphereOutput(BenchmarkOutput):
             self.results["openmc"] = results
             self.errors["openmc"] = errors
             self.stat_checks["openmc"] = stat_checks
+            # Persist the results for the comparisons
+            self._save_result_store("openmc", outputs)
 
             exsupp.sphere_single_excel_writer(self, outpath, self.lib, results, errors)
 
@@ -610,389 +1014,112 @@ class SphereOutput(BenchmarkOutput):
         code_outputs = {}
 
         if self.mcnp:
-            iteration = 0
-            outputs = {}
-            for reflib, tarlib, name in self.couples:
-                outfolder_path = self.excel_path
-                # os.mkdir(outfolder_path)
-                outpath = os.path.join(
-                    outfolder_path, "Sphere_comparison_" + name + "_mcnp.xlsx"
-                )
-                # outpath = os.path.join(self.excel_path_mcnp, 'Sphere_comparison_' +
-                #                       name+'.xlsx')
-                # Get results
-                comp_dfs = []
-                error_dfs = []
-
-                for test_path in [
-                    self.test_path[reflib],
-                    self.test_path[tarlib],
-                ]:
-                    results = []
-                    errors = []
-                    iteration = iteration + 1
-                    outputs_lib = {}
-                    for folder in os.listdir(test_path):
-                        results_path = os.path.join(test_path, folder, "mcnp")
-                        pieces = folder.split("_")
-                        # Get zaid
-                        zaidnum = pieces[-2]
-                        # Check for material exception
-                        if zaidnum == "Sphere":
-                            zaidnum = pieces[-1].upper()
-                            zaidname = self.mat_settings.loc[zaidnum, "Name"]
-                        else:
-                            zaidname = pieces[-1]
-
-                        # Get mfile
-                        for file in os.listdir(results_path):
-                            if file[-1] == "m":
-                                mfile = file
-                            elif file[-1] == "o":
-                                outfile = file
-
-                        # Parse output
-                        mfile = os.path.join(results_path, mfile)
-                        outfile = os.path.join(results_path, outfile)
-                        output = SphereMCNPoutput(mfile, outfile)
-                        outputs_lib[zaidnum] = output
-                        res, err, columns = output.get_comparison_data(
-                            ["12", "22", "24", "14", "34", "6", "46"], "mcnp"
-                        )
-                        try:
-                            zn = int(zaidnum)
-                        except ValueError:  # Happens for typical materials
-                            zn = zaidnum
-
-                        res.append(zn)
-                        err.append(zn)
-                        res.append(zaidname)
-                        err.append(zaidname)
-
-                        results.append(res)
-                        errors.append(err)
-
-                    # Add reference library outputs
-                    if iteration == 1:
-                        outputs[reflib] = outputs_lib
-
-                    if iteration == 2:
-                        outputs[tarlib] = outputs_lib
-
-                    # Generate DataFrames
-                    columns.extend(["Zaid", "Zaid/Mat Name"])
-                    comp_df = pd.DataFrame(results, columns=columns)
-                    error_df = pd.DataFrame(errors, columns=columns)
-                    comp_df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
-                    error_df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
-                    comp_dfs.append(comp_df)
-                    error_dfs.append(error_df)
-
-                code_outputs["mcnp"] = outputs
-                self.outputs = code_outputs
-                # self.results["mcnp"] = results
-                # self.errors["mcnp"] = errors
-
-                # Consider only common zaids
-                idx1 = comp_dfs[0].index
-                idx2 = comp_dfs[1].index
-                newidx = idx1.intersection(idx2)
-
-                # Build the final excel data
-                final = (comp_dfs[0].loc[newidx] - comp_dfs[1].loc[newidx]) / comp_dfs[
-                    0
-                ].loc[newidx]
-                absdiff = comp_dfs[0].loc[newidx] - comp_dfs[1].loc[newidx]
-
-                # self.diff_data["mcnp"] = final
-                # self.absdiff["mcnp"] = absdiff
-
-                # Standard deviation
-                idx1 = absdiff.index
-                idx2 = error_dfs[0].index
-                newidx = idx1.intersection(idx2)
-
-                std_dev = absdiff.loc[newidx] / error_dfs[0].loc[newidx]
-
-                # self.std_dev["mcnp"] = std_dev
-                # Correct sorting
-                for df in [final, absdiff, std_dev]:
-                    df.reset_index(inplace=True)
-                    df["index"] = pd.to_numeric(df["Zaid"].values, errors="coerce")
-                    df.sort_values("index", inplace=True)
-                    del df["index"]
-                    df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
-
-                # Create and concat the summary
-                old_l = 0
-                old_lim = 0
-                rows = []
-                limits = [0, 0.05, 0.1, 0.2, 0.2]
-                for i, sup_lim in enumerate(limits[1:]):
-                    if i == len(limits) - 2:
-                        row = {"Range": "% of cells > " + str(sup_lim * 100)}
-                        for column in final.columns:
-                            cleaned = final[column].replace("", np.nan).dropna()
-                            l_range = len(cleaned[abs(cleaned) > sup_lim])
-                            try:
-                                row[column] = l_range / len(cleaned)
-                            except ZeroDivisionError:
-                                row[column] = np.nan
-                    else:
-                        row = {
-                            "Range": str(old_lim * 100)
-                            + " < "
-                            + "% of cells"
-                            + " < "
-                            + str(sup_lim * 100)
-                        }
-                        for column in final.columns:
-                            cleaned = final[column].replace("", np.nan).dropna()
-                            lenght = len(cleaned[abs(cleaned) < sup_lim])
-                            old_l = len(cleaned[abs(cleaned) < limits[i]])
-                            l_range = lenght - old_l
-                            try:
-                                row[column] = l_range / len(cleaned)
-                            except ZeroDivisionError:
-                                row[column] = np.nan
-
-                    old_lim = sup_lim
-                    rows.append(row)
-
-                summary = pd.DataFrame(rows)
-                summary.set_index("Range", inplace=True)
-                # If it is zero the CS are equal! (NaN if both zeros)
-                for df in [final, absdiff, std_dev]:
-                    # df[df == np.nan] = 'Not Available'
-                    df.astype({col: float for col in df.columns[1:]})
-                    df.replace(np.nan, "Not Available", inplace=True)
-                    df.replace(float(0), "Identical", inplace=True)
-                    df.replace(-np.inf, "Reference = 0", inplace=True)
-                    df.replace(1, "Target = 0", inplace=True)
-
-                # retrieve single pp files to add as extra tabs to comparison workbook
-                single_pp_files = []
-                # Add single pp sheets
-                for lib in [reflib, tarlib]:
-                    pp_dir = self.session.state.get_path(
-                        "single", [lib, "Sphere", "mcnp", "Excel"]
-                    )
-                    pp_file = os.listdir(pp_dir)[0]
-                    single_pp_path = os.path.join(pp_dir, pp_file)
-                    single_pp_files.append(single_pp_path)
-
-                # --- Write excel ---
-                # Generate the excel
-                exsupp.sphere_comp_excel_writer(
-                    self,
-                    outpath,
-                    name,
-                    final,
-                    absdiff,
-                    std_dev,
-                    summary,
-                    single_pp_files,
-                )
+            code_outputs["mcnp"] = self._pp_excel_comparison_code(
+                "mcnp", MCNP_COMPARISON_TALLIES
+            )
+            self.outputs = code_outputs
 
-                # # Add single pp sheets
-                # current_wb = openpyxl.load_workbook(outpath)
-                # for lib in [reflib, tarlib]:
-                #     cp = self.session.state.get_path(
-                #         "single", [lib, "Sphere", "mcnp", "Excel"]
-                #     )
-                #     file = os.listdir(cp)[0]
-                #     cp = os.path.join(cp, file)
-                #     # open file
-                #     single_wb = openpyxl.load_workbook(cp)
-                #     for ws in single_wb.worksheets:
-                #         destination = current_wb.create_sheet(ws.title + " " + lib)
-                #         exsupp.copy_sheet(ws, destination)
-                #     single_wb.close()
-
-                # current_wb.save(outpath)
-                # current_wb.close()
-
-                # ex.save()
-                # """
         if self.openmc:
-            iteration = 0
-            outputs = {}
-            for reflib, tarlib, name in self.couples:
-                outfolder_path = self.excel_path
-                # os.mkdir(outfolder_path)
-                outpath = os.path.join(
-                    outfolder_path, "Sphere_comparison_" + name + "_openmc.xlsx"
-                )
-                # outpath = os.path.join(self.excel_path_openmc, 'Sphere_comparison_' +
-                #                       name+'openmc.xlsx')
-                # Get results
-                comp_dfs = []
-                error_dfs = []
-
-                for test_path in [self.test_path[reflib], self.test_path[tarlib]]:
-                    results = []
-                    errors = []
-                    iteration = iteration + 1
-                    outputs_lib = {}
-                    for folder in os.listdir(test_path):
-                        results_path = os.path.join(test_path, folder, "openmc")
-                        pieces = folder.split("_")
-                        # Get zaid
-                        zaidnum = pieces[-2]
-                        # Check for material exception
-                        if zaidnum == "Sphere":
-                            zaidnum = pieces[-1].upper()
-                            zaidname = self.mat_settings.loc[zaidnum, "Name"]
-                        else:
-                            zaidname = pieces[-1]
-
-                        # Get mfile
-                        for file in os.listdir(results_path):
-                            if "tallies.out" in file:
-                                outfile = file
-
-                        # Parse output
-                        outfile = os.path.join(results_path, outfile)
-                        output = SphereOpenMCoutput(outfile)
-                        outputs_lib[zaidnum] = output
-                        res, err, columns = output.get_comparison_data(
-                            ["4", "14"], "openmc"
-                        )
-                        try:
-                            zn = int(zaidnum)
-                        except ValueError:  # Happens for typical materials
-                            zn = zaidnum
-
-                        res.append(zn)
-                        err.append(zn)
-                        res.append(zaidname)
-                        err.append(zaidname)
-
-                        results.append(res)
-                        errors.append(err)
-                    # Add reference library outputs
-                    if iteration == 1:
-                        outputs[reflib] = outputs_lib
-
-                    if test_path == os.path.join(self.test_path[tarlib], "openmc"):
-                        outputs[tarlib] = outputs_lib
-
-                    # Generate DataFrames
-                    columns.extend(["Zaid", "Zaid/Mat Name"])
-                    comp_df = pd.DataFrame(results, columns=columns)
-                    error_df = pd.DataFrame(errors, columns=columns)
-                    comp_df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
-                    error_df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
-                    comp_dfs.append(comp_df)
-                    error_dfs.append(error_df)
-
-                    # outputs_couple = outputs
-                    # self.results = results
-                code_outputs["openmc"] = outputs
-                self.outputs = code_outputs
-                # self.results["openmc"] = results
-                # self.errors["openmc"] = errors
-                # Consider only common zaids
-                idx1 = comp_dfs[0].index
-                idx2 = comp_dfs[1].index
-                newidx = idx1.intersection(idx2)
-
-                # Build the final excel data
-                final = (comp_dfs[0].loc[newidx] - comp_dfs[1].loc[newidx]) / comp_dfs[
-                    0
-                ].loc[newidx]
-                absdiff = comp_dfs[0].loc[newidx] - comp_dfs[1].loc[newidx]
-
-                # self.diff_data["openmc"] = final
-                # self.absdiff["openmc"] = absdiff
-
-                # Standard deviation
-                idx1 = absdiff.index
-                idx2 = error_dfs[0].index
-                newidx = idx1.intersection(idx2)
-
-                std_dev = absdiff.loc[newidx] / error_dfs[0].loc[newidx]
-
-                # self.std_dev["openmc"] = std_dev
-
-                # Correct sorting
-                for df in [final, absdiff, std_dev]:
-                    df.reset_index(inplace=True)
-                    df["index"] = pd.to_numeric(df["Zaid"].values, errors="coerce")
-                    df.sort_values("index", inplace=True)
-                    del df["index"]
-                    df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
-                # Create and concat the summary
-                old_l = 0
-                old_lim = 0
-                rows = []
-                limits = [0, 0.05, 0.1, 0.2, 0.2]
-                for i, sup_lim in enumerate(limits[1:]):
-                    if i == len(limits) - 2:
-                        row = {"Range": "% of cells > " + str(sup_lim * 100)}
-                        for column in final.columns:
-                            cleaned = final[column].replace("", np.nan).dropna()
-                            l_range = len(cleaned[abs(cleaned) > sup_lim])
-                            try:
-                                row[column] = l_range / len(cleaned)
-                            except ZeroDivisionError:
-                                row[column] = np.nan
-                    else:
-                        row = {
-                            "Range": str(old_lim * 100)
-                            + " < "
-                            + "% of cells"
-                            + " < "
-                            + str(sup_lim * 100)
-                        }
-                        for column in final.columns:
-                            cleaned = final[column].replace("", np.nan).dropna()
-                            lenght = len(cleaned[abs(cleaned) < sup_lim])
-                            old_l = len(cleaned[abs(cleaned) < limits[i]])
-                            l_range = lenght - old_l
-                            try:
-                                row[column] = l_range / len(cleaned)
-                            except ZeroDivisionError:
-                                row[column] = np.nan
-
-                    old_lim = sup_lim
-                    rows.append(row)
-
-                summary = pd.DataFrame(rows)
-                summary.set_index("Range", inplace=True)
-                # If it is zero the CS are equal! (NaN if both zeros)
-                for df in [final, absdiff, std_dev]:
-                    # df[df == np.nan] = 'Not Available'
-                    df.astype({col: float for col in df.columns[1:]})
-                    df.replace(np.nan, "Not Available", inplace=True)
-                    df.replace(float(0), "Identical", inplace=True)
-                    df.replace(-np.inf, "Reference = 0", inplace=True)
-                    df.replace(1, "Target = 0", inplace=True)
-
-                # retrieve single pp files to add as extra tabs to comparison workbook
-                single_pp_files = []
-                # Add single pp sheets
-                for lib in [reflib, tarlib]:
-                    pp_dir = self.session.state.get_path(
-                        "single", [lib, "Sphere", "openmc", "Excel"]
-                    )
-                    pp_file = os.listdir(pp_dir)[0]
-                    single_pp_path = os.path.join(pp_dir, pp_file)
-                    single_pp_files.append(single_pp_path)
+            code_outputs["openmc"] = self._pp_excel_comparison_code(
+                "openmc", OPENMC_TALLIES
+            )
+            self.outputs = code_outputs
 
-                # --- Write excel ---
-                # Generate the excel
-                exsupp.sphere_comp_excel_writer(
-                    self, outpath, name, final, absdiff, std_dev, summary, single_pp_files
-                )
         if self.serpent:
             pass
 
+    def _pp_excel_comparison_code(self, code, tallies2pp):
+        """
+        Create the excel comparisons of a specific code. The results of each
+        library are recovered only once and all the target libraries are
+        compared to the reference at the same time.
+
+        Parameters
+        ----------
+        code : str
+            code that produced the results.
+        tallies2pp : list of str
+            tallies to be compared.
+
+        Returns
+        -------
+        outputs : dict
+            outputs of each library, to be used in the plots.
+
+        """
+        outputs = {}
+        values = {}
+        errors = {}
+        singles = {}
+        reflib = self.couples[0][0]
+        for lib in self.lib:
+            outputs[lib], zaidnames = self._load_result_store(lib, code)
+            values[lib], errors[lib] = self._get_comparison_dfs(
+                outputs[lib], zaidnames, tallies2pp, code
+            )
+            # Single library results, added as extra tabs to the comparisons
+            if code == "mcnp":
+                lib_name = self.session.conf.get_lib_name(lib)
+            else:
+                lib_name = lib
+            singles[lib] = (lib, lib_name) + self._get_single_dfs(
+                outputs[lib], zaidnames, code
+            )
+
+        cube = ResultCube.from_dataframes(values, errors)
+        comparisons = cube.compare(reflib)
+        summaries = cube.summary(reflib)
+
+        for reflib, tarlib, name in self.couples:
+            outfolder_path = self.excel_path
+            outpath = os.path.join(
+                outfolder_path, "Sphere_comparison_" + name + "_" + code + ".xlsx"
+            )
+            final, absdiff, std_dev = comparisons[tarlib]
+
+            # Correct sorting
+            for df in [final, absdiff, std_dev]:
+                df.reset_index(inplace=True)
+                df["index"] = pd.to_numeric(df["Zaid"].values, errors="coerce")
+                df.sort_values("index", inplace=True)
+                del df["index"]
+                df.set_index(["Zaid", "Zaid/Mat Name"], inplace=True)
+
+            # Summary of the relative differences
+            summary = summaries[tarlib]
+            # If it is zero the CS are equal! (NaN if both zeros)
+            for df in [final, absdiff, std_dev]:
+                # df[df == np.nan] = 'Not Available'
+                df.astype({col: float for col in df.columns[1:]})
+                df.replace(np.nan, "Not Available", inplace=True)
+                df.replace(float(0), "Identical", inplace=True)
+                df.replace(-np.inf, "Reference = 0", inplace=True)
+                df.replace(1, "Target = 0", inplace=True)
+
+            # --- Write excel ---
+            # Generate the excel
+            exsupp.sphere_comp_excel_writer(
+                self,
+                outpath,
+                name,
+                final,
+                absdiff,
+                std_dev,
+                summary,
+                [singles[reflib], singles[tarlib]],
+            )
+
+        return outputs
+
     def print_raw(self):
         """
-        Assigns a path and prints the post processing data as a .csv
+        Assigns a path and prints the post processing data as a .csv. The raw
+        data is always available in the result store, the .csv files are only
+        printed if requested in the configuration.
 
         """
+        if not self.raw_csv:
+            return
         if self.mcnp:
             for key, data in self.raw_data["mcnp"].items():
                 file = os.path.join(self.raw_path, "mcnp" + key + ".csv")
@@ -1374,11 +1501,12 @@ class SphereSDDRoutput(SphereOutput):
         """
         # template = os.path.join(os.getcwd(), "templates", "SphereSDDR_comparison.xlsx")
         if self.d1s:
+            comparisons, singles = self._compute_compare_results()
             for reflib, tarlib, name in self.couples:
                 outpath = os.path.join(
                     self.excel_path, "Sphere_SDDR_comparison_" + name + ".xlsx"
                 )
-                final, absdiff, std_dev = self._compute_compare_result(reflib, tarlib)
+                final, absdiff, std_dev = comparisons[tarlib]
 
                 # --- Write excel ---
                 # Generate the excel
@@ -1397,18 +1525,14 @@ class SphereSDDRoutput(SphereOutput):
                 # rangeex = ws_diff.range("B11")
                 # rangeex.options(index=True, header=False).value = absdiff
 
-                single_pp_files = []
                 # Add single pp sheets
+                single_tabs = []
                 for lib in [reflib, tarlib]:
-                    pp_dir = self.session.state.get_path(
-                        "single", [lib, "SphereSDDR", "d1s", "Excel"]
-                    )
-                    pp_file = os.listdir(pp_dir)[0]
-                    single_pp_path = os.path.join(pp_dir, pp_file)
-                    single_pp_files.append(single_pp_path)
+                    lib_name = self.session.conf.get_lib_name(lib)
+                    single_tabs.append((lib, lib_name) + singles[lib])
 
                 exsupp.sphere_sddr_comp_excel_writer(
-                    outpath, name, final, absdiff, std_dev, single_pp_files
+                    outpath, name, final, absdiff, std_dev, single_tabs
                 )
 
     def _get_organized_output(self):
@@ -1455,11 +1579,18 @@ class SphereSDDRoutput(SphereOutput):
             libraries = self.lib
 
         # Initialize atlas
-        outpath = os.path.join(self.atlas_path, "tmp")
-        if not os.path.exists(outpath):
-            os.mkdir(outpath)
+        # Plots are rendered in memory, outpath is never written
+        outpath = self.atlas_path
         template = os.path.join(self.path_templates, "AtlasTemplate.docx")
-        atlas = at.Atlas(template, "Sphere SDDR " + globalname)
+        renderer = plotter.PlotRenderer(self.n_workers)
+        atlas = at.Atlas(
+            template,
+            "Sphere SDDR " + globalname,
+            renderer=renderer,
+            draft=self.draft,
+            max_bins=self.max_bins,
+            cache=self.plot_cache,
+        )
         libmanager = self.session.lib_manager
 
         # ------------- Binned plots of gamma flux ------------
@@ -1523,8 +1654,7 @@ class SphereSDDRoutput(SphereOutput):
                     "Energy [MeV]",
                     self.testname,
                 )
-                outfile = plot.plot("Binned graph")
-                atlas.insert_img(outfile)
+                atlas.insert_plot(plot, "Binned graph")
 
         # --- Wave plots flux ---
         # Do this block only if libs are more than one
@@ -1616,8 +1746,7 @@ class SphereSDDRoutput(SphereOutput):
                 plot = plotter.Plotter(
                     datapiece, title, outpath, outname, quantity, unit, xlabel, testname
                 )
-                outfile = plot.plot("Waves")
-                atlas.insert_img(outfile)
+                atlas.insert_plot(plot, "Waves")
 
             # --- Single wave plot for each material ---
             atlas.doc.add_heading("Materials ratio plot", level=1)
@@ -1657,15 +1786,13 @@ class SphereSDDRoutput(SphereOutput):
                 plot = plotter.Plotter(
                     data, title, outpath, outname, quantity, unit, xlabel, testname
                 )
-                outfile = plot.plot("Waves")
-                atlas.insert_img(outfile)
+                atlas.insert_plot(plot, "Waves")
 
         ########
         print(" Building...")
         if self.d1s:
             atlas.save(self.atlas_path)
-        # Remove tmp images
-        shutil.rmtree(outpath)
+        renderer.close()
 
     def _extract_data4plots(self, zaid, mt, lib, time):
         """_summary_
@@ -1726,6 +1853,38 @@ class SphereSDDRoutput(SphereOutput):
 
             self.outputs["d1s"] = outputs
 
+        results, errors, stat_checks = self._get_single_dfs(
+            results, errors, stat_checks
+        )
+
+        # self.outputs = outputs
+
+        return outputs, results, errors, stat_checks
+
+    def _get_single_dfs(self, results, errors, stat_checks):
+        """
+        Build the excel single post processing DataFrames from the results of
+        the parsing
+
+        Parameters
+        ----------
+        results : list
+            List of results series
+        errors : list
+            List of errors series
+        stat_checks : list
+            List of stat checks dictionaries
+
+        Returns
+        -------
+        results : pd.DataFrame
+            global excel datataframe of all values.
+        errors : pd.DataFrame
+            global excel dataframe of all errors.
+        stat_checks : pd.DataFrame
+            global excel dataframe of all statistical checks.
+
+        """
         # Generate DataFrames
         results = pd.concat(results, axis=1).T
         errors = pd.concat(errors, axis=1).T
@@ -1737,80 +1896,57 @@ class SphereSDDRoutput(SphereOutput):
             self._sort_df(df)  # it is sorted in place
             df.set_index("Parent")
 
-        # self.outputs = outputs
-
-        return outputs, results, errors, stat_checks
+        return results, errors, stat_checks
 
-    def _compute_compare_result(self, reflib, tarlib):
+    def _compute_compare_results(self):
         """
-        Given a reference lib and a target lib, both absolute and relative
-        comparison are computed
-
-        Parameters
-        ----------
-        reflib : str
-            reference library suffix.
-        tarlib : str
-            target library suffix.
+        Compute both absolute and relative comparison between the reference
+        library and all the target ones. Each library is parsed only once.
 
         Returns
         -------
-        final : pd.DataFrame
-            relative comparison table.
-        absdiff : pd.DataFrame
-            absolute comparison table.
-        std_dev:
-            comparison in std. dev. from mean table
-
-        """
-        # Get results both of the reflib and tarlib
-        comp_dfs = []
-        error_dfs = []
-        lib_dics = []
+        comparisons : dict[str, tuple[pd.DataFrame]]
+            for each target library, (relative comparison table, absolute
+            comparison table, comparison in std. dev. from mean table)
+        singles : dict[str, tuple[pd.DataFrame]]
+            for each library, the single post processing (results, errors,
+            stat_checks) tables.
+
+        """
+        # Get results of all libraries
+        values = {}
+        errors = {}
+        singles = {}
         code_outputs = {}
-        test_paths = [self.test_path[reflib], self.test_path[tarlib]]
-        libs = [reflib, tarlib]
-        for test_path, lib in zip(test_paths, libs):
+        reflib = self.couples[0][0]
+        for lib in self.lib:
             # Extract all the series from the different reactions
             # Collect the data
-            outputs, results, errors, _ = self._parserunmcnp(test_path, lib)
+            outputs, results, lib_errors, stat_checks = self._parserunmcnp(
+                self.test_path[lib], lib
+            )
             # Build the df and sort
-            comp_df = pd.concat(results, axis=1).T
-            error_df = pd.concat(errors, axis=1).T
-            for df in [comp_df, error_df]:
-                self._sort_df(df)
-                # They need to be indexed
-                df.set_index(["Parent", "Parent Name", "MT"], inplace=True)
-                # Add the df to the list
-            comp_dfs.append(comp_df)
-            error_dfs.append(error_df)
-            lib_dics.append(outputs)
-        for dic in lib_dics:
-            code_outputs.update(dic)
+            singles[lib] = self._get_single_dfs(results, lib_errors, stat_checks)
+            comp_df, error_df, _ = singles[lib]
+            # They need to be indexed
+            values[lib] = comp_df.set_index(["Parent", "Parent Name", "MT"])
+            errors[lib] = error_df.set_index(["Parent", "Parent Name", "MT"])
+            code_outputs.update(outputs)
         self.outputs["d1s"] = code_outputs
-        # Consider only common zaids
-        idx1 = comp_dfs[0].index
-        idx2 = comp_dfs[1].index
-        newidx = idx1.intersection(idx2)
-        # For some reason they arrive here as objects triggering
-        # a ZeroDivisionError
-        ref = comp_dfs[0].loc[newidx].astype(float)
-        tar = comp_dfs[1].loc[newidx].astype(float)
-        ref_err = error_dfs[1].loc[newidx].astype(float)
-
-        # Build the final excel data
-        absdiff = ref - tar
-        final = absdiff / ref
-        std_dev = absdiff / ref_err
+
+        # Consider only common zaids, the distance in std. dev. is computed
+        # using the target errors
+        comparisons = compare_libraries(values, errors, reflib, sigma_ref=False)
 
         # If it is zero the CS are equal! (NaN if both zeros)
-        for df in [final, absdiff, std_dev]:
-            df.replace(np.nan, "Not Available", inplace=True)
-            df.replace(float(0), "Identical", inplace=True)
-            df.replace(-np.inf, "Reference = 0", inplace=True)
-            df.replace(1, "Target = 0", inplace=True)
+        for comparison in comparisons.values():
+            for df in comparison:
+                df.replace(np.nan, "Not Available", inplace=True)
+                df.replace(float(0), "Identical", inplace=True)
+                df.replace(-np.inf, "Reference = 0", inplace=True)
+                df.replace(1, "Target = 0", inplace=True)
 
-        return final, absdiff, std_dev
+        return comparisons, singles
 
     @staticmethod
     def _sort_df(df):
@@ -1877,8 +2013,9 @@ class SphereSDDRoutput(SphereOutput):
         errors = []
         stat_checks = []
         outputs = {}
-        for folder in os.listdir(test_path):
-            results_path = os.path.join(test_path, folder, "d1s")
+        folders = sorted(os.listdir(test_path))
+        keys = []
+        for folder in folders:
             pieces = folder.split("_")
             # Get zaid
             zaidnum = pieces[1]
@@ -1890,24 +2027,17 @@ class SphereSDDRoutput(SphereOutput):
                 # it is a simple zaid
                 zaidname = pieces[2]
                 mt = pieces[3]
-            # Get mfile
-            for file in os.listdir(results_path):
-                if file[-1] == "m":
-                    mfile = file
-                elif file[-1] == "o":
-                    ofile = file
-                # Parse output
-            output = SphereSDDRMCNPoutput(
-                os.path.join(results_path, mfile), os.path.join(results_path, ofile)
-            )
+            keys.append((zaidnum, zaidname, mt))
 
+        arguments = [(os.path.join(test_path, folder, "d1s"),) for folder in folders]
+        # Parse outputs
+        parsed = parse_outputs(_parse_sphere_sddr, arguments, self.n_workers)
+        for (zaidnum, zaidname, mt), (output, res, err) in zip(keys, parsed):
             outputs[zaidnum, mt, lib] = output
             # Adjourn raw Data
             self.raw_data["d1s"][zaidnum, mt, lib] = output.tallydata
             # Recover statistical checks
             st_ck = output.stat_checks
-            # Recover results and precisions
-            res, err = output.get_single_excel_data()
             for series in [res, err, st_ck]:
                 series["Parent"] = zaidnum
                 series["Parent Name"] = zaidname
@@ -1920,10 +2050,29 @@ class SphereSDDRoutput(SphereOutput):
 
     def print_raw(self):
         """
-        Assigns a path and prints the post processing data as a .csv
+        Dump the raw data in a dataset for each library and, if requested in
+        the configuration, as .csv files
 
         """
         if self.d1s:
+            # One dataset for each library, partitioned by zaid, MT and tally
+            frames = {}
+            for (zaidnum, mt, lib), data in self.raw_data["d1s"].items():
+                frames.setdefault(lib, {})
+                for tallynum, df in data.items():
+                    frames[lib][zaidnum, mt, tallynum] = df
+            for lib, lib_frames in frames.items():
+                dataset = rawstore.get_dataset_path(
+                    self.raw_path, lib, self.testname, "d1s"
+                )
+                rawstore.write_dataset(dataset, lib_frames, ["Zaid", "MT", "Tally"])
+            tables = [
+                ("{}_{}".format(zaidnum, mt), tallynum, None, df)
+                for (zaidnum, mt, tallynum), df in frames.get(self.lib, {}).items()
+            ]
+            self._add_to_warehouse("d1s", tables)
+
+        if self.d1s and self.raw_csv:
             for key, data in self.raw_data["d1s"].items():
                 foldername = "{}_{}".format(key[0], key[1])
                 folder = os.path.join(self.raw_path, foldername)
@@ -2023,3 +2172,91 @@ class SphereSDDRMCNPoutput(SphereMCNPoutput):
         errors = pd.concat([pfluxerrors, sddrerrors, heaterrors, nfluxerrors], axis=0)
 
         return vals, errors
+
+
+class SphereParsedOutput(ParsedOutput, SphereTallyOutput):
+    """
+    Compact Sphere output, it still allows to recover the excel data
+    """
+
+
+def _parse_sphere_mcnp(results_path, tallies2pp):
+    """
+    Parse a single MCNP Sphere run folder. Defined at module level so that it
+    can be executed by a worker process.
+
+    Parameters
+    ----------
+    results_path : path like object
+        path to the folder containing the MCNP outputs.
+    tallies2pp : list of str
+        tallies to be included in the excel data.
+
+    Returns
+    -------
+    output : SphereParsedOutput
+        compact parsed output.
+    res : dict
+        excel results of the different tallies.
+    err : dict
+        average errors of the different tallies.
+
+    """
+    mfile, ofile = SphereOutput._get_output_files(results_path)
+    output = SphereMCNPoutput(mfile, ofile)
+    res, err = output.get_single_excel_data(tallies2pp)
+
+    return SphereParsedOutput.from_output(output), res, err
+
+
+def _parse_sphere_openmc(tallies_file):
+    """
+    Parse a single OpenMC Sphere run. Defined at module level so that it
+    can be executed by a worker process.
+
+    Parameters
+    ----------
+    tallies_file : path like object
+        path to the OpenMC tallies.out file.
+
+    Returns
+    -------
+    output : SphereParsedOutput
+        compact parsed output.
+    res : dict
+        excel results of the different tallies.
+    err : dict
+        average errors of the different tallies.
+
+    """
+    output = SphereOpenMCoutput(tallies_file)
+    res, err = output.get_single_excel_data(OPENMC_TALLIES)
+
+    return SphereParsedOutput.from_output(output), res, err
+
+
+def _parse_sphere_sddr(results_path):
+    """
+    Parse a single D1S SphereSDDR run folder. Defined at module level so that
+    it can be executed by a worker process.
+
+    Parameters
+    ----------
+    results_path : path like object
+        path to the folder containing the D1S outputs.
+
+    Returns
+    -------
+    output : ParsedOutput
+        compact parsed output.
+    res : pd.Series
+        results of the single reaction.
+    err : pd.Series
+        errors of the single reaction.
+
+    """
+    mfile, ofile = SphereOutput._get_output_files(results_path)
+    output = SphereSDDRMCNPoutput(mfile, ofile)
+    res, err = output.get_single_excel_data()
+
+    return ParsedOutput.from_output(output), res, err
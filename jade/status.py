@@ -23,8 +23,12 @@ along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
 
+import json
 import os
 import re
+import sqlite3
+import time
+from contextlib import closing
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -47,6 +51,22 @@ MULTI_TEST = [
 ]
 EXP_TAG = "Exp"
 CODES = ["mcnp", "serpent", "openmc", "d1s"]
+STATUS_INDEX = "Status_Index.db"
+# Folders modified less than this before being listed could still change
+# without a new mtime (coarse timestamps), they are listed again next time
+RACY_WINDOW_NS = 2 * 10**9
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    inode INTEGER,
+    mtime_ns INTEGER,
+    dirs TEXT NOT NULL,
+    files TEXT NOT NULL
+);
+"""
+
+CRED = "\033[91m"
+CEND = "\033[0m"
 
 
 class Status:
@@ -72,6 +92,11 @@ class Status:
 
         self.config = session.conf
 
+        # Persistent index of the folders content
+        self.index = StatusIndex(
+            os.path.join(session.path_cache, STATUS_INDEX), self.test_path
+        )
+
         # Initialize run tree
         self.run_tree = self.update_run_status()
         # Initialize pp trees
@@ -91,31 +116,30 @@ class Status:
         """
 
         # Create nested dictionaries to store info on libraries, tests, codes
-        # and files.
+        # and files. Only the folders changed since the last update are
+        # listed again.
+        index = self.index
         libraries = {}
-        for lib in os.listdir(self.run_path):
+        for lib in index.list_folders(self.run_path):
             libraries[lib] = {}
             cp = os.path.join(self.run_path, lib)
-            for test in os.listdir(cp):
+            for test in index.list_folders(cp):
                 if test in MULTI_TEST:
                     libraries[lib][test] = {}
                     cp1 = os.path.join(cp, test)
-                    for zaid in os.listdir(cp1):
+                    for zaid in index.list_folders(cp1):
                         libraries[lib][test][zaid] = {}
                         cp2 = os.path.join(cp1, zaid)
-                        for code in os.listdir(cp2):
-                            libraries[lib][test][zaid][code] = []
+                        for code in index.list_folders(cp2):
                             cp3 = os.path.join(cp2, code)
-                            for file in os.listdir(cp3):
-                                libraries[lib][test][zaid][code].append(file)
+                            libraries[lib][test][zaid][code] = index.listdir(cp3)
                 else:
                     libraries[lib][test] = {}
                     cp1 = os.path.join(cp, test)
-                    for code in os.listdir(cp1):
-                        libraries[lib][test][code] = []
+                    for code in index.list_folders(cp1):
                         cp2 = os.path.join(cp1, code)
-                        for file in os.listdir(cp2):
-                            libraries[lib][test][code].append(file)
+                        libraries[lib][test][code] = index.listdir(cp2)
+        index.save()
 
         # Update tree
         self.run_tree = libraries
@@ -138,29 +162,27 @@ class Status:
             single libraries.
 
         """
+        index = self.index
         # Read comparison tree
         comparison_tree = {}
         cp = self.comparison_path
-        for lib in os.listdir(cp):
+        for lib in index.list_folders(cp):
             comparison_tree[lib] = {}
             cp1 = os.path.join(cp, lib)
-            for test in os.listdir(cp1):
-                comparison_tree[lib][test] = []
+            for test in index.list_folders(cp1):
                 cp2 = os.path.join(cp1, test)
-                for code in os.listdir(cp2):
-                    comparison_tree[lib][test].append(code)
+                comparison_tree[lib][test] = index.list_folders(cp2)
 
         # Read Single library tree
         single_tree = {}
         cp = self.single_path
-        for lib in os.listdir(cp):
+        for lib in index.list_folders(cp):
             single_tree[lib] = {}
             cp1 = os.path.join(cp, lib)
-            for test in os.listdir(cp1):
-                single_tree[lib][test] = []
+            for test in index.list_folders(cp1):
                 cp2 = os.path.join(cp1, test)
-                for code in os.listdir(cp2):
-                    single_tree[lib][test].append(code)
+                single_tree[lib][test] = index.list_folders(cp2)
+        index.save()
 
         # Update Trees
         self.comparison_tree = comparison_tree
@@ -168,6 +190,26 @@ class Status:
 
         return comparison_tree, single_tree
 
+    def register(self, path: str | os.PathLike) -> None:
+        """
+        Register a folder modified by JADE (e.g. a benchmark that has been
+        generated, run or post-processed). The folder is listed again at the
+        next update of the trees even if its modification time did not
+        change.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            modified folder.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.index.invalidate(path)
+        self.index.save()
+
     def get_path(self, tree: str, itinerary: list[str]) -> str | os.PathLike:
         """
         Get the resulting path of an itinery on one tree
@@ -343,7 +385,9 @@ class Status:
                 flag_run_test = True
         return flag_run_test
 
-    def check_override_run(self, lib: str, session: Session, exp: bool = False) -> bool:
+    def check_override_run(
+        self, lib: str, session: Session, exp: bool = False, override: bool = None
+    ) -> bool:
         """
         Check status of the requested run. If overridden is required permission
         is requested to the user
@@ -356,6 +400,10 @@ class Status:
             Jade Session.
         exp : False
             if True checks the experimental benchmarks. Default is False
+        override : bool, optional
+            answer to give to the override request without asking the user
+            (e.g. in batch mode). The default is None, meaning that the user
+            is asked.
 
         Returns
         -------
@@ -384,12 +432,17 @@ class Status:
                     for test in test_runned:
                         print(" - " + code + ": " + test)
 
-                print(
-                    """
+                if override is None:
+                    print(
+                        """
     You can manage the selection of benchmarks to run in the Config.xlsx file
     """
-                )
-                i = input(" Would you like to override the results?(y/n) ")
+                    )
+                    i = input(" Would you like to override the results?(y/n) ")
+                elif override:
+                    i = "y"
+                else:
+                    i = "n"
 
                 if i == "y":
                     logtext = "\nThe following test results have been overwritten:"
@@ -568,6 +621,9 @@ class Status:
             list of libraries that need to be single post-processed
         lib_input: str
             libraries input that were given
+        force: Boolean
+            True if all the outputs of the previous PP have to be rebuilt,
+            otherwise only the outdated ones are.
 
         """
         lib_input = input(" Libraries to post-process (e.g. 31c-71c): ")
@@ -576,10 +632,10 @@ class Status:
         libs = lib_input.split("-")
 
         if lib_input == "back":
-            return None, None, lib_input
+            return None, None, lib_input, False
 
         if lib_input == "exit":
-            return None, None, lib_input
+            return None, None, lib_input, False
         if exp:
             tagpp = "Comparison"
         else:
@@ -587,7 +643,7 @@ class Status:
                 tagpp = "Single Libraries"
             elif len(libs) > 1 and force_one_lib:
                 print("Please select only one library")
-                return False, None, None
+                return False, None, None, False
             else:
                 tagpp = "Comparison"
 
@@ -604,6 +660,7 @@ class Status:
                     code_not_run.append(code)
 
         to_single_pp = []
+        force = False
 
         if flag_not_run:
             ans = False
@@ -627,28 +684,20 @@ class Status:
                 if len(to_single_pp) == 0:
                     lib = libs[0]
                     to_single_pp = [lib]
-                    while True:
-                        print(
-                            """
+                    print(
+                        """
  One or more benchmark were already post-processed for this library.
  You can manage the selection of benchmarks in the Config.xlsx file.
 """
+                    )
+                    ans, force = self._ask_update()
+                    if force:
+                        logtext = (
+                            "\nThe Post-Process for library "
+                            + str(lib)
+                            + " has been overwritten"
                         )
-                        i = input(" Would you like to override the results?(y/n) ")
-                        if i == "y":
-                            ans = True
-                            logtext = (
-                                "\nThe Post-Process for library "
-                                + str(lib)
-                                + " has been overwritten"
-                            )
-                            session.log.adjourn(logtext)
-                            break
-                        elif i == "n":
-                            ans = False
-                            break
-                        else:
-                            print('\n please select one between "y" or "n"')
+                        session.log.adjourn(logtext)
 
                 else:
                     ans = True
@@ -670,31 +719,246 @@ class Status:
                 )
                 # Ask for override
                 if override:
-                    while True:
-                        print(
-                            """
+                    print(
+                        """
  A comparison for these libraries was already performed.
 """
+                    )
+                    ans, force = self._ask_update()
+                    if force:
+                        logtext = (
+                            "\nThe Post-Process for libraries "
+                            + str(lib)
+                            + " has been overwritten"
                         )
-                        i = input(" Would you like to override the results?(y/n) ")
-                        if i == "y":
-                            ans = True
-                            logtext = (
-                                "\nThe Post-Process for libraries "
-                                + str(lib)
-                                + " has been overwritten"
-                            )
-                            session.log.adjourn(logtext)
-                            break
-                        elif i == "n":
-                            ans = False
-                            break
-                        else:
-                            print('\n please select one between "y" or "n"')
+                        session.log.adjourn(logtext)
                 else:
                     ans = True
 
-        return ans, to_single_pp, lib_input
+        return ans, to_single_pp, lib_input, force
+
+    @staticmethod
+    def _ask_update() -> tuple[bool, bool]:
+        """
+        Ask how to treat the results of a previous post-processing: update
+        them (default, only the outdated outputs are rebuilt), override them
+        (all the outputs are rebuilt) or keep them.
+
+        Returns
+        -------
+        ans: Boolean
+            True if the PP can begin.
+        force: Boolean
+            True if all the outputs have to be rebuilt.
+        """
+        while True:
+            i = input(
+                " Would you like to update (u, default), override (y) or keep (n)"
+                " the results? "
+            )
+            if i in ["", "u"]:
+                return True, False
+            elif i == "y":
+                return True, True
+            elif i == "n":
+                return False, False
+            else:
+                print('\n please select one between "u", "y" or "n"')
+
+
+class StatusIndex:
+    def __init__(self, path: str | os.PathLike, root: str | os.PathLike) -> None:
+        """
+        Persistent (SQLite) index of the content of the JADE folders. A
+        folder is listed again with os.scandir only if its modification time
+        changed since it was indexed, otherwise the stored content is used.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            path to the database file. It is created if it does not exist.
+        root : str | os.PathLike
+            the folders are stored relative to this path, so that the index
+            is still valid if the JADE tree is moved.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = path
+        self.root = root
+        # relative path -> ((inode, mtime_ns), subfolders, files)
+        self._folders = {}
+        self._changed = set()
+        self._removed = set()
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with closing(sqlite3.connect(path)) as con:
+                con.executescript(INDEX_SCHEMA)
+                for key, inode, mtime, dirs, files in con.execute(
+                    "SELECT * FROM folders"
+                ):
+                    stamp = (inode, mtime)
+                    self._folders[key] = (stamp, json.loads(dirs), json.loads(files))
+        except (OSError, sqlite3.Error) as e:
+            print(
+                CRED
+                + " The status index could not be read ({}),".format(e)
+                + " all folders will be listed."
+                + CEND
+            )
+
+    def scan(self, path: str | os.PathLike) -> tuple[list[str], list[str]]:
+        """
+        Get the content of a folder, it is listed again only if it changed
+        (or was replaced by another one) since the last scan.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            folder to scan.
+
+        Returns
+        -------
+        dirs : list[str]
+            sorted names of the subfolders.
+        files : list[str]
+            sorted names of the other entries.
+
+        """
+        key = os.path.relpath(path, self.root)
+        stat = os.stat(path)
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._folders.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+
+        dirs = []
+        files = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+        dirs.sort()
+        files.sort()
+
+        # Subtrees that do not exist anymore are dropped
+        if cached is not None:
+            for name in set(cached[1]).difference(dirs):
+                self._forget(os.path.join(key, name))
+
+        if time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS:
+            stamp = (stat.st_ino, None)
+        self._folders[key] = (stamp, dirs, files)
+        self._changed.add(key)
+        self._removed.discard(key)
+
+        return dirs, files
+
+    def list_folders(self, path: str | os.PathLike) -> list[str]:
+        """
+        Get the subfolders of a folder
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            folder to scan.
+
+        Returns
+        -------
+        list[str]
+            sorted names of the subfolders.
+
+        """
+        return list(self.scan(path)[0])
+
+    def listdir(self, path: str | os.PathLike) -> list[str]:
+        """
+        Get all the entries of a folder, as os.listdir
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            folder to scan.
+
+        Returns
+        -------
+        list[str]
+            sorted names of the entries.
+
+        """
+        dirs, files = self.scan(path)
+        return sorted(dirs + files)
+
+    def invalidate(self, path: str | os.PathLike) -> None:
+        """
+        Drop a folder and its subtree from the index, its parent folders are
+        listed again too.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            folder to invalidate.
+
+        Returns
+        -------
+        None.
+
+        """
+        key = os.path.relpath(path, self.root)
+        self._forget(key)
+        while key not in ["", os.curdir]:
+            key = os.path.dirname(key)
+            parent = key if key != "" else os.curdir
+            cached = self._folders.get(parent)
+            if cached is not None:
+                self._folders[parent] = ((None, None), cached[1], cached[2])
+                self._changed.add(parent)
+
+    def save(self) -> None:
+        """
+        Store the changes of the index in the database.
+
+        Returns
+        -------
+        None.
+
+        """
+        if len(self._changed) == 0 and len(self._removed) == 0:
+            return
+
+        rows = []
+        for key in self._changed:
+            (inode, mtime), dirs, files = self._folders[key]
+            rows.append((key, inode, mtime, json.dumps(dirs), json.dumps(files)))
+        try:
+            with closing(sqlite3.connect(self.path)) as con:
+                with con:
+                    con.executemany(
+                        "DELETE FROM folders WHERE path = ?",
+                        [(key,) for key in self._removed],
+                    )
+                    con.executemany(
+                        "INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+        except sqlite3.Error as e:
+            print(CRED + " The status index could not be saved ({})".format(e) + CEND)
+        self._changed.clear()
+        self._removed.clear()
+
+    def _forget(self, key: str) -> None:
+        """Remove a folder and all its subfolders from the index"""
+        prefix = os.path.join(key, "") if key != os.curdir else ""
+        for folder in list(self._folders):
+            if folder == key or folder.startswith(prefix):
+                del self._folders[folder]
+                self._changed.discard(folder)
+                self._removed.add(folder)
 
 
 # def gen_dict_extract(key, var):
@@ -1251,6 +1251,9 @@ class SphereTestSDDR(SphereTest):
         activationlib, transportlib = check_transport_activation(self.lib)
         self.activationlib = activationlib
         self.transportlib = transportlib
+        # the irradiation file is parsed only once, see
+        # _generate_irradiation_file
+        self._irradfile = None
 
     def generate_test(self, directory, libmanager, limit=None, lib=None):
         super().generate_test(
@@ -1456,7 +1459,7 @@ class SphereTestSDDR(SphereTest):
     def _generate_irradiation_file(self, daughters):
         """
         Generate a D1S irradiation file selecting irradiation schedules from
-        an existing file.
+        an existing file. The existing file is parsed only once for each test.
 
         Parameters
         ----------
@@ -1471,29 +1474,27 @@ class SphereTestSDDR(SphereTest):
             the object was created without issues
 
         """
-        try:
+        if self._irradfile is None:
             filepath = os.path.join(self.test_conf_path, "irrad_" + self.activationlib)
-        except FileNotFoundError:
-            print(
-                CRED
-                + """
+            try:
+                self._irradfile = IrradiationFile.from_text(filepath)
+            except FileNotFoundError:
+                print(
+                    CRED
+                    + """
  Please provide an irradiation file summary for lib {}. Check the documentation
  for additional details. The application will now exit.
                   """.format(
-                    self.activationlib
+                        self.activationlib
+                    )
+                    + CEND
                 )
-                + CEND
-            )
-            sys.exit()
+                sys.exit()
 
-        irradfile = IrradiationFile.from_text(filepath)
         # Keep only useful irradiations
-        new_irradiations = []
-        for irradiation in irradfile.irr_schedules:
-            if irradiation.daughter in daughters:
-                new_irradiations.append(irradiation)
+        irradfile, missing = self._irradfile.select(daughters)
 
-        if len(new_irradiations) != len(daughters):
+        if len(missing) > 0:
             print(
                 CORANGE
                 + """
@@ -1505,7 +1506,6 @@ class SphereTestSDDR(SphereTest):
         else:
             ans = True
 
-        irradfile.irr_schedules = new_irradiations
         return irradfile, ans
 
 
@@ -1569,6 +1569,7 @@ class MultipleTest:
 
         """
         self.MCNPdir = os.path.join(lib_directory, self.name)
+        self.run_dir = self.MCNPdir
         safe_override(self.MCNPdir)
         for test in self.tests:
             mcnp_dir = os.path.join(self.MCNPdir, test.name)
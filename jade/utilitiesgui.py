@@ -24,10 +24,8 @@ along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 import os
 from functools import reduce
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import xlsxwriter
 from tqdm import tqdm
 
 import jade.inputfile as ipt
@@ -94,7 +92,8 @@ def translate_input(session, lib, inputfile, outpath=None):
 
 
 def print_libraries(libmanager):
-    print(libmanager.libraries)
+    # libraries are loaded on demand for each code
+    print({code: libmanager.libraries[code] for code in libmanager.codes})
 
 
 def print_material_info(session, filepath, outpath=None):
@@ -120,6 +119,9 @@ def print_material_info(session, filepath, outpath=None):
         If False there was a permission error on the input or output file.
 
     """
+    # The Excel stack is loaded only when needed
+    import xlsxwriter
+
     lib_manager = session.lib_manager
 
     try:
@@ -530,6 +532,9 @@ def _rmv_runtpe_file(folder):
 
 
 def print_XS_EXFOR(session):
+    # The plotting stack is loaded only when needed
+    import matplotlib.pyplot as plt
+
     # dict of ENDF reactions MT number
     ENDF_X4_dict = {
         1: "N,TOT",
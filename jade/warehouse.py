@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+"""
+@author: JADE Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+
+Cross-library results warehouse. Each single library post-processing adds
+its tallies results to a SQLite database, where they are keyed by library,
+benchmark, code, input, tally and bin. Trends across libraries can then be
+obtained without parsing the simulation outputs again.
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+import pandas as pd
+
+WAREHOUSE_FILE = "Results_Warehouse.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lib TEXT NOT NULL,
+    benchmark TEXT NOT NULL,
+    code TEXT NOT NULL,
+    date TEXT NOT NULL,
+    UNIQUE (benchmark, code, lib)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    input TEXT NOT NULL,
+    tally TEXT NOT NULL,
+    title TEXT,
+    bin TEXT NOT NULL,
+    x REAL,
+    value REAL,
+    error REAL
+);
+CREATE INDEX IF NOT EXISTS results_key ON results (run_id, input, tally);
+"""
+# Columns of the query results
+COLUMNS = [
+    "lib",
+    "benchmark",
+    "code",
+    "input",
+    "tally",
+    "title",
+    "bin",
+    "x",
+    "value",
+    "error",
+]
+
+
+class ResultsWarehouse:
+    def __init__(self, path):
+        """
+        SQLite database collecting the results of the single library
+        post-processing of all libraries. It is created if it does not exist.
+
+        Parameters
+        ----------
+        path : path like object
+            path to the database file.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = path
+        with closing(self._connect()) as con:
+            con.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def add_results(self, lib, benchmark, code, tables):
+        """
+        Add the results of a single library post-processing. Results
+        previously stored for the same library, benchmark and code are
+        replaced.
+
+        Parameters
+        ----------
+        lib : str
+            library suffix.
+        benchmark : str
+            name of the benchmark.
+        code : str
+            transport code.
+        tables : iterable
+            (input, tally number, tally title, tally data) tuples. The tally
+            data is a long format DataFrame with 'Value' and 'Error' columns,
+            all the other columns are considered bins. Tables without a
+            'Value' column are skipped.
+
+        Returns
+        -------
+        None.
+
+        """
+        rows = []
+        for input_name, tally, title, df in tables:
+            if "Value" not in df.columns:
+                continue
+            for bin_name, x, value, error in _get_bins(df):
+                rows.append(
+                    (str(input_name), str(tally), title, bin_name, x, value, error)
+                )
+
+        date = datetime.datetime.now().isoformat(timespec="seconds")
+        with closing(self._connect()) as con:
+            with con:
+                # The previous run is removed so that the new one is the last
+                previous = con.execute(
+                    "SELECT run_id FROM runs WHERE benchmark = ? AND code = ? "
+                    "AND lib = ?",
+                    (benchmark, code, lib),
+                ).fetchone()
+                if previous is not None:
+                    con.execute("DELETE FROM results WHERE run_id = ?", previous)
+                    con.execute("DELETE FROM runs WHERE run_id = ?", previous)
+                run_id = con.execute(
+                    "INSERT INTO runs (lib, benchmark, code, date) VALUES (?, ?, ?, ?)",
+                    (lib, benchmark, code, date),
+                ).lastrowid
+                con.executemany(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id,) + row for row in rows],
+                )
+
+    def runs(self, benchmark=None, code=None):
+        """
+        Get the post-processing runs stored in the warehouse, from the oldest
+        to the newest.
+
+        Parameters
+        ----------
+        benchmark : str, optional
+            select only this benchmark. The default is None.
+        code : str, optional
+            select only this code. The default is None.
+
+        Returns
+        -------
+        pd.DataFrame
+            library, benchmark, code and date of the runs.
+
+        """
+        where, params = _where({"benchmark": benchmark, "code": code})
+        sql = "SELECT lib, benchmark, code, date FROM runs{} ORDER BY run_id"
+        with closing(self._connect()) as con:
+            return pd.read_sql_query(sql.format(where), con, params=params)
+
+    def query(
+        self,
+        lib=None,
+        benchmark=None,
+        code=None,
+        input=None,
+        tally=None,
+        bin_like=None,
+    ):
+        """
+        Get the stored results. Each selection can be a single value or a list
+        of values, None means no selection.
+
+        Parameters
+        ----------
+        lib : str or list, optional
+            library suffixes.
+        benchmark : str or list, optional
+            benchmark names.
+        code : str or list, optional
+            transport codes.
+        input : str or list, optional
+            inputs of the benchmark (e.g. zaid numbers or material names for
+            the Sphere benchmark).
+        tally : int, str or list, optional
+            tally numbers.
+        bin_like : str, optional
+            SQL LIKE pattern of the bins (e.g. 'Cells=2,%').
+
+        Returns
+        -------
+        pd.DataFrame
+            results, with the columns listed in COLUMNS.
+
+        """
+        selection = {
+            "runs.lib": lib,
+            "runs.benchmark": benchmark,
+            "runs.code": code,
+            "results.input": input,
+            "results.tally": tally,
+        }
+        where, params = _where(selection)
+        if bin_like is not None:
+            where += " AND" if where else " WHERE"
+            where += " results.bin LIKE ?"
+            params.append(bin_like)
+        sql = (
+            "SELECT runs.lib, runs.benchmark, runs.code, results.input, "
+            "results.tally, results.title, results.bin, results.x, "
+            "results.value, results.error "
+            "FROM results JOIN runs ON results.run_id = runs.run_id{} "
+            "ORDER BY runs.run_id, results.rowid"
+        )
+        with closing(self._connect()) as con:
+            df = pd.read_sql_query(sql.format(where), con, params=params)
+        df.columns = COLUMNS
+        return df
+
+    def trend(
+        self,
+        benchmark,
+        input,
+        tally,
+        code="mcnp",
+        libs=None,
+        last=None,
+        quantity="value",
+        bin_like=None,
+    ):
+        """
+        Build the table of a tally results across libraries.
+
+        Parameters
+        ----------
+        benchmark : str
+            name of the benchmark.
+        input : str
+            input of the benchmark.
+        tally : int or str
+            tally number.
+        code : str, optional
+            transport code. The default is 'mcnp'.
+        libs : list, optional
+            libraries to be included (in this order). The default is None,
+            meaning all the stored ones, from the oldest to the newest.
+        last : int, optional
+            keep only the last libraries added to the warehouse. The default
+            is None.
+        quantity : str, optional
+            'value' or 'error'. The default is 'value'.
+        bin_like : str, optional
+            SQL LIKE pattern of the bins. The default is None.
+
+        Returns
+        -------
+        pd.DataFrame
+            one row for each bin and one column for each library.
+
+        """
+        df = self.query(
+            lib=libs,
+            benchmark=benchmark,
+            code=code,
+            input=input,
+            tally=tally,
+            bin_like=bin_like,
+        )
+        order = list(pd.unique(df["lib"]))
+        if libs is not None:
+            order = [lib for lib in libs if lib in order]
+        if last is not None:
+            order = order[-last:]
+        bins = pd.unique(df["bin"])
+        table = df.set_index(["bin", "lib"])[quantity].unstack("lib")
+        table = table.reindex(index=bins, columns=order)
+        table.columns.name = None
+        return table
+
+    def plot_trend(self, outpath, benchmark, input, tally, code="mcnp", **kwargs):
+        """
+        Plot a tally results across libraries. Bins that are not numbers
+        (e.g. 'total') are not plotted.
+
+        Parameters
+        ----------
+        outpath : path like object
+            path to the image to be saved.
+        benchmark : str
+            name of the benchmark.
+        input : str
+            input of the benchmark.
+        tally : int or str
+            tally number.
+        code : str, optional
+            transport code. The default is 'mcnp'.
+        **kwargs :
+            libs, last and bin_like, see trend().
+
+        Returns
+        -------
+        None.
+
+        """
+        from matplotlib.figure import Figure
+
+        table = self.trend(benchmark, input, tally, code=code, **kwargs)
+        df = self.query(benchmark=benchmark, code=code, input=input, tally=tally)
+        x = df.drop_duplicates("bin").set_index("bin")["x"].reindex(table.index)
+        table = table[x.notnull().values]
+        x = x.dropna().values
+
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        for lib in table.columns:
+            ax.step(x, table[lib].values, where="post", label=lib)
+        if len(x) > 0 and x.min() > 0 and x.max() / x.min() > 100:
+            ax.set_xscale("log")
+        ax.set_title("{} {} - tally {} ({})".format(benchmark, input, tally, code))
+        ax.set_ylabel("Value")
+        ax.legend()
+        ax.grid(True, which="major", alpha=0.5)
+        fig.savefig(outpath, bbox_inches="tight")
+
+
+def _get_bins(df):
+    """
+    Iterate on the (bin, x, value, error) of a long format tally table. The
+    bin is described by the values of all the bin columns, x is the value of
+    the last one if it is a number.
+    """
+    bin_columns = [col for col in df.columns if col not in ["Value", "Error"]]
+    if "Error" in df.columns:
+        errors = df["Error"].values
+    else:
+        errors = [None] * len(df)
+    for values, value, error in zip(df[bin_columns].values, df["Value"].values, errors):
+        bin_name = ", ".join(
+            "{}={}".format(col, _format_bin(val))
+            for col, val in zip(bin_columns, values)
+        )
+        try:
+            x = float(values[-1])
+        except (IndexError, TypeError, ValueError):
+            x = None
+        yield bin_name, x, _to_float(value), _to_float(error)
+
+
+def _format_bin(val):
+    if isinstance(val, float):
+        return "{:g}".format(val)
+    return str(val)
+
+
+def _to_float(val):
+    if val is None or pd.isnull(val):
+        return None
+    return float(val)
+
+
+def _where(selection):
+    """Build the WHERE clause of a query from the selected values"""
+    conditions = []
+    params = []
+    for column, values in selection.items():
+        if values is None:
+            continue
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        conditions.append("{} IN ({})".format(column, ", ".join("?" for _ in values)))
+        params.extend(str(val) for val in values)
+
+    if len(conditions) == 0:
+        return "", params
+    return " WHERE " + " AND ".join(conditions), params
+
+
+def main(argv=None):
+    """
+    Command line interface to query the results warehouse, e.g.
+
+        jade-results trend Sphere 26056 22 --last 8 --plot trend.png
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        command line arguments. The default is None, meaning sys.argv.
+
+    Returns
+    -------
+    None.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="jade-results", description="Query the JADE results warehouse"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.path.join("Tests", "Post-Processing", WAREHOUSE_FILE),
+        help="path to the warehouse (default: the one of the JADE tree in the "
+        "current directory)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    runs_parser = subparsers.add_parser("runs", help="list the stored runs")
+    runs_parser.add_argument("--benchmark")
+    runs_parser.add_argument("--code")
+
+    for name, text in [
+        ("query", "print the stored results"),
+        ("trend", "print a tally results across libraries"),
+    ]:
+        sub = subparsers.add_parser(name, help=text)
+        sub.add_argument("benchmark")
+        sub.add_argument("input", help="e.g. zaid number for the Sphere benchmark")
+        sub.add_argument("tally")
+        sub.add_argument("--code", default="mcnp")
+        sub.add_argument("--lib", nargs="+", help="libraries to be included")
+        sub.add_argument("--bin", dest="bin_like", help="SQL LIKE pattern of bins")
+        sub.add_argument("--csv", help="save the table to a .csv file")
+        if name == "trend":
+            sub.add_argument("--last", type=int, help="only the last N libraries")
+            sub.add_argument("--error", action="store_true", help="show errors")
+            sub.add_argument("--plot", help="save a plot of the trend")
+
+    args = parser.parse_args(argv)
+    if not os.path.isfile(args.db):
+        print(" The results warehouse {} does not exist".format(args.db))
+        sys.exit(1)
+    warehouse = ResultsWarehouse(args.db)
+
+    if args.command == "runs":
+        table = warehouse.runs(benchmark=args.benchmark, code=args.code)
+    elif args.command == "query":
+        table = warehouse.query(
+            lib=args.lib,
+            benchmark=args.benchmark,
+            code=args.code,
+            input=args.input,
+            tally=args.tally,
+            bin_like=args.bin_like,
+        )
+    else:
+        kwargs = {"libs": args.lib, "last": args.last, "bin_like": args.bin_like}
+        quantity = "error" if args.error else "value"
+        table = warehouse.trend(
+            args.benchmark,
+            args.input,
+            args.tally,
+            code=args.code,
+            quantity=quantity,
+            **kwargs,
+        )
+        if args.plot is not None:
+            warehouse.plot_trend(
+                args.plot, args.benchmark, args.input, args.tally, args.code, **kwargs
+            )
+
+    if args.command != "runs" and args.csv is not None:
+        table.to_csv(args.csv)
+    print(table.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,6 @@ or implied, of the stakeholders of the PyNE project or the employers of PyNE dev
 import math
 import os
 import sys
-from typing import List, Tuple
 
 
 class Xsdir(object):
@@ -76,13 +75,7 @@ class Xsdir(object):
 
         # It is useful to have a list of the available tables names to be
         # computed only once at initializations
-        tablenames = []
-        for table in self:
-            name = table.name
-            zaidname = name[:-4]
-            libname = name[-3:]
-            tablenames.append((zaidname, libname))
-        self.tablenames = tablenames
+        self._index_tablenames()
 
     def read(self):
         """Populate the Xsdir object by reading the file."""
@@ -163,6 +156,23 @@ class Xsdir(object):
                 )
                 pass
 
+    def _index_tablenames(self):
+        """Compute once the table names and the lookup structures used by
+        the 'exact' and 'default-fast' modes of find_table."""
+        tablenames = []
+        zaidlibs = {}
+        for table in self:
+            name = table.name
+            zaidname = name[:-4]
+            libname = name[-3:]
+            tablenames.append((zaidname, libname))
+            zaidlibs.setdefault(zaidname, []).append(libname)
+        self.tablenames = tablenames
+        self._exact_names = set(
+            zaidname + "." + libname for zaidname, libname in tablenames
+        )
+        self._zaidlibs = zaidlibs
+
     def find_table(self, name, mode="default"):
         """Find all tables for a given ZIAD.
         *Modified for JADE, a bug was corrected since table.name do not
@@ -184,7 +194,7 @@ class Xsdir(object):
         """
         if mode == "exact":
             # Faster, checks for the exact name
-            ans = self._exact_loop(name, self.tablenames)
+            ans = name in self._exact_names
 
         elif mode == "default":
             # Checks all available libraries for the zaid
@@ -197,27 +207,10 @@ class Xsdir(object):
             ans = tables
 
         elif mode == "default-fast":
-            ans = self._all_fast_loop(name, self.tablenames)
+            ans = list(self._zaidlibs.get(name, []))
 
         return ans
 
-    @staticmethod
-    def _exact_loop(name: str, tablenames: List[Tuple[str, str]]) -> bool:
-        for zaidname, libname in tablenames:
-            if name == zaidname + "." + libname:
-                return True
-
-        return False
-
-    @staticmethod
-    def _all_fast_loop(name: str, tablenames: List[Tuple[str, str]]) -> List[str]:
-        libs = []
-        for zaidname, libname in tablenames:
-            if name == zaidname:
-                libs.append(libname)
-
-        return libs
-
     #################  Added by Davide Laghi ###############################
     def find_zaids(self, lib):
         """Find all zaids for a given library.
@@ -319,13 +312,7 @@ class OpenMCXsdir(Xsdir):
 
         # It is useful to have a list of the available tables names to be
         # computed only once at initializations
-        tablenames = []
-        for table in self:
-            name = table.name
-            zaidname = name[:-4]
-            libname = name[-3:]
-            tablenames.append((zaidname, libname))
-        self.tablenames = tablenames
+        self._index_tablenames()
 
     def read(self, libmanager, library):
         for i, line in enumerate(self.f):
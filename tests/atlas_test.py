@@ -27,12 +27,15 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from copy import deepcopy
+from io import BytesIO
+from urllib.parse import unquote
+import docx
 
 cp = os.path.dirname(os.path.abspath(__file__))
 modules_path = os.path.dirname(cp)
 sys.path.insert(1, modules_path)
 
-from jade.atlas import Atlas
+from jade.atlas import Atlas, AtlasVolumes, sort_zaids
 
 TEMPLATE_PATH = os.path.join(cp, "TestFiles", "atlas", "template.docx")
 KEYARGS_DF = [{"caption": "yo", "highlight": True}, {}]
@@ -60,6 +63,28 @@ class TestAtlas:
         finally:
             shutil.rmtree("tmp")
 
+    def test_insert_images(self):
+        atlas = Atlas(TEMPLATE_PATH, "dummyname")
+        images = []
+        for section in ["Tally N.2", "Tally N.2", "Tally N.4"]:
+            # dummy in-memory plot
+            buffer = BytesIO()
+            plt.plot([1, 2], [1, 2])
+            plt.savefig(buffer, format="png")
+            plt.close()
+            buffer.seek(0)
+            images.append((section, "title", buffer))
+
+        n_headings = len(atlas.doc.paragraphs)
+        n_shapes = len(atlas.doc.inline_shapes)
+        atlas.insert_images(images)
+        headings = [
+            paragraph.text for paragraph in atlas.doc.paragraphs[n_headings:]
+            if paragraph.text != ""
+        ]
+        assert headings == ["Tally N.2", "title", "title", "Tally N.4", "title"]
+        assert len(atlas.doc.inline_shapes) - n_shapes == 3
+
     @pytest.mark.parametrize("keyargs", KEYARGS_DF)
     def test_insert_df(self, keyargs):
         self.atlas.insert_df(self.df, **keyargs)
@@ -87,3 +112,60 @@ class TestAtlas:
         atlas.save(outpath)
         print(outpath)
         assert len(os.listdir(outpath)) == 1
+
+
+def _dummy_images(sections):
+    images = []
+    for section in sections:
+        buffer = BytesIO()
+        plt.plot([1, 2], [1, 2])
+        plt.savefig(buffer, format="png")
+        plt.close()
+        buffer.seek(0)
+        images.append((section, "title", buffer))
+    return images
+
+
+class TestAtlasVolumes:
+    @pytest.mark.parametrize(
+        ["keyargs", "expected"],
+        [
+            (
+                {"max_images": 2},
+                [["A"], ["A (continued)", "B"], ["B (continued)"]],
+            ),
+            ({"per_section": True}, [["A"], ["B"]]),
+            ({}, [["A", "B"]]),
+        ],
+    )
+    def test_insert_images(self, tmpdir, keyargs, expected):
+        atlas = AtlasVolumes(TEMPLATE_PATH, "dummyname", tmpdir, **keyargs)
+        atlas.insert_images(_dummy_images(["A", "A", "A", "B", "B"]))
+        index = atlas.save()
+
+        assert [sections for _, sections in atlas.volumes] == expected
+        for filename, _ in atlas.volumes:
+            assert os.path.exists(os.path.join(tmpdir, filename))
+        assert os.path.basename(index) == "atlas_dummyname.docx"
+        assert len(os.listdir(tmpdir)) == len(expected) + 1
+        # The index links all the volumes
+        rels = docx.Document(index).part.rels.values()
+        targets = [unquote(rel.target_ref) for rel in rels if rel.is_external]
+        assert targets == [filename for filename, _ in atlas.volumes]
+        assert atlas.volume is None
+
+    def test_max_size(self, tmpdir):
+        images = _dummy_images(["A", "A", "A", "B", "B"])
+        size = images[0][2].getbuffer().nbytes
+        atlas = AtlasVolumes(TEMPLATE_PATH, "dummyname", tmpdir, max_size=2 * size)
+        # images are consumed lazily
+        atlas.insert_images(iter(images))
+        atlas.save()
+        expected = [["A"], ["A (continued)", "B"], ["B (continued)"]]
+        assert [sections for _, sections in atlas.volumes] == expected
+
+
+def test_sort_zaids():
+    zaids = ["M10", "26056.31c", "1001.31c", "M2", "6012.31c"]
+    assert sort_zaids(zaids) == ["1001.31c", "6012.31c", "26056.31c", "M10", "M2"]
+    assert sort_zaids([26056, 1001]) == [1001, 26056]
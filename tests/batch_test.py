@@ -0,0 +1,161 @@
+"""
+
+@author: Jade Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+
+import pytest
+
+cp = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(cp)
+sys.path.insert(1, modules_path)
+
+import jade.batch as batch
+from jade.batch import BatchError
+from jade.configuration import Configuration
+from jade.main import Session
+
+MAIN_CONFIG_FILE = os.path.join(cp, "TestFiles", "main", "mainconfig.xlsx")
+
+
+class StatusMockUp:
+    def __init__(self, already_run):
+        self.already_run = already_run
+
+    def check_override_run(self, lib, session, exp=False, override=None):
+        return override or not self.already_run
+
+    def check_lib_run(self, lib, session, config_option="Run", exp=False):
+        return {"mcnp": ["Sphere"]}
+
+    def check_pp_single(self, lib, session, tree="single", exp=False):
+        return self.already_run
+
+
+class LibManagerMockUp:
+    libraries = {"mcnp": ["31c", "32c"], "serpent": ["31c"], "openmc": ["31c"]}
+
+
+class LogMockUp:
+    def adjourn(self, text, spacing=True, time=False):
+        pass
+
+    def bar_adjourn(self, text, spacing=True):
+        pass
+
+
+class MockUpSession(Session):
+    def __init__(self, already_run=False):
+        self.conf = Configuration(MAIN_CONFIG_FILE)
+        self.state = StatusMockUp(already_run)
+        self.lib_manager = LibManagerMockUp()
+        self.log = LogMockUp()
+
+
+class TestBatch:
+    def test_select_benchmarks(self):
+        session = MockUpSession()
+        batch.select_benchmarks(session, exp=True)
+        assert session.check_active_tests("Run", exp=True) == {
+            "mcnp": ["Oktavian"],
+            "openmc": ["FNG"],
+            "serpent": ["FNG"],
+        }
+
+        batch.select_benchmarks(session, ["FNG"], ["mcnp"], exp=True)
+        assert session.check_active_tests("Run", exp=True) == {"mcnp": ["FNG"]}
+
+        # Benchmarks can be selected also by their description
+        session = MockUpSession()
+        batch.select_benchmarks(
+            session, ["Sphere Leakage Test"], ["mcnp"], action="Post-Processing"
+        )
+        assert session.check_active_tests("Post-Processing") == {"mcnp": ["Sphere"]}
+
+        with pytest.raises(BatchError):
+            batch.select_benchmarks(session, ["Dummy"])
+        with pytest.raises(BatchError):
+            batch.select_benchmarks(session, ["Sphere"], ["mcnp6"])
+
+    def test_run(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            batch.cmp,
+            "executeBenchmarksRoutines",
+            lambda session, lib, runoption, exp=False: calls.append(
+                (lib, runoption, exp)
+            ),
+        )
+        session = MockUpSession()
+        batch.select_benchmarks(session, ["Oktavian"], ["mcnp"], exp=True)
+        batch.run(session, "32c", exp=True)
+        assert calls == [("32c", "c", True)]
+
+        # the library must be available for all the codes
+        batch.select_benchmarks(session, ["FNG"], ["serpent"], exp=True)
+        with pytest.raises(BatchError):
+            batch.run(session, "32c", exp=True)
+
+        # benchmarks already run are overridden only if requested
+        session = MockUpSession(already_run=True)
+        batch.select_benchmarks(session, ["Oktavian"], exp=True)
+        with pytest.raises(BatchError):
+            batch.run(session, "31c", exp=True)
+        batch.run(session, "31c", exp=True, override=True)
+        assert calls[-1] == ("31c", "c", True)
+
+    def test_compare(self):
+        session = MockUpSession()
+        with pytest.raises(BatchError):
+            batch.compare(session, ["31c"])
+
+    def test_postprocess(self, monkeypatch):
+        import jade.postprocess as pp
+
+        calls = []
+        monkeypatch.setattr(
+            pp,
+            "postprocessBenchmark",
+            lambda session, lib, code, testnames, force=False: calls.append(
+                (lib, force)
+            ),
+        )
+        monkeypatch.setattr(
+            pp,
+            "compareBenchmark",
+            lambda session, lib, code, testnames, exp=False, force=False: (
+                calls.append((lib, force))
+            ),
+        )
+        # Previous results are updated, or rebuilt only if requested
+        session = MockUpSession(already_run=True)
+        batch.select_benchmarks(session, ["Sphere"], ["mcnp"], action="Post-Processing")
+        batch.postprocess(session, "31c")
+        batch.postprocess(session, "31c", override=True)
+        batch.compare(session, ["31c", "32c"])
+        batch.compare(session, ["31c", "32c"], override=True)
+        assert calls == [
+            ("31c", False),
+            ("31c", True),
+            ("31c-32c", False),
+            ("31c-32c", True),
+        ]
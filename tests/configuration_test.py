@@ -52,6 +52,15 @@ class TestConfiguration:
         # TODO
         # Check that everything is read in a correct way
         assert config.mpi_tasks == 4
+        # Not present in the file, default is used
+        assert config.pp_workers == 1
+        assert config.atlas_volume_size is None
+        assert config.atlas_volume_max_size is None
+        assert not config.atlas_volume_per_section
+        assert not config.atlas_draft
+        assert config.plot_max_bins is None
+        assert config.plot_cache_size == 500 * 1024**2
+        assert not config.raw_csv
 
     def test_get_lib_name(self, config):
         suffix_list = ["21c", "33c", "pincopalle"]
@@ -0,0 +1,85 @@
+"""
+
+@author: Jade Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+
+cp = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(cp)
+sys.path.insert(1, modules_path)
+
+from jade.dependencies import MANIFEST_FILE, Manifest, fingerprint
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as outfile:
+        outfile.write(text)
+
+
+class TestDependencies:
+    def test_fingerprint(self, tmpdir):
+        run = os.path.join(tmpdir, "Sphere")
+        _write(os.path.join(run, "Sphere_1001_H-1", "mcnp", "Sphere.m"), "1")
+        _write(os.path.join(run, "Sphere_1001_H-1", "openmc", "tallies.out"), "1")
+        assert fingerprint(os.path.join(tmpdir, "missing")) is None
+        assert len(fingerprint(run)) == 2
+
+        mcnp = fingerprint(run, "mcnp")
+        assert [entry[0] for entry in mcnp] == [
+            os.path.join("Sphere_1001_H-1", "mcnp", "Sphere.m")
+        ]
+        # Changes of the other codes outputs are ignored
+        _write(os.path.join(run, "Sphere_1001_H-1", "openmc", "tallies.out"), "22")
+        assert fingerprint(run, "mcnp") == mcnp
+        _write(os.path.join(run, "Sphere_1001_H-1", "mcnp", "Sphere.m"), "22")
+        assert fingerprint(run, "mcnp") != mcnp
+
+    def test_manifest(self, tmpdir):
+        out = str(tmpdir)
+        config = os.path.join(tmpdir, "config.xlsx")
+        _write(config, "config")
+        depends = {
+            artifact: {"configuration": fingerprint(config)}
+            for artifact in ["Excel", "Atlas"]
+        }
+        manifest = Manifest(out)
+        assert manifest.get_stale(depends) == ["Excel", "Atlas"]
+
+        for artifact in ["Excel", "Atlas"]:
+            _write(os.path.join(out, artifact, artifact + ".txt"), "results")
+        manifest.record(depends)
+        assert os.path.isfile(os.path.join(out, MANIFEST_FILE))
+        manifest = Manifest(out)
+        assert manifest.get_stale(depends) == []
+
+        # An artifact modified or removed is rebuilt
+        _write(os.path.join(out, "Atlas", "Atlas.txt"), "modified")
+        assert manifest.get_stale(depends) == ["Atlas"]
+        manifest.record(depends)
+        # A dependency changed
+        depends["Excel"]["draft"] = True
+        assert manifest.get_stale(depends) == ["Excel"]
+
+        # An invalid manifest is ignored
+        _write(os.path.join(out, MANIFEST_FILE), "[")
+        assert Manifest(out).get_stale(depends) == ["Excel", "Atlas"]
@@ -0,0 +1,103 @@
+"""
+
+@author: Jade Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+cp = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(cp)
+sys.path.insert(1, modules_path)
+
+import jade.excelcache as excelcache
+
+
+class TestExcelCache:
+    @pytest.fixture
+    def workbook(self, tmpdir):
+        path = os.path.join(tmpdir, "Config.xlsx")
+        df = pd.DataFrame({"Tally": [4, 14], "Title": ["Flux", "Heating"]})
+        df.to_excel(path, sheet_name="Excel", index=False)
+        excelcache.clear_memory()
+        yield path
+        excelcache.clear_memory()
+
+    @staticmethod
+    def _forbid_parsing(monkeypatch):
+        def read_excel(*args, **kwargs):
+            raise AssertionError("The workbook should not be parsed")
+
+        monkeypatch.setattr(pd, "read_excel", read_excel)
+
+    def test_read_excel(self, workbook, tmpdir, monkeypatch):
+        cache_dir = os.path.join(tmpdir, "Cache")
+        df = excelcache.read_excel(workbook, cache_dir, sheet_name="Excel")
+        assert list(df["Tally"]) == [4, 14]
+        assert len(os.listdir(cache_dir)) == 1
+
+        # The returned DataFrames are copies
+        df.loc[0, "Tally"] = 24
+        with monkeypatch.context() as mp:
+            self._forbid_parsing(mp)
+            df = excelcache.read_excel(workbook, cache_dir, sheet_name="Excel")
+            assert df.loc[0, "Tally"] == 4
+
+            # A new session uses the snapshot
+            excelcache.clear_memory()
+            df = excelcache.read_excel(workbook, cache_dir, sheet_name="Excel")
+            assert list(df["Title"]) == ["Flux", "Heating"]
+
+            # Touching the file does not invalidate the snapshot
+            os.utime(workbook, (1e9, 1e9))
+            excelcache.read_excel(workbook, cache_dir, sheet_name="Excel")
+
+        # Different arguments are parsed and cached separately
+        df = excelcache.read_excel(workbook, cache_dir, sheet_name="Excel", nrows=1)
+        assert len(df) == 1
+
+        # A modified workbook is parsed again
+        new = pd.DataFrame({"Tally": [44], "Title": ["Dose"]})
+        new.to_excel(workbook, sheet_name="Excel", index=False)
+        df = excelcache.read_excel(workbook, cache_dir, sheet_name="Excel")
+        assert list(df["Tally"]) == [44]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"not a pickle",
+            # pickled by a library version that is not available
+            b"cmissing_module\nDataFrame\n.",
+        ],
+    )
+    def test_invalid_snapshot(self, workbook, tmpdir, content):
+        cache_dir = os.path.join(tmpdir, "Cache")
+        excelcache.read_excel(workbook, cache_dir)
+        snapshot = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+        with open(snapshot, "wb") as outfile:
+            outfile.write(content)
+
+        excelcache.clear_memory()
+        df = excelcache.read_excel(workbook, cache_dir)
+        assert list(df["Tally"]) == [4, 14]
+        assert excelcache._load_snapshot(snapshot) is not None
@@ -1,5 +1,16 @@
+import numpy as np
+import openpyxl
 import pandas as pd
-from jade.excelsupport import single_excel_writer, comp_excel_writer
+from jade.excelsupport import (
+    single_excel_writer,
+    comp_excel_writer,
+    streaming_writer,
+    write_df,
+    _RowBuffer,
+    HEADER_FORMAT,
+    OverlappingRange,
+)
+import jade.excelsupport as excelsupport
 import pytest
 import os
 
@@ -76,3 +87,97 @@ class TestExcelSupport:
 
         # Assert that the file exists
         assert os.path.exists(outpath)
+
+    def test_single_excel_writer_layout(self, tmpdir):
+        # The streamed workbook keeps titles, merged ranges and tables
+        outpath = str(tmpdir.join("test.xlsx"))
+        single_excel_writer(
+            self, outpath, self.lib, self.testname, self.tallies, self.stat_df
+        )
+        wb = openpyxl.load_workbook(outpath)
+        assert wb.sheetnames == ["Values", "Errors", "Statistical Checks"]
+        ws = wb["Values"]
+        merged = [str(rng) for rng in ws.merged_cells.ranges]
+        for rng in ["B1:C2", "D1:D2", "B3:L8", "C9:F9", "C15:F15"]:
+            assert rng in merged
+        assert ws["D1"].value == self.lib
+        assert ws["C9"].value == "Title 1"
+        assert ws["C10"].value == "A"
+        assert ws["C11"].value == 1
+        assert ws["D13"].value == 6
+        assert wb["Errors"]["C17"].value == 0.1
+        assert wb["Statistical Checks"]["C10"].value == "Missed"
+
+    def test_write_df(self, tmpdir):
+        outpath = str(tmpdir.join("test.xlsx"))
+        columns = pd.MultiIndex.from_tuples(
+            [("Exp", "Value"), ("Exp", "Error"), ("32c", "Value")],
+            names=["Library", ""],
+        )
+        index = pd.Index([1, 2], name="Depth")
+        df = pd.DataFrame([[1, 0.1, np.nan], [2, 0.2, np.inf]], index, columns)
+        with streaming_writer(outpath) as writer:
+            header_format = writer.book.add_format(HEADER_FORMAT)
+            ws = writer.book.add_worksheet("Sheet1")
+            row = write_df(ws, df, 1, 0, header_format=header_format)
+            write_df(ws, self.df_value, row, 0, index=False)
+        assert row == 6
+
+        ws = openpyxl.load_workbook(outpath)["Sheet1"]
+        assert [str(rng) for rng in ws.merged_cells.ranges] == ["B2:C2"]
+        assert ws["A2"].value == "Library"
+        assert ws["D2"].value == "32c"
+        assert ws["A4"].value == "Depth"
+        assert ws["B5"].value == 1
+        assert ws["D5"].value is None
+        assert ws["D6"].value == "inf"
+        assert ws["A7"].value == "A"
+        assert ws["B10"].value == 6
+
+    def test_row_buffer(self, tmpdir):
+        outpath = str(tmpdir.join("test.xlsx"))
+        with streaming_writer(outpath) as writer:
+            ws = writer.book.add_worksheet("Sheet1")
+            rows = _RowBuffer(ws)
+            # Not in row order
+            rows.merge_range("A3:B4", "title")
+            rows.merge_range("A1:A2", "first")
+            rows.write("B2", "b2")
+            rows.set_row(7, 30)
+            rows.write(7, 1, "b8")
+            rows.flush(4)
+            ws.write(5, 0, "data")
+            rows.flush()
+
+        ws = openpyxl.load_workbook(outpath)["Sheet1"]
+        merged = sorted(str(rng) for rng in ws.merged_cells.ranges)
+        assert merged == ["A1:A2", "A3:B4"]
+        for cell, value in [
+            ("A1", "first"),
+            ("B2", "b2"),
+            ("A3", "title"),
+            ("A6", "data"),
+            ("B8", "b8"),
+        ]:
+            assert ws[cell].value == value
+        assert ws.row_dimensions[8].height == 30
+
+    def test_row_buffer_merges(self, tmpdir, monkeypatch):
+        outpath = str(tmpdir.join("test.xlsx"))
+        with streaming_writer(outpath) as writer:
+            ws = writer.book.add_worksheet("Sheet1")
+            rows = _RowBuffer(ws)
+            rows.merge_range("A1:B2", "title")
+            rows.flush()
+            # Ranges already written are checked too
+            with pytest.raises(OverlappingRange):
+                rows.merge_range("B2:C3", "overlap")
+            # Unknown xlsxwriter versions leave the cells unmerged
+            monkeypatch.setattr(excelsupport, "MERGE_LIST_VERSIONS", [])
+            rows.merge_range("A4:B4", "unmerged")
+            with pytest.warns(UserWarning):
+                rows.flush()
+
+        ws = openpyxl.load_workbook(outpath)["Sheet1"]
+        assert [str(rng) for rng in ws.merged_cells.ranges] == ["A1:B2"]
+        assert ws["A4"].value == "unmerged"
@@ -1,4 +1,5 @@
 import os
+import shutil
 import sys
 import pytest
 import pandas as pd
@@ -12,6 +13,8 @@ sys.path.insert(1, modules_path)
 resources = os.path.join(cp, "TestFiles", "expoutput")
 import jade.expoutput as expoutput
 import jade.output as outp
+import jade.postprocess as postprocess
+import jade.rawstore as rawstore
 from jade.libmanager import LibManager
 
 root = os.path.dirname(cp)
@@ -37,6 +40,7 @@ class MockUpSession(Session):
         self.path_quality = None
         self.path_uti = None
         self.path_comparison = os.path.join(tmpdir, "Post-Processing", "Comparisons")
+        self.path_cache = os.path.join(tmpdir, "Cache")
         self.lib_manager = lm
 
 
@@ -73,9 +77,71 @@ class TestExpOutput:
         self.benchoutput_32c.single_postprocess()
         self.benchoutput_31c = outp.BenchmarkOutput("31c", code, testname, session_mock)
         self.benchoutput_31c.single_postprocess()
+        # The raw data is stored for the comparisons
+        dataset = os.path.join(
+            session_mock.path_single, "31c", testname, code, "Raw_Data",
+            "ITER_1D_31c_mcnp"
+        )
+        tallydata = rawstore.read_dataset(dataset, filters={"Tally": 4})
+        assert tallydata[4].equals(self.benchoutput_31c.raw_data[4])
         self.benchoutput_comp = outp.BenchmarkOutput(["32c", "31c"], code, testname, session_mock)
         self.benchoutput_comp.compare()
-        assert True
+
+        # Up to date artifacts are not rebuilt
+        out = outp.BenchmarkOutput("31c", code, testname, session_mock)
+        assert out.update("pp")
+        out = outp.BenchmarkOutput("31c", code, testname, session_mock)
+        assert not out.update("pp")
+        shutil.rmtree(out.atlas_path)
+        out = outp.BenchmarkOutput("31c", code, testname, session_mock)
+        excel = os.listdir(out.excel_path)[0]
+        mtime = os.path.getmtime(os.path.join(out.excel_path, excel))
+        assert out.update("pp")
+        assert out.stale == ["Atlas"]
+        assert len(os.listdir(out.atlas_path)) == 1
+        assert mtime == os.path.getmtime(os.path.join(out.excel_path, excel))
+        # Atlas options are dependencies of the atlas only
+        session_mock.conf.atlas_volume_size = 10
+        out = outp.BenchmarkOutput("31c", code, testname, session_mock)
+        assert out.update("pp")
+        assert out.stale == ["Atlas"]
+        # Everything is rebuilt when forced
+        out = outp.BenchmarkOutput("31c", code, testname, session_mock)
+        assert out.update("pp", force=True)
+        assert out.stale == ["Excel", "Raw_Data", "Atlas"]
+
+    def test_postprocess_update(self, session_mock: MockUpSession, capsys):
+        class StateMockUp:
+            def register(self, path):
+                pass
+
+        class LogMockUp:
+            def adjourn(self, text, spacing=True, time=False):
+                pass
+
+        session_mock.state = StateMockUp()
+        session_mock.log = LogMockUp()
+        os.makedirs(session_mock.path_single)
+        code = "mcnp"
+        testname = "ITER_1D"
+        postprocess.postprocessBenchmark(session_mock, "31c", code, [testname])
+        excel_path = os.path.join(
+            session_mock.path_single, "31c", testname, code, "Excel"
+        )
+        excel = os.path.join(excel_path, os.listdir(excel_path)[0])
+        mtime = os.path.getmtime(excel)
+        capsys.readouterr()
+
+        # A plain re-invocation skips the unchanged artifacts
+        postprocess.postprocessBenchmark(session_mock, "31c", code, [testname])
+        assert "up to date, skipped" in capsys.readouterr().out
+        assert mtime == os.path.getmtime(excel)
+        # Forced, everything is rebuilt
+        postprocess.postprocessBenchmark(
+            session_mock, "31c", code, [testname], force=True
+        )
+        assert "up to date, skipped" not in capsys.readouterr().out
+        assert os.path.exists(excel)
 
     def test_spectrumoutput(self, session_mock: MockUpSession):
 
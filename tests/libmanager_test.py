@@ -237,3 +237,74 @@ class TestLibManger:
         zaid = Zaid.from_string(zaid)
         mass = lm.get_zaid_mass(zaid)
         assert mass == 15.99937442590581
+
+    def test_convertZaid_cache(self, lm: LibManager):
+        zaid = "12000"
+        lib = "31c"
+        translation = lm.convertZaid(zaid, lib)
+        assert (zaid, lib, "mcnp", "00c") in lm.translations
+        # the cached value is not affected by changes to the returned dict
+        translation.pop("12024")
+        assert len(lm.convertZaid(zaid, lib)) == 3
+        # a change of the default library gives a different key
+        lm.defaultlib = "21c"
+        lm.convertZaid(zaid, lib)
+        assert (zaid, lib, "mcnp", "21c") in lm.translations
+
+        lm.clear_translation_cache()
+        assert len(lm.translations) == 0
+
+    def test_lazy_loading(self, lm: LibManager):
+        assert lm._reactions is None
+        assert len(lm.data) == 0
+        # the xsdir file shared by all libraries is parsed only once
+        assert lm.data["mcnp"]["31c"] is lm.data["mcnp"]["00c"]
+        assert len(lm._xsdirs) == 1
+        with pytest.raises(KeyError):
+            lm.libraries["serpent"]
+
+    def test_isotope_lookup_tables(self, lm: LibManager):
+        parser = lm.isotope_parser
+        assert parser.elements[1] == ("hydrogen", "H")
+        assert parser.symbols["U"] == 92
+        assert parser.masses["1001"] == 1.007825032
+        assert parser.natural_masses[8] == 15.99937442590581
+        assert len(parser.natural_expansions[12]) == 3
+
+    def test_reactions_cache(self, tmpdir, monkeypatch):
+        df_lib = pd.DataFrame([["00c", "sdas", "yes", XSDIR_FILE]])
+        df_lib.columns = ["Suffix", "Name", "Default", "MCNP"]
+        cache = os.path.join(tmpdir, "Activation.pickle")
+        parsed = []
+        excel_file = pd.ExcelFile
+
+        def counted_excel_file(*args, **kwargs):
+            parsed.append(args[0])
+            return excel_file(*args, **kwargs)
+
+        monkeypatch.setattr(pd, "ExcelFile", counted_excel_file)
+        for _ in range(2):
+            lm = LibManager(
+                df_lib.copy(),
+                activationfile=ACTIVATION_FILE,
+                isotopes_file=ISOTOPES_FILE,
+                reactions_cache=cache,
+            )
+            # the activation file is read on first use
+            assert len(lm.reactions["99c"]) == 100
+            assert os.path.exists(cache)
+            assert lm.get_reactions("99c", "9019")[0] == ("16", "9018")
+        # the second time the cache is used
+        assert parsed == [ACTIVATION_FILE]
+
+        # an unreadable cache is rebuilt
+        with open(cache, "wb") as outfile:
+            outfile.write(b"not a pickle")
+        lm = LibManager(
+            df_lib.copy(),
+            activationfile=ACTIVATION_FILE,
+            isotopes_file=ISOTOPES_FILE,
+            reactions_cache=cache,
+        )
+        assert len(lm.reactions["99c"]) == 100
+        assert len(parsed) == 2
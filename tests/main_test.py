@@ -21,6 +21,7 @@ along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import os
+import subprocess
 import sys
 import pytest
 from jade.main import Session
@@ -32,6 +33,10 @@ sys.path.insert(1, modules_path)
 
 resources = os.path.join(cp, "TestFiles", "main")
 MAIN_CONFIG_FILE = os.path.join(resources, "mainconfig.xlsx")
+# Budget for the (cumulative) import of jade.main [s]
+IMPORT_BUDGET = 2
+# Packages that only the post-processing should load
+POSTPROCESSING_PACKAGES = ["matplotlib", "docx", "openpyxl", "xlsxwriter", "scipy"]
 
 
 # I don't want to deal with testing the Session object itself for the moment
@@ -58,3 +63,50 @@ class TestSession:
         session = MockUpSession()
         active_tests = session.check_active_tests(action, exp=True)
         assert active_tests == expected
+
+
+class TestLazySession:
+    def test_lazy_subsystems(self, tmpdir, monkeypatch):
+        monkeypatch.chdir(tmpdir)
+        # The first initialization creates the JADE tree and exits
+        with pytest.raises(SystemExit):
+            Session()
+
+        session = Session()
+        assert list(session.timings) == ["Session"]
+        for name in ["conf", "lib_manager", "state"]:
+            assert name not in session.__dict__
+
+        conf = session.conf
+        assert session.conf is conf
+        assert list(session.timings) == ["Session", "Configuration"]
+        assert "Configuration" in session.timing_report()
+
+        # Re-initialization drops the subsystems
+        session.initialize()
+        assert "conf" not in session.__dict__
+
+
+class TestImportTime:
+    def test_import_time(self):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import jade.main"],
+            capture_output=True,
+            text=True,
+            cwd=modules_path,
+            check=True,
+        )
+        # lines are 'import time: self [us] | cumulative [us] | package'
+        imported = {}
+        for line in out.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, package = line.split("|")
+            try:
+                imported[package.strip()] = int(cumulative)
+            except ValueError:
+                continue  # header
+
+        for package in POSTPROCESSING_PACKAGES:
+            assert package not in imported
+        assert imported["jade.main"] < IMPORT_BUDGET * 1e6
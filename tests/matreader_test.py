@@ -23,6 +23,7 @@ along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
 import sys
+import copy
 import os
 
 cp = os.path.dirname(os.path.abspath(__file__))
@@ -212,6 +213,18 @@ class TestMatCardList:
         assert len(matcard.materials) == 3
         assert len(matcard.matdic) == 3
 
+    def test_append_remove(self):
+        matcard = MatCardsList.from_input(INP)
+        material = copy.deepcopy(matcard[0])
+        material.name = "M100"
+        matcard.append(material)
+        assert matcard["m100"] is material
+        assert len(matcard.matdic) == 4
+
+        matcard.remove(material)
+        assert "M100" not in matcard.matdic
+        assert matcard.matdic == matcard._compute_dic()
+
     def test_headers(self):
         """
         test correct material headers reading
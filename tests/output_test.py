@@ -28,6 +28,10 @@ cp = os.path.dirname(os.path.abspath(__file__))
 modules_path = os.path.dirname(cp)
 sys.path.insert(1, modules_path)
 
+import numpy as np
+import pandas as pd
+import pytest
+
 from jade.libmanager import LibManager
 import jade.output as output
 
@@ -49,3 +53,81 @@ class TestSphereSDDRMCNPoutput:
         assert len(t4) == 1
         assert len(t2) == 176
         assert list(t2.columns) == ['Energy', 'Value', 'Error']
+
+
+class TestCompareLibraries:
+
+    def test_compare_libraries(self):
+        index = ['a', 'b', 'c']
+        columns = ['t1', 't2']
+        values = {
+            'ref': pd.DataFrame([[1, 2], [0, 4], [5, 5]], index=index,
+                                columns=columns),
+            'tar1': pd.DataFrame([[1, 1], [1, 2], [5, 5]], index=index,
+                                 columns=columns),
+            # 'c' is missing in this library
+            'tar2': pd.DataFrame([[2, 2], [0, 2]], index=index[:2],
+                                 columns=columns),
+        }
+        errors = {lib: df * 0 + 0.5 for lib, df in values.items()}
+        comparisons = output.compare_libraries(values, errors, 'ref')
+        assert list(comparisons.keys()) == ['tar1', 'tar2']
+
+        final, absdiff, std_dev = comparisons['tar1']
+        assert list(final.index) == index
+        assert absdiff.loc['a', 't2'] == 1
+        assert final.loc['a', 't2'] == 0.5
+        assert final.loc['b', 't1'] == -np.inf
+        assert std_dev.loc['b', 't2'] == 4
+
+        final, absdiff, std_dev = comparisons['tar2']
+        assert list(final.index) == index[:2]
+        assert np.isnan(final.loc['b', 't1'])
+        assert final.loc['a', 't1'] == -1
+
+
+class TestResultCube:
+
+    def _get_cube(self):
+        index = ['a', 'b', 'c', 'd']
+        columns = ['t1', 't2']
+        values = {
+            'ref': pd.DataFrame([[1, 1], [1, 1], [1, 0], [1, 1]], index=index,
+                                columns=columns),
+            'tar1': pd.DataFrame([[1, 1.5], [0.97, 1], [0.85, 1], [1, 1]],
+                                 index=index, columns=columns),
+            'tar2': pd.DataFrame([[1.3, 2], [1, 1.5]], index=index[:2],
+                                 columns=columns),
+        }
+        errors = {lib: df * 0 + 0.1 for lib, df in values.items()}
+        return output.ResultCube.from_dataframes(values, errors)
+
+    def test_from_dataframes(self):
+        cube = self._get_cube()
+        assert cube.data.shape == (4, 2, 3, 2)
+        assert cube.libraries == ['ref', 'tar1', 'tar2']
+        assert cube.present[:, 2].tolist() == [True, True, False, False]
+        assert np.isnan(cube.values[3, 0, 2])
+        assert cube.errors[0, 0, 1] == 0.1
+
+    def test_summary(self):
+        cube = self._get_cube()
+        summary = cube.summary('ref')['tar1']
+        assert list(summary.index) == [
+            '0 < % of cells < 5.0',
+            '5.0 < % of cells < 10.0',
+            '10.0 < % of cells < 20.0',
+            '% of cells > 20.0',
+        ]
+        assert summary['t1'].tolist() == pytest.approx([0.75, 0, 0.25, 0])
+        # -inf is counted in the last range
+        assert summary['t2'].tolist() == pytest.approx([0.5, 0, 0, 0.5])
+        # only shared zaids are considered
+        summary = cube.summary('ref')['tar2']
+        assert summary['t1'].tolist() == pytest.approx([0.5, 0, 0, 0.5])
+
+    def test_ranking(self):
+        cube = self._get_cube()
+        ranking = cube.ranking('ref')
+        assert list(ranking.index) == ['tar1', 'tar2']
+        assert ranking['tar2'] == pytest.approx((0.3 + 1 + 0.5) / 4)
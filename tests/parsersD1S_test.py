@@ -110,6 +110,16 @@ class TestIrradiationFile:
         irradiation = irrfile.get_irrad("26055")
         assert irradiation.daughter == "26055"
 
+    def test_select(self):
+        infile = os.path.join(cp, "TestFiles", "parserD1S", "irr_test")
+        irrfile = IrradiationFile.from_text(infile)
+        newfile, missing = irrfile.select({"26059", "24051", "20051"})
+        assert newfile.get_daughters() == ["24051", "26059"]
+        assert newfile.nsc == irrfile.nsc
+        assert missing == ["20051"]
+        # the original file is not modified
+        assert len(irrfile.irr_schedules) == 4
+
 
 class TestIrradiation:
 
@@ -25,6 +25,7 @@ import os
 import numpy as np
 import shutil
 import pytest
+from io import BytesIO
 
 cp = os.path.dirname(os.path.abspath(__file__))
 modules_path = os.path.dirname(cp)
@@ -57,7 +58,7 @@ KEYARGS = {'data': data, 'title': title, 'outpath': OUTPATH,
            'xlabel': xlabel, 'testname': default_testname}
 
 AVAILABLE_PLOTS = ['Binned graph', 'Ratio graph', 'Experimental points',
-                   'Discreet Experimental points', 'Grouped bars']
+                   'Discreet Experimental points', 'Grouped bars', 'Contribution']
 
 
 class TestPlotter:
@@ -94,6 +95,51 @@ class TestPlotter:
         keyargs = {}
         self._plot(plotterob, args, keyargs)
 
+    @pytest.mark.parametrize("plot_type", AVAILABLE_PLOTS)
+    def test_plot_in_memory(self, plot_type):
+        plotterob = Plotter(**KEYARGS)
+        buffer = plotterob.plot(plot_type, in_memory=True)
+        # PNG signature, nothing written to disk
+        assert buffer.read(8) == b'\x89PNG\r\n\x1a\n'
+        assert not os.path.exists(OUTPATH)
+
+    @pytest.mark.parametrize("plot_type", AVAILABLE_PLOTS)
+    def test_plot_draft(self, plot_type):
+        full = Plotter(**KEYARGS).plot(plot_type, in_memory=True)
+        draft = Plotter(**KEYARGS, draft=True).plot(plot_type, in_memory=True)
+        assert len(draft.getvalue()) < len(full.getvalue())
+
+    def test_rebin(self):
+        dense_x = np.arange(1, 710)
+        dense = {'x': dense_x, 'y': np.ones(709) * 2,
+                 'err': np.ones(709) * 0.1, 'ylabel': 'dense'}
+        sparse = {'x': x, 'y': data1['y'], 'err': [], 'ylabel': 'sparse'}
+        newdata = plotter._rebin([dense, sparse], 250)
+        # groups of 3 bins
+        assert len(newdata[0]['x']) == 237
+        assert newdata[0]['x'][0] == 3
+        assert newdata[0]['x'][-1] == 709
+        assert newdata[0]['y'][0] == pytest.approx(6)
+        # last group has a single bin
+        assert newdata[0]['y'][-1] == pytest.approx(2)
+        assert newdata[0]['err'][0] == pytest.approx(0.1 / np.sqrt(3))
+        assert newdata[1] is sparse
+        # original data is left untouched
+        assert len(dense['x']) == 709
+
+    def test_plot_max_bins(self, tmpdir):
+        dense_x = np.arange(1, 710)
+        data = [{'x': dense_x, 'y': np.random.rand(709),
+                 'err': np.random.rand(709), 'ylabel': 'dense'}]
+        keyargs = KEYARGS.copy()
+        keyargs['data'] = data
+        keyargs['outpath'] = str(tmpdir)
+        plotterob = Plotter(**keyargs, max_bins=250)
+        plotterob.plot('Binned graph')
+        # the plot data is not modified
+        assert plotterob.data is data
+        assert len(plotterob.data[0]['x']) == 709
+
     def test_waves(self):
         data1 = {'x': x, 'y': [np.random.rand(50)*100, np.random.rand(50)*100],
                  'err': np.random.rand(50), 'ylabel': 'data1'}
@@ -157,3 +203,179 @@ class TestPlotter:
         finally:
             # remove the temporary directory
             shutil.rmtree(OUTPATH)
+
+
+class TestPlotRenderer:
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_render(self, workers):
+        try:
+            os.mkdir(OUTPATH)
+        except FileExistsError:
+            pass
+
+        try:
+            jobs = [(Plotter(**KEYARGS), plot_type)
+                    for plot_type in AVAILABLE_PLOTS]
+            with plotter.PlotRenderer(workers) as renderer:
+                outpaths = renderer.render(jobs)
+            # Same outname for all plots, no image has been overwritten
+            assert len(set(outpaths)) == len(jobs)
+            assert outpaths[0] == jobs[0][0].outpath
+            for outpath in outpaths:
+                assert os.path.exists(outpath)
+        finally:
+            shutil.rmtree(OUTPATH)
+
+    def test_render_batch(self):
+        try:
+            os.mkdir(OUTPATH)
+        except FileExistsError:
+            pass
+
+        try:
+            jobs = [(Plotter(**KEYARGS), 'Binned graph'),
+                    (Plotter(**KEYARGS), 'Ratio graph')]
+            with plotter.PlotRenderer(batch=True) as renderer:
+                outpaths = renderer.render(jobs)
+            for outpath in outpaths:
+                assert os.path.exists(outpath)
+        finally:
+            shutil.rmtree(OUTPATH)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_stream(self, workers):
+        consumed = []
+
+        def jobs():
+            for i in range(5):
+                consumed.append(i)
+                yield i, Plotter(**KEYARGS), 'Binned graph'
+
+        with plotter.PlotRenderer(workers) as renderer:
+            stream = renderer.stream(jobs(), in_memory=True, window=2)
+            key, future = next(stream)
+            # only the window is submitted before the first image is used
+            assert key == 0 and consumed == [0, 1]
+            assert future.result().read(8) == b'\x89PNG\r\n\x1a\n'
+            assert [key for key, _ in stream] == [1, 2, 3, 4]
+
+    def test_render_error(self):
+        renderer = plotter.PlotRenderer()
+        future = renderer.submit(Plotter(**KEYARGS), 'wrongone')
+        with pytest.raises(ValueError):
+            future.result()
+
+
+class TestBatchPlotter:
+
+    def test_plot(self):
+        try:
+            os.mkdir(OUTPATH)
+        except FileExistsError:
+            pass
+
+        try:
+            keyargs = KEYARGS.copy()
+            with plotter.BatchPlotter() as batch:
+                # Fewer libraries and then more than the first plot
+                for i, libs in enumerate([data, data[:1], [data1, data2, data1],
+                                          data]):
+                    keyargs['data'] = libs
+                    keyargs['outname'] = 'batch' + str(i)
+                    plotterob = Plotter(**keyargs)
+                    outpath = batch.plot(plotterob, 'Binned graph')
+                    assert os.path.exists(outpath)
+                # One figure for each layout
+                assert len(batch._figures) == 2
+                figure = batch._figures['Binned graph', True, False]
+                ax1 = figure.axes[0]
+                # Artists are reused, not added
+                assert len(ax1.lines) == 3
+                labels = ax1.get_legend_handles_labels()[1]
+                assert labels == ['R: data1', 'T1: data2']
+                buffer = batch.plot(plotterob, 'Binned graph', in_memory=True)
+                assert buffer.read(8) == b'\x89PNG\r\n\x1a\n'
+                # Draft plots use their own figure
+                keyargs['draft'] = True
+                batch.plot(Plotter(**keyargs), 'Binned graph')
+                assert len(batch._figures) == 3
+                assert 'errorbar' not in batch._figures[
+                    'Binned graph', True, True].artists[0]
+                # Other plot types are not batched
+                outpath = batch.plot(Plotter(**KEYARGS), 'Ratio graph')
+                assert os.path.exists(outpath)
+                assert len(batch._figures) == 3
+            assert len(batch._figures) == 0
+        finally:
+            shutil.rmtree(OUTPATH)
+
+
+class TestPlotCache:
+
+    def test_plot(self, tmpdir, monkeypatch):
+        cache = plotter.PlotCache(os.path.join(tmpdir, 'cache'), 10 * 1024**2)
+        buffer = Plotter(**KEYARGS, cache=cache).plot('Binned graph',
+                                                      in_memory=True)
+        assert len(os.listdir(cache.path)) == 1
+
+        # An identical plot is not rendered again
+        def fail(*args, **kwargs):
+            raise AssertionError('plot rendered again')
+        monkeypatch.setattr(Plotter, '_binned_plot', fail)
+        keyargs = KEYARGS.copy()
+        keyargs['outpath'] = str(tmpdir)
+        outpath = Plotter(**keyargs, cache=cache).plot('Binned graph')
+        with open(outpath, 'rb') as infile:
+            assert infile.read() == buffer.getvalue()
+        with plotter.BatchPlotter() as batch:
+            cached = batch.plot(Plotter(**keyargs, cache=cache),
+                                'Binned graph', in_memory=True)
+        assert cached.getvalue() == buffer.getvalue()
+
+    def test_get_key(self):
+        key = plotter.PlotCache.get_key(Plotter(**KEYARGS), 'Binned graph')
+        # The name of the image does not matter
+        keyargs = KEYARGS.copy()
+        keyargs['outname'] = 'other'
+        assert plotter.PlotCache.get_key(Plotter(**keyargs),
+                                         'Binned graph') == key
+        assert plotter.PlotCache.get_key(Plotter(**keyargs),
+                                         'Ratio graph') != key
+        keyargs['title'] = 'other'
+        assert plotter.PlotCache.get_key(Plotter(**keyargs),
+                                         'Binned graph') != key
+        keyargs = KEYARGS.copy()
+        newdata = {'x': x, 'y': data2['y'] * 1.01, 'err': data2['err'],
+                   'ylabel': 'data2'}
+        keyargs['data'] = [data1, newdata]
+        assert plotter.PlotCache.get_key(Plotter(**keyargs),
+                                         'Binned graph') != key
+
+    def test_evict(self, tmpdir):
+        cache = plotter.PlotCache(os.path.join(tmpdir, 'cache'), 1000)
+        for i in range(5):
+            cache.store(str(i) + '.png', BytesIO(b'0' * 300))
+            os.utime(os.path.join(cache.path, str(i) + '.png'), (i, i))
+        # The oldest images are removed when the size is exceeded
+        assert sorted(os.listdir(cache.path)) == ['2.png', '3.png', '4.png']
+        assert cache.load('0.png', None, in_memory=True) is None
+        assert cache.load('4.png', None, in_memory=True).read() == b'0' * 300
+
+    def test_evict_shared(self, tmpdir):
+        path = os.path.join(tmpdir, 'cache')
+        cache = plotter.PlotCache(path, 1000)
+        other = plotter.PlotCache(path, 1000)
+        cache.store('0.png', BytesIO(b'0' * 300))
+        # Files being written by other processes are left alone
+        with open(os.path.join(path, '1.png.123.tmp'), 'wb') as outfile:
+            outfile.write(b'0' * 2000)
+        cache.store('1.png', BytesIO(b'0' * 300))
+        assert len(os.listdir(path)) == 3
+        # Images removed by another process are not counted
+        other.store('2.png', BytesIO(b'0' * 300))
+        for name in ['0.png', '1.png', '2.png']:
+            os.remove(os.path.join(path, name))
+        cache.store('3.png', BytesIO(b'0' * 300))
+        cache.store('4.png', BytesIO(b'0' * 300))
+        assert sorted(os.listdir(path)) == ['1.png.123.tmp', '3.png', '4.png']
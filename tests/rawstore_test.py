@@ -0,0 +1,137 @@
+"""
+
+@author: Jade Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+cp = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(cp)
+sys.path.insert(1, modules_path)
+
+import jade.rawstore as rawstore
+
+
+class TestRawStore:
+    @pytest.fixture
+    def frames(self):
+        energy = pd.DataFrame(
+            {
+                "Energy": [1e-5, 0.1, 14.1, "total"],
+                "Value": [1.0, 2.0, 3.0, 6.0],
+                "Error": [0.1, 0.1, 0.2, 0.05],
+            }
+        )
+        cells = pd.DataFrame({"Cells": [1, 2], "Value": [5.0, np.nan]})
+        return {
+            ("Fe-56", 4): energy,
+            ("Fe-56", 14): cells,
+            ("M10", 4): energy.iloc[:2],
+        }
+
+    def test_dataset(self, tmpdir, frames):
+        path = rawstore.get_dataset_path(str(tmpdir), "31c", "Sphere", "mcnp")
+        attrs = {"signature": [["Spherem", 1, 2]]}
+        rawstore.write_dataset(
+            path, frames, ["Zaid", "Tally"], attrs=attrs, fmt="pickle"
+        )
+        assert os.path.isfile(os.path.join(path, "Zaid=Fe-56", "Tally=4", "part-0.pkl"))
+        assert rawstore.read_metadata(path)["attrs"] == attrs
+
+        # Full read
+        read = rawstore.read_dataset(path)
+        assert list(read.keys()) == list(frames.keys())
+        for key, df in frames.items():
+            assert read[key].equals(df.reset_index(drop=True))
+
+        # Filtered read
+        read = rawstore.read_dataset(
+            path, filters={"Tally": np.int64(4)}, columns=["Value"]
+        )
+        assert list(read.keys()) == [("Fe-56", 4), ("M10", 4)]
+        assert list(read["M10", 4].columns) == ["Value"]
+
+        table = rawstore.read_table(path, filters={"Zaid": ["Fe-56"]})
+        assert list(table.columns[:2]) == ["Zaid", "Tally"]
+        assert len(table) == 6
+        assert list(table["Tally"].unique()) == [4, 14]
+
+        # Nothing selected
+        table = rawstore.read_table(path, filters={"Zaid": "H-1"})
+        assert len(table) == 0
+
+        # A new write replaces the dataset
+        rawstore.write_dataset(path, {4: frames["Fe-56", 4]}, ["Tally"], fmt="pickle")
+        assert list(rawstore.read_dataset(path).keys()) == [4]
+        assert not os.path.exists(os.path.join(path, "Zaid=Fe-56"))
+
+    def test_parquet_dataset(self, tmpdir, frames):
+        pytest.importorskip("pyarrow")
+        path = rawstore.get_dataset_path(str(tmpdir), "31c", "Sphere", "mcnp")
+        rawstore.write_dataset(path, frames, ["Zaid", "Tally"], fmt="parquet")
+        file = os.path.join(path, "Zaid=Fe-56", "Tally=4", "part-0.parquet")
+        assert os.path.isfile(file)
+        partitions = rawstore.read_metadata(path)["partitions"]
+        assert [partition["mixed"] for partition in partitions] == [
+            ["Energy"],
+            [],
+            ["Energy"],
+        ]
+
+        # Mixed columns are restored with their numbers
+        read = rawstore.read_dataset(path)
+        assert list(read.keys()) == list(frames.keys())
+        for key, df in frames.items():
+            pd.testing.assert_frame_equal(
+                read[key], df.reset_index(drop=True), check_dtype=False
+            )
+        assert list(read["Fe-56", 4]["Energy"]) == [1e-5, 0.1, 14.1, "total"]
+
+        # Only the requested columns are read
+        read = rawstore.read_dataset(path, filters={"Tally": 4}, columns=["Energy"])
+        assert list(read.keys()) == [("Fe-56", 4), ("M10", 4)]
+        assert list(read["Fe-56", 4].columns) == ["Energy"]
+        assert list(read["Fe-56", 4]["Energy"]) == [1e-5, 0.1, 14.1, "total"]
+        table = rawstore.read_table(path, filters={"Tally": 14}, columns=["Value"])
+        assert list(table.columns) == ["Zaid", "Tally", "Value"]
+        assert table["Value"].iloc[0] == 5.0
+        assert np.isnan(table["Value"].iloc[1])
+
+    def test_mixed_columns(self, frames):
+        df = frames["Fe-56", 4]
+        encoded, mixed = rawstore._encode_mixed(df)
+        assert mixed == ["Energy"]
+        assert list(encoded["Energy"]) == ["1e-05", "0.1", "14.1", "total"]
+        # The original DataFrame is not modified
+        assert df["Energy"].iloc[0] == 1e-5
+
+        decoded = encoded["Energy"].map(rawstore._decode_value)
+        assert list(decoded) == list(df["Energy"])
+        assert rawstore._decode_value("2") == 2
+        assert np.isnan(rawstore._decode_value(None))
+
+        # Numeric columns are not touched
+        _, mixed = rawstore._encode_mixed(frames["Fe-56", 14])
+        assert mixed == []
@@ -23,6 +23,7 @@ along with JADE.  If not, see <http://www.gnu.org/licenses/>.
 """
 import sys
 import os
+import json
 import pandas as pd
 import pytest
 
@@ -40,7 +41,9 @@ from jade.configuration import Configuration
 from jade.libmanager import LibManager
 from jade.status import Status
 
+import jade.rawstore as rawstore
 import jade.sphereoutput as sout
+from jade.warehouse import ResultsWarehouse, WAREHOUSE_FILE
 
 class MockUpSession(Session):
     def __init__(self, tmpdir, lm: LibManager):
@@ -54,6 +57,7 @@ class MockUpSession(Session):
         self.path_cnf = os.path.join(resources, "Benchmarks_Configuration")
         self.path_quality = None
         self.path_uti = None
+        self.path_cache = os.path.join(tmpdir, "Cache")
         self.lib_manager = lm
 
         keypaths = [self.path_pp,
@@ -90,7 +94,15 @@ class TestSphereOutput:
         sphere_31c.single_postprocess()
         sphere_comp = sout.SphereOutput(['31c', '00c'], 'mcnp', 'Sphere', session_mock)
         sphere_comp.compare()
-        assert True
+        # The single library results are added as extra tabs
+        outpath = os.path.join(sphere_comp.excel_path,
+                               'Sphere_comparison_31c_Vs_00c_mcnp.xlsx')
+        sheets = pd.ExcelFile(outpath).sheet_names
+        for lib in ['31c', '00c']:
+            for sheet in ['Values', 'Errors', 'Statistical Checks']:
+                assert '{} ({})'.format(sheet, lib) in sheets
+        values = pd.read_excel(outpath, sheet_name='Values (00c)', skiprows=8)
+        assert 'M10' in values['Zaid'].values
 
     def test_sphereoutput_openmc(self, session_mock: MockUpSession):     
         sphere_00c = sout.SphereOutput('00c', 'openmc', 'Sphere', session_mock)
@@ -122,6 +134,71 @@ class TestSphereOutput:
         assert 0.10131285308571429 == pytest.approx(errors[1]['Neutron Spectra'])
         assert 'M10' == results[1]['Zaid']
 
+    def test_read_mcnp_output_parallel(self, session_mock: MockUpSession):
+        sphere_00c = sout.SphereOutput('00c', 'mcnp', 'Sphere', session_mock)
+        outputs, results, errors, stat_checks = sphere_00c._read_mcnp_output()
+        sphere_00c.n_workers = 2
+        outputs_p, results_p, errors_p, stat_checks_p = sphere_00c._read_mcnp_output()
+        # Same results in the same order
+        assert list(outputs.keys()) == list(outputs_p.keys())
+        for parsed, parsed_p in [(results, results_p), (errors, errors_p),
+                                 (stat_checks, stat_checks_p)]:
+            assert pd.DataFrame(parsed).equals(pd.DataFrame(parsed_p))
+        for zaid, output in outputs.items():
+            assert output.tallydata.equals(outputs_p[zaid].tallydata)
+
+    def test_result_store(self, session_mock: MockUpSession):
+        sphere_00c = sout.SphereOutput('00c', 'mcnp', 'Sphere', session_mock)
+        sphere_00c.pp_excel_single()
+        store_path = sphere_00c._get_store_path('00c', 'mcnp')
+        assert os.path.exists(store_path)
+        # The results are added to the warehouse
+        warehouse = ResultsWarehouse(
+            os.path.join(session_mock.path_pp, WAREHOUSE_FILE))
+        df = warehouse.query(lib='00c', input='M10', tally=2)
+        assert df['bin'].iloc[-1] == 'Energy=total'
+
+        sphere_comp = sout.SphereOutput(['00c', '31c'], 'mcnp', 'Sphere', session_mock)
+        # 00c is recovered from the store
+        outputs, zaidnames = sphere_comp._load_result_store('00c', 'mcnp')
+        assert zaidnames['M10'] == sphere_00c.mat_settings.loc['M10', 'Name']
+        for zaid, output in sphere_00c.outputs['mcnp'].items():
+            assert output.tallydata.equals(outputs[zaid].tallydata)
+            assert output.totalbin.equals(outputs[zaid].totalbin)
+            assert output.stat_checks == outputs[zaid].stat_checks
+        res, err, columns = outputs['M10'].get_comparison_data(
+            sout.MCNP_COMPARISON_TALLIES, 'mcnp')
+        res_p, err_p, columns_p = sphere_00c.outputs['mcnp'][
+            'M10'].get_comparison_data(sout.MCNP_COMPARISON_TALLIES, 'mcnp')
+        assert columns == columns_p
+        assert res == pytest.approx(res_p, nan_ok=True)
+
+        # 31c has no store, outputs are parsed
+        outputs, zaidnames = sphere_comp._load_result_store('31c', 'mcnp')
+        assert 'M10' in outputs
+
+        # Single zaids can be read from the dataset
+        frames = rawstore.read_dataset(
+            store_path, filters={'Zaid': 'M10', 'Table': 'tallydata'})
+        assert list(frames.keys()) == [('M10', 'tallydata')]
+        assert frames['M10', 'tallydata'].equals(
+            sphere_00c.outputs['mcnp']['M10'].tallydata)
+        table = rawstore.read_table(
+            store_path, filters={'Table': 'totalbin'}, columns=['Value'])
+        assert list(table.columns) == ['Zaid', 'Table', 'Value']
+
+        # A stale store is not used
+        metadata_path = os.path.join(store_path, rawstore.METADATA)
+        with open(metadata_path, 'r') as infile:
+            metadata = json.load(infile)
+        folder = list(metadata['attrs']['signatures'].keys())[0]
+        metadata['attrs']['signatures'][folder] = []
+        metadata['partitions'] = []
+        with open(metadata_path, 'w') as outfile:
+            json.dump(metadata, outfile)
+        outputs, zaidnames = sphere_comp._load_result_store('00c', 'mcnp')
+        assert len(outputs['M10'].tallydata) > 0
+
 # Files
 OUTP_SDDR = os.path.join(
     cp, "TestFiles", "sphereoutput", "SphereSDDR_11023_Na-23_102_o"
@@ -146,6 +223,9 @@ class MockSphereSDDRoutput(sout.SphereSDDRoutput):
         self.raw_data = {"d1s":{}}
         self.outputs = {}
         self.d1s = True
+        self.n_workers = 1
+        self.draft = False
+        self.plot_cache = None
 
 
 class TestSphereSDDRoutput:
@@ -191,6 +271,19 @@ class TestSphereSDDRoutput:
         # print(stat_checks)
         # print(results.columns)
 
+    def test_compute_compare_results(self):
+        mockoutput = MockSphereSDDRoutput()
+        mockoutput.lib = ["99c", "98c"]
+        mockoutput.test_path = {lib: mockoutput.test_path for lib in mockoutput.lib}
+        mockoutput.couples = [("99c", "98c", "99c_Vs_98c")]
+        comparisons, singles = mockoutput._compute_compare_results()
+        _, results, errors, stat_checks = self.mockoutput._compute_single_results()
+        for single in singles.values():
+            assert single[0].equals(results)
+            assert single[1].equals(errors)
+            assert single[2].equals(stat_checks)
+        assert len(comparisons["98c"][0]) == 2
+
 
 class TestSphereSDDRMCNPoutput:
 
@@ -27,7 +27,7 @@ cp = os.path.dirname(os.path.abspath(__file__))
 modules_path = os.path.dirname(cp)
 sys.path.insert(1, modules_path)
 
-from jade.status import Status
+from jade.status import Status, StatusIndex, STATUS_INDEX
 from jade.configuration import Configuration
 from tests.configuration_test import MAIN_CONFIG_FILE
 import shutil
@@ -61,10 +61,26 @@ class LogMockUp:
 
 class TestStatus:
 
+    @pytest.fixture(autouse=True)
+    def cache(self, tmpdir, monkeypatch):
+        # keep the status index out of the test files
+        monkeypatch.setattr(SessionMockUp, "path_cache", str(tmpdir), raising=False)
+
     @pytest.fixture
     def def_config(self):
         return Configuration(MAIN_CONFIG_FILE)
 
+    def test_persisted_index(self, def_config: Configuration, tmpdir):
+        session = SessionMockUp(def_config)
+        status = Status(session)
+        assert os.path.isfile(os.path.join(str(tmpdir), STATUS_INDEX))
+
+        # A new session reads the same trees from the index
+        status2 = Status(session)
+        assert status2.run_tree == status.run_tree
+        assert status2.single_tree == status.single_tree
+        assert status2.comparison_tree == status.comparison_tree
+
     def test_update_run_status(self, def_config: Configuration):
         session = SessionMockUp(def_config)
         status = Status(session)
@@ -161,6 +177,11 @@ class TestStatus:
         ans = status.check_override_run("31c", session)
         assert not ans
 
+        # The answer can be given in advance (batch mode)
+        monkeypatch.setattr("builtins.input", None)
+        assert status.check_override_run("31c", session, override=True)
+        assert not status.check_override_run("31c", session, override=False)
+
     @pytest.mark.parametrize(
         ["code", "directory", "expected"],
         [
@@ -253,6 +274,84 @@ class TestStatus:
 
         responses = iter(arguments)
         monkeypatch.setattr("builtins.input", lambda msg: next(responses))
-        ans, to_single_pp, _ = status.check_override_pp(session, exp=exp)
+        ans, to_single_pp, _, _ = status.check_override_pp(session, exp=exp)
         assert ans == expected
         assert to_single_pp == singlepp
+
+    @pytest.mark.parametrize(
+        ["answers", "expected", "force"],
+        [
+            # Only the outdated outputs are rebuilt by default
+            [[""], True, False],
+            [["u"], True, False],
+            [["y"], True, True],
+            [["dummy", "n"], False, False],
+        ],
+    )
+    def test_check_override_pp_update(
+        self, monkeypatch, def_config: Configuration, answers, expected, force
+    ):
+        session = SessionMockUp(def_config)
+        status = Status(session)
+
+        responses = iter(["31c-30c"] + answers)
+        monkeypatch.setattr("builtins.input", lambda msg: next(responses))
+        assert status.check_override_pp(session)[::3] == (expected, force)
+
+
+class TestStatusIndex:
+    @pytest.fixture
+    def tree(self, tmpdir):
+        root = os.path.join(str(tmpdir), "root")
+        for folder in ["a", os.path.join("a", "b"), "c"]:
+            os.makedirs(os.path.join(root, folder))
+        with open(os.path.join(root, "a", "file.txt"), "w") as outfile:
+            outfile.write("test")
+        self._age(root)
+        return root
+
+    @staticmethod
+    def _age(root, mtime=1e9):
+        # folders modified just before being indexed are always listed
+        # again, set an old modification time
+        for path, _, _ in os.walk(root):
+            os.utime(path, (mtime, mtime))
+
+    def test_scan(self, tree, tmpdir, monkeypatch):
+        db = os.path.join(str(tmpdir), "Cache", "index.db")
+        index = StatusIndex(db, tree)
+        assert index.list_folders(tree) == ["a", "c"]
+        assert index.listdir(os.path.join(tree, "a")) == ["b", "file.txt"]
+        index.save()
+
+        # Unchanged folders are not listed again, also by a new index
+        index = StatusIndex(db, tree)
+        listed = []
+        scandir = os.scandir
+
+        def counted_scandir(path):
+            # shutil.rmtree scans file descriptors
+            if isinstance(path, str):
+                listed.append(os.path.relpath(path, tree))
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counted_scandir)
+        assert index.listdir(os.path.join(tree, "a")) == ["b", "file.txt"]
+        assert index.list_folders(tree) == ["a", "c"]
+        assert listed == []
+
+        # Changed folders are listed again, removed subtrees are dropped
+        shutil.rmtree(os.path.join(tree, "a"))
+        os.mkdir(os.path.join(tree, "d"))
+        self._age(tree, mtime=1.5e9)
+        listed.clear()
+        assert index.list_folders(tree) == ["c", "d"]
+        assert listed == ["."]
+        index.save()
+        assert os.path.join("a", "b") not in StatusIndex(db, tree)._folders
+
+        # Registered folders and their parents are listed again
+        index.invalidate(os.path.join(tree, "c"))
+        assert index.list_folders(os.path.join(tree, "c")) == []
+        assert index.list_folders(tree) == ["c", "d"]
+        assert listed == [".", "c", "."]
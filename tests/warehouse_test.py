@@ -0,0 +1,119 @@
+"""
+
+@author: Jade Development Team
+
+Copyright 2021, the JADE Development Team. All rights reserved.
+
+This file is part of JADE.
+
+JADE is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+JADE is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with JADE.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+cp = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(cp)
+sys.path.insert(1, modules_path)
+
+from jade.warehouse import ResultsWarehouse, main
+
+
+class TestResultsWarehouse:
+    @pytest.fixture
+    def warehouse(self, tmpdir):
+        warehouse = ResultsWarehouse(os.path.join(tmpdir, "warehouse.db"))
+        for i, lib in enumerate(["31c", "00c", "21c"]):
+            spectrum = pd.DataFrame(
+                {
+                    "Energy": [0.1, 1.0, 14.0, "total"],
+                    "Value": np.array([1.0, 2.0, 3.0, 6.0]) * (i + 1),
+                    "Error": [0.1, 0.1, 0.1, np.nan],
+                }
+            )
+            heating = pd.DataFrame({"Cells": [1.0, 2.0], "Value": [5.0, 7.0]})
+            tables = [
+                ("26056", 22, "Gamma flux", spectrum),
+                ("26056", 46, "Gamma heating", heating),
+                ("1001", 22, "Gamma flux", spectrum.iloc[:3]),
+            ]
+            warehouse.add_results(lib, "Sphere", "mcnp", tables)
+        return warehouse
+
+    def test_query(self, warehouse):
+        runs = warehouse.runs()
+        assert list(runs["lib"]) == ["31c", "00c", "21c"]
+
+        df = warehouse.query(benchmark="Sphere", input="26056", tally=22)
+        assert len(df) == 12
+        row = df.iloc[0]
+        assert row["lib"] == "31c"
+        assert row["title"] == "Gamma flux"
+        assert row["bin"] == "Energy=0.1"
+        assert row["x"] == 0.1
+        total = df.iloc[3]
+        assert total["bin"] == "Energy=total"
+        assert np.isnan(total["x"]) and np.isnan(total["error"])
+
+        df = warehouse.query(lib=["00c"], tally="46", bin_like="Cells=2%")
+        assert list(df["value"]) == [7.0]
+        assert df["error"].isnull().all()
+
+    def test_trend(self, warehouse, tmpdir):
+        table = warehouse.trend("Sphere", "26056", 22)
+        assert list(table.columns) == ["31c", "00c", "21c"]
+        assert list(table.index) == [
+            "Energy=0.1",
+            "Energy=1",
+            "Energy=14",
+            "Energy=total",
+        ]
+        assert table.loc["Energy=14", "21c"] == 9.0
+
+        table = warehouse.trend("Sphere", "26056", 22, last=2, quantity="error")
+        assert list(table.columns) == ["00c", "21c"]
+        table = warehouse.trend("Sphere", "26056", 22, libs=["21c", "31c"])
+        assert list(table.columns) == ["21c", "31c"]
+
+        # Adding again a library replaces its results and makes it the newest
+        spectrum = pd.DataFrame({"Energy": [0.1], "Value": [10.0], "Error": [0.1]})
+        warehouse.add_results(
+            "31c", "Sphere", "mcnp", [("26056", 22, "Gamma flux", spectrum)]
+        )
+        table = warehouse.trend("Sphere", "26056", 22)
+        assert list(table.columns) == ["00c", "21c", "31c"]
+        assert table["31c"].tolist()[0] == 10.0
+        assert table["31c"].isnull().sum() == 3
+        assert len(warehouse.query(lib="31c")) == 1
+
+        outpath = os.path.join(tmpdir, "trend.png")
+        warehouse.plot_trend(outpath, "Sphere", "26056", 22)
+        assert os.path.isfile(outpath)
+
+    def test_cli(self, warehouse, tmpdir, capsys):
+        csv = os.path.join(tmpdir, "trend.csv")
+        main(["--db", warehouse.path, "trend", "Sphere", "1001", "22", "--csv", csv])
+        assert "Energy=14" in capsys.readouterr().out
+        table = pd.read_csv(csv, index_col=0)
+        assert list(table.columns) == ["31c", "00c", "21c"]
+
+        main(["--db", warehouse.path, "runs", "--benchmark", "Sphere"])
+        assert "21c" in capsys.readouterr().out
+
+        with pytest.raises(SystemExit):
+            main(["--db", os.path.join(tmpdir, "missing.db"), "runs"])